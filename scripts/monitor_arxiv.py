@@ -17,18 +17,14 @@ Environment:
 """
 
 import argparse
+import functools
 import json
 import logging
 import os
-import re
 import sys
-import time
 from datetime import datetime, timedelta
 from typing import Any
 
-import feedparser
-from github import Github
-
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -37,97 +33,18 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def parse_arxiv_date(date_str: str) -> str:
-    """解析 arXiv 日期格式"""
-    try:
-        dt = datetime.strptime(date_str[:19], "%Y-%m-%dT%H:%M:%S")
-        return dt.strftime("%Y-%m-%d")
-    except (ValueError, TypeError):
-        return date_str[:10] if date_str else "Unknown"
-
-
-def clean_text(text: str) -> str:
-    """清理文本中的多余空白"""
-    return re.sub(r"\s+", " ", text).strip()
-
-
-def truncate_text(text: str, max_length: int = 1500) -> str:
-    """截断文本"""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length].rsplit(".", 1)[0] + "..."
-
-
 def fetch_papers(categories: list[str], last_scan: str, max_papers: int = 10) -> list[dict[str, Any]]:
-    """获取 arXiv 新论文"""
-    try:
-        last_scan_dt = datetime.strptime(last_scan[:19], "%Y-%m-%dT%H:%M:%S")
-        last_scan_timestamp = last_scan_dt.timestamp()
-    except (ValueError, TypeError):
-        last_scan_timestamp = 0
-
-    all_papers = []
-
-    for category in categories:
-        print(f"[INFO] 获取 {category} 分类...")
-
-        base_url = "http://export.arxiv.org/api/query"
-        params = {
-            "search_query": f"cat:{category}",
-            "sortBy": "submittedDate",
-            "sortOrder": "descending",
-            "max_results": max_papers * 3,
-        }
-        url = f"{base_url}?{'&'.join(f'{k}={v}' for k, v in params.items())}"
-
-        try:
-            response = feedparser.parse(url)
-
-            for entry in response.entries:
-                try:
-                    published_timestamp = datetime.strptime(
-                        entry.get("published", "")[:19], "%Y-%m-%dT%H:%M:%S"
-                    ).timestamp()
-                except (ValueError, TypeError):
-                    continue
-
-                if published_timestamp <= last_scan_timestamp:
-                    continue
-
-                authors = ", ".join(a.get("name", "") for a in entry.get("authors", [])[:5])
-                if len(entry.get("authors", [])) > 5:
-                    authors += f" 等 {len(entry.get('authors', []))} 位作者"
-
-                arxiv_id = entry.get("id", "").split("/abs/")[-1]
-
-                all_papers.append(
-                    {
-                        "id": arxiv_id,
-                        "title": clean_text(entry.get("title", "")),
-                        "summary": truncate_text(clean_text(entry.get("summary", ""))),
-                        "url": f"https://arxiv.org/abs/{arxiv_id}",
-                        "pdf_url": f"https://arxiv.org/pdf/{arxiv_id}.pdf",
-                        "authors": authors,
-                        "published": parse_arxiv_date(entry.get("published", "")),
-                        "published_raw": entry.get("published", ""),
-                        "category": category,
-                    }
-                )
+    """获取 arXiv 新论文
 
-        except Exception as e:
-            print(f"   [WARNING] 获取失败: {e}")
-            continue
+    所有分类合并为一个 OR 查询，并在服务端按提交日期过滤；请求带连接池、
+    arXiv 限速与 ETag/Last-Modified 条件请求缓存（见 issuelab.tools.arxiv）。
+    """
+    from pathlib import Path
 
-    # 去重并排序
-    seen_ids = set()
-    unique_papers = []
-    for p in all_papers:
-        if p["id"] not in seen_ids:
-            seen_ids.add(p["id"])
-            unique_papers.append(p)
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from issuelab.tools.arxiv import fetch_papers as fetch_arxiv_papers
 
-    unique_papers.sort(key=lambda x: x.get("published_raw", ""), reverse=True)
-    return unique_papers[:max_papers]
+    return fetch_arxiv_papers(categories, last_scan, max_papers)
 
 
 def build_papers_for_observer(papers: list[dict]) -> str:
@@ -147,9 +64,32 @@ def build_papers_for_observer(papers: list[dict]) -> str:
     return "\n".join(lines)
 
 
+@functools.cache
+def _get_publisher(repo_name: str, token: str):
+    """获取本次运行共用的 Issue 发布器（复用同一个 GitHub 会话）"""
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from issuelab.tools.issue_publisher import IssuePublisher
+
+    return IssuePublisher(token, repo_name)
+
+
+def _load_paper_index(repo_name: str, token: str):
+    """读取论文去重索引（首次使用时从仓库 Issues 回填）"""
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from issuelab.paper_index import load_paper_index
+
+    return load_paper_index(repo_name, lambda: _get_publisher(repo_name, token).repo.get_issues(state="all"))
+
+
 def filter_existing_papers(papers: list[dict], repo_name: str, token: str) -> list[dict]:
     """过滤掉已存在 Issue 的论文
 
+    通过持久化的论文索引（arXiv id / 规范化标题）O(1) 查询，不再每次列出全部 Issues。
+
     Args:
         papers: 论文列表
         repo_name: 仓库名 (owner/repo)
@@ -161,20 +101,7 @@ def filter_existing_papers(papers: list[dict], repo_name: str, token: str) -> li
     if not papers:
         return []
 
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-
-    # 获取已存在的 Issue 标题
-    existing_titles = {issue.title for issue in repo.get_issues(state="all")}
-
-    # 过滤
-    filtered = []
-    for paper in papers:
-        title = f"[论文讨论] {paper['title']}"
-        if title in existing_titles:
-            logger.debug(f"跳过已存在: {title[:50]}...")
-        else:
-            filtered.append(paper)
+    filtered = _load_paper_index(repo_name, token).filter_new(papers)
 
     logger.info(f"过滤后剩余 {len(filtered)} 篇新论文（已排除 {len(papers) - len(filtered)} 篇已存在）")
     return filtered
@@ -247,14 +174,56 @@ def analyze_with_observer(papers: list[dict], token: str) -> list[dict]:
         return recommended
 
 
-def create_issues(recommended: list[dict], repo_name: str, token: str) -> int:
-    """根据 Observer 推荐创建 GitHub Issues"""
+def _render_digest_item(index: int, paper: dict) -> str:
+    return f"""### {index}. {paper["title"]}
+
+- **链接**: [{paper["url"]}]({paper["url"]})
+- **作者**: {paper["authors"]}
+- **发布时间**: {paper["published"]}
+- **分类**: {paper["category"]}
+- **PDF**: [Download]({paper["pdf_url"]})
+- **推荐理由**: {paper["reason"]}
+
+{paper["summary"]}"""
+
+
+def create_issues(recommended: list[dict], repo_name: str, token: str, digest: bool = False) -> int:
+    """根据 Observer 推荐创建 GitHub Issues
+
+    Args:
+        recommended: 推荐论文列表
+        repo_name: 仓库名 (owner/repo)
+        token: GitHub Token
+        digest: 是否把所有推荐合并为一个 Issue（减少 API 写入）
+
+    Returns:
+        创建的 Issue 数量
+    """
     if not recommended:
         print("[INFO] 无推荐论文，不创建 Issue")
         return 0
 
-    g = Github(token)
-    repo = g.get_repo(repo_name)
+    publisher = _get_publisher(repo_name, token)
+    from issuelab.tools.issue_publisher import render_digest
+
+    paper_index = _load_paper_index(repo_name, token)
+    # 创建评论触发 @moderator（评论中的 @ 会触发 orchestrator.yml）
+    trigger_comment = "@moderator 请审核"
+
+    if digest:
+        title = f"[论文讨论] arXiv 新论文速递 - {datetime.now().strftime('%Y-%m-%d')}（{len(recommended)} 篇）"
+        body = render_digest(
+            recommended,
+            _render_digest_item,
+            header=f"## arXiv 新论文速递\n\n**推荐论文**: {len(recommended)} 篇\n\n请对感兴趣的论文发表您的见解。",
+            footer="_由 arXiv Monitor 自动创建_",
+        )
+        issue = publisher.publish(title, body, trigger_comment=trigger_comment)
+        for paper in recommended:
+            paper_index.add(paper, issue.number)
+        paper_index.save()
+        print(f"[OK] 创建 digest Issue: {title}")
+        return 1
 
     created = 0
 
@@ -288,17 +257,13 @@ def create_issues(recommended: list[dict], repo_name: str, token: str) -> int:
 ---
 _由 arXiv Monitor 自动创建_"""
 
-        # 创建 Issue
-        issue = repo.create_issue(title=title, body=body)
+        # 创建 Issue 并触发 @moderator（写操作由发布器统一节流）
+        issue = publisher.publish(title, body, trigger_comment=trigger_comment)
         print(f"[OK] 创建 Issue: {title[:50]}...")
-
-        # 创建评论触发 @moderator（评论中的 @ 会触发 orchestrator.yml）
-        trigger_comment = "@moderator 请审核"
-        issue.create_comment(trigger_comment)
-        print(f"[INFO] 触发评论: {trigger_comment}")
+        paper_index.add(paper, issue.number)
+        paper_index.save()
 
         created += 1
-        time.sleep(2)
 
     return created
 
@@ -313,6 +278,7 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--output", type=str, help="Output JSON file (optional)")
     parser.add_argument("--last-scan", type=str, help="Last scan time (ISO format)")
     parser.add_argument("--scan-only", action="store_true", help="Only scan, don't analyze")
+    parser.add_argument("--digest", action="store_true", help="把所有推荐论文合并为一个 Issue（减少 GitHub API 写入）")
 
     args = parser.parse_args(argv)
 
@@ -374,7 +340,7 @@ def main(argv: list[str] | None = None) -> int:
 
         # 创建 Issues
         logger.info("开始创建 Issues...")
-        created = create_issues(recommended, args.repo, args.token)
+        created = create_issues(recommended, args.repo, args.token, digest=args.digest)
         logger.info(f"{'=' * 60}")
         logger.info(f"[完成] 创建 {created} 个 Issues")
         logger.info(f"{'=' * 60}")
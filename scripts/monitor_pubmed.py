@@ -15,23 +15,19 @@ Usage:
 Environment:
     LOG_LEVEL: 设置日志级别 (DEBUG, INFO, WARNING, ERROR)
     PUBMED_EMAIL: 必填，联系邮箱 (NCBI 要求)
+    NCBI_API_KEY: 可选，NCBI API key（限速从每秒 3 个请求提高到 10 个）
 """
 
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import os
-import re
 import sys
-import time
-import urllib.parse
-import urllib.request
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any
 
-from github import Github
-
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -40,202 +36,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class PubMedClient:
-    """PubMed API 客户端"""
-
-    BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
-
-    def __init__(self, email: str):
-        self.email = email
-        self.last_request_time = 0
-
-    def _rate_limit(self):
-        """速率限制：NCBI 要求每秒最多 3 个请求"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < 0.34:
-            time.sleep(0.34 - elapsed)
-        self.last_request_time = time.time()
-
-    def search(
-        self, query: str, max_results: int = 20, mindate: str = None, maxdate: str = None, datetype: str = "pdat"
-    ) -> list[str]:
-        """搜索 PubMed，获取 PMID 列表
-
-        Args:
-            query: 检索词
-            max_results: 最大返回数量
-            mindate: 开始日期 (YYYY/MM/DD)
-            maxdate: 结束日期
-            datetype: 日期类型 (pdat=出版日期)
-
-        Returns:
-            PMID 列表
-        """
-        self._rate_limit()
-
-        params = {
-            "db": "pubmed",
-            "term": query,
-            "retmode": "json",
-            "retmax": max_results,
-            "datetype": datetype,
-            "email": self.email,
-            "sort": "pub date",  # 按出版日期排序（最新在前）
-        }
-
-        if mindate:
-            params["mindate"] = mindate
-        if maxdate:
-            params["maxdate"] = maxdate
-
-        url = f"{self.BASE_URL}/esearch.fcgi?{urllib.parse.urlencode(params)}"
-
-        try:
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode())
-                ids = data.get("esearchresult", {}).get("idlist", [])
-                return ids
-        except Exception as e:
-            logger.error(f"PubMed search failed: {e}")
-            return []
-
-    def summary(self, id_list: list[str]) -> dict:
-        """获取文献详情
-
-        Args:
-            id_list: PMID 列表
-
-        Returns:
-            PMID -> 详情 的字典
-        """
-        if not id_list:
-            return {}
-
-        self._rate_limit()
-
-        ids_str = ",".join(id_list)
-        params = {"db": "pubmed", "id": ids_str, "retmode": "json", "email": self.email}
-
-        url = f"{self.BASE_URL}/esummary.fcgi?{urllib.parse.urlencode(params)}"
-
-        try:
-            with urllib.request.urlopen(url) as response:
-                data = json.loads(response.read().decode())
-                return data.get("result", {})
-        except Exception as e:
-            logger.error(f"PubMed summary failed: {e}")
-            return {}
-
-    def efetch(self, id_list: list[str]) -> dict:
-        """使用 efetch 获取 DOI 等完整信息
-
-        Args:
-            id_list: PMID 列表
-
-        Returns:
-            PMID -> ArticleIdList 的字典
-        """
-        if not id_list:
-            return {}
-
-        self._rate_limit()
-
-        ids_str = ",".join(id_list)
-        params = {
-            "db": "pubmed",
-            "id": ids_str,
-            "retmode": "xml",
-            "rettype": "abstract",
-            "email": self.email,
-        }
-
-        url = f"{self.BASE_URL}/efetch.fcgi?{urllib.parse.urlencode(params)}"
-
-        try:
-            import xml.etree.ElementTree as ET
-
-            with urllib.request.urlopen(url) as response:
-                xml_data = response.read().decode()
-                root = ET.fromstring(xml_data)
-
-                result = {}
-                for article in root.findall(".//PubmedArticle"):
-                    pmid_elem = article.find(".//PMID")
-                    if pmid_elem is None:
-                        continue
-                    pmid = pmid_elem.text
-
-                    # 查找 DOI
-                    doi = ""
-                    for article_id in article.findall(".//ArticleId"):
-                        id_type = article_id.get("IdType", "")
-                        if id_type == "doi":
-                            doi = article_id.text.strip()
-                            break
-
-                    result[pmid] = {"doi": doi}
-                return result
-        except Exception as e:
-            logger.error(f"PubMed efetch failed: {e}")
-            return {}
-
-
-def parse_pubmed_date(date_str: str) -> str:
-    """解析 PubMed 日期格式"""
-    if not date_str:
-        return "Unknown"
-    raw = date_str.strip()
-
-    # 移除常见的附加信息（如 Epub/doi/Online ahead of print）
-    raw = re.split(r";|\s+Epub\b|\s+doi:\b|\s+Online ahead of print\b", raw, maxsplit=1)[0].strip()
-    raw = raw.rstrip(".")
-
-    # PubMed 常见格式: "2024 Jan 15", "2024 Jan", "2024/01/15", "2024-01-15"
-    for fmt in ("%Y %b %d", "%Y %B %d", "%Y/%m/%d", "%Y-%m-%d"):
-        try:
-            dt = datetime.strptime(raw, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-
-    # 只有年月
-    month_match = re.match(r"^(\d{4})\s+([A-Za-z]{3,})$", raw)
-    if month_match:
-        year = month_match.group(1)
-        month = month_match.group(2)
-        for fmt in ("%Y %b %d", "%Y %B %d"):
-            try:
-                dt = datetime.strptime(f"{year} {month} 01", fmt)
-                return dt.strftime("%Y-%m-%d")
-            except ValueError:
-                continue
-
-    # 只有年份
-    if re.match(r"^\d{4}$", raw):
-        return f"{raw}-01-01"
-
-    return date_str[:10] if date_str else "Unknown"
-
-
-def clean_text(text: str) -> str:
-    """清理文本中的多余空白"""
-    if not text:
-        return ""
-    return re.sub(r"\s+", " ", text).strip().strip(".")
-
-
-def truncate_text(text: str, max_length: int = 1500) -> str:
-    """截断文本"""
-    if not text:
-        return ""
-    if len(text) <= max_length:
-        return text
-    return text[:max_length].rsplit(".", 1)[0] + "..."
-
-
 def fetch_papers(query: str, email: str, days: int = 7, max_papers: int = 20) -> list[dict[str, Any]]:
     """获取 PubMed 新文献
 
+    esearch 结果保存在 NCBI history server 上，esummary / efetch 分批并发请求，
+    按令牌桶限速（设置 NCBI_API_KEY 后每秒 10 个请求），efetch XML 流式解析
+    （见 issuelab.tools.pubmed）。
+
     Args:
         query: 检索词
         email: 联系邮箱
@@ -245,74 +52,12 @@ def fetch_papers(query: str, email: str, days: int = 7, max_papers: int = 20) ->
     Returns:
         文献列表
     """
-    # 计算日期范围
-    end_date = datetime.now().strftime("%Y/%m/%d")
-    start_date = (datetime.now() - timedelta(days=days)).strftime("%Y/%m/%d")
-
-    logger.info(f"检索词: {query}")
-    logger.info(f"时间范围: {start_date} - {end_date}")
-
-    client = PubMedClient(email)
-
-    # Step 1: esearch 获取 PMID
-    pmids = client.search(
-        query=query,
-        max_results=max_papers * 2,  # 多取一些供筛选
-        mindate=start_date,
-        maxdate=end_date,
-        datetype="pdat",  # pdat=出版日期，edat=数据库收录日期
-    )
-
-    if not pmids:
-        logger.info("未找到新文献")
-        return []
-
-    logger.info(f"发现 {len(pmids)} 篇候选文献")
-
-    # Step 2: esummary 获取详情
-    details = client.summary(pmids)
-
-    # Step 3: efetch 获取 DOI
-    efetch_data = client.efetch(pmids)
-
-    # 解析文献
-    papers = []
-    for uid in pmids:
-        if uid not in details or uid == "uids":
-            continue
-
-        doc = details[uid]
-
-        authors = ", ".join(a.get("name", "") for a in doc.get("authors", [])[:5])
-        if len(doc.get("authors", [])) > 5:
-            authors += f" 等 {len(doc['authors'])} 位作者"
-
-        # 获取摘要 (efetch 需要另外调用，这里先用 keywords)
-        keywords = doc.get("keywords", [])
+    from pathlib import Path
 
-        # 获取 DOI (优先使用 efetch 结果)
-        doi = efetch_data.get(uid, {}).get("doi", "") or doc.get("doi", "")
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from issuelab.tools.pubmed import fetch_papers as fetch_pubmed_papers
 
-        papers.append(
-            {
-                "pmid": uid,
-                "title": clean_text(doc.get("title", "")),
-                "journal": doc.get("source", ""),
-                "pubdate": parse_pubmed_date(doc.get("pubdate", "")),
-                "epubdate": parse_pubmed_date(doc.get("epubdate", "")),
-                "entrezdate": parse_pubmed_date(doc.get("entrezdate", "") or doc.get("sortdate", "")),
-                "authors": authors,
-                "doi": doi,
-                "url": f"https://pubmed.ncbi.nlm.nih.gov/{uid}/",
-                "keywords": keywords if isinstance(keywords, list) else [],
-                "has_abstract": doc.get("hasabstract", 0),
-            }
-        )
-
-    # 按日期排序（最新的在前）
-    papers.sort(key=lambda x: x.get("pubdate", ""), reverse=True)
-
-    return papers[:max_papers]
+    return fetch_pubmed_papers(query, email, days, max_papers)
 
 
 def build_papers_for_observer(papers: list[dict], query: str) -> str:
@@ -342,8 +87,31 @@ def build_papers_for_observer(papers: list[dict], query: str) -> str:
     return "\n".join(lines)
 
 
+@functools.cache
+def _get_publisher(repo_name: str, token: str):
+    """获取本次运行共用的 Issue 发布器（复用同一个 GitHub 会话）"""
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from issuelab.tools.issue_publisher import IssuePublisher
+
+    return IssuePublisher(token, repo_name)
+
+
+def _load_paper_index(repo_name: str, token: str):
+    """读取论文去重索引（首次使用时从仓库 Issues 回填）"""
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+    from issuelab.paper_index import load_paper_index
+
+    return load_paper_index(repo_name, lambda: _get_publisher(repo_name, token).repo.get_issues(state="all"))
+
+
 def filter_existing_papers(papers: list[dict], repo_name: str, token: str) -> list[dict]:
-    """过滤掉已创建 Issue 的文献（通过 GitHub Issues 标题匹配）
+    """过滤掉已创建 Issue 的文献
+
+    通过持久化的论文索引（PMID / DOI / 规范化标题）O(1) 查询，不再扫描近期 Issues 标题。
 
     Args:
         papers: 文献列表
@@ -356,28 +124,7 @@ def filter_existing_papers(papers: list[dict], repo_name: str, token: str) -> li
     if not papers:
         return []
 
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-
-    # 获取近 30 天内已存在的 Issue 标题
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    existing_titles = set()
-
-    for issue in repo.get_issues(state="all", since=thirty_days_ago):
-        # 只检查我们自己创建的文献 Issue
-        if issue.title.startswith("[文献]"):
-            existing_titles.add(issue.title.lower())
-
-    # 过滤
-    filtered = []
-    for paper in papers:
-        title_prefix = f"[文献] {paper['title'][:40]}".lower()
-
-        if any(title_prefix in existing for existing in existing_titles):
-            logger.debug(f"跳过已存在: {title_prefix[:30]}...")
-            continue
-
-        filtered.append(paper)
+    filtered = _load_paper_index(repo_name, token).filter_new(papers)
 
     logger.info(f"过滤后剩余 {len(filtered)} 篇新文献（已排除 {len(papers) - len(filtered)} 篇）")
     return filtered
@@ -477,22 +224,8 @@ def heuristic_selection(papers: list[dict], query: str) -> list[dict]:
     return top2
 
 
-def create_issues(recommended: list[dict], repo_name: str, token: str, query: str) -> int:
-    """根据 Observer 推荐创建 GitHub Issues"""
-
-    if not recommended:
-        print("[INFO] 无推荐文献，不创建 Issue")
-        return 0
-
-    g = Github(token)
-    repo = g.get_repo(repo_name)
-
-    created = 0
-
-    # 构建 Issue 主体
-    papers_list = "\n\n---\n\n".join(
-        [
-            f"""### {i + 1}. {paper["title"]}
+def _render_paper(index: int, paper: dict) -> str:
+    return f"""### {index}. {paper["title"]}
 
 - **PMID**: [{paper["pmid"]}]({paper["url"]})
 - **DOI**: {f"[{paper['doi']}](https://doi.org/{paper['doi']})" if paper.get('doi') else "N/A"}
@@ -503,35 +236,42 @@ def create_issues(recommended: list[dict], repo_name: str, token: str, query: st
 - **作者**: {paper["authors"]}
 - **推荐理由**: {paper.get("reason", "")}
 - **推荐摘要**: {paper.get("summary", "")}"""
-            for i, paper in enumerate(recommended)
-        ]
-    )
 
-    body = f"""## PubMed 文献速递
 
-**检索词**: `{query}`
-**分析时间**: {datetime.now().strftime("%Y-%m-%d")}
-**推荐文献**: {len(recommended)} 篇
+def create_issues(recommended: list[dict], repo_name: str, token: str, query: str) -> int:
+    """根据 Observer 推荐创建 GitHub Issues（所有推荐合并为一个 digest Issue）"""
 
----
+    if not recommended:
+        print("[INFO] 无推荐文献，不创建 Issue")
+        return 0
 
-{papers_list}
+    publisher = _get_publisher(repo_name, token)
+    from issuelab.tools.issue_publisher import render_digest
 
----
+    created = 0
 
-_由 PubMed Monitor 自动创建_
-"""
+    body = render_digest(
+        recommended,
+        _render_paper,
+        header=f"""## PubMed 文献速递
+
+**检索词**: `{query}`
+**分析时间**: {datetime.now().strftime("%Y-%m-%d")}
+**推荐文献**: {len(recommended)} 篇""",
+        footer="_由 PubMed Monitor 自动创建_",
+    )
 
     title = f"[文献] 物种形成与杂交领域新文献 - {datetime.now().strftime('%Y-%m-%d')}"
 
     try:
-        issue = repo.create_issue(title=title, body=body)
+        # 创建 Issue 并触发 Moderator（写操作由发布器统一节流和重试）
+        issue = publisher.publish(title, body, trigger_comment="@moderator 请审核")
         print(f"[OK] 创建 Issue: {title}")
 
-        # 触发 Moderator
-        trigger_comment = "@moderator 请审核"
-        issue.create_comment(trigger_comment)
-        print(f"[INFO] 触发评论: {trigger_comment}")
+        paper_index = _load_paper_index(repo_name, token)
+        for paper in recommended:
+            paper_index.add(paper, issue.number)
+        paper_index.save()
 
         created = 1
 
@@ -2,6 +2,7 @@
 
 import argparse
 import asyncio
+import functools
 import json
 import os
 import subprocess
@@ -51,6 +52,87 @@ def parse_agents_arg(agents_str: str) -> list[str]:
     return [a.lower() for a in agents_str.split() if a]
 
 
+def _print_observer_decision(result, triggered: bool | None = None) -> None:
+    """打印单个 Observer 决策（triggered 为 None 表示未自动触发）"""
+    should_trigger = result.get("should_trigger", False)
+
+    print(f"Issue #{result.get('issue_number')}:")
+    print(f"  触发: {'[OK] 是' if should_trigger else '[ERROR] 否'}")
+
+    if should_trigger:
+        print(f"  Agent: {result.get('agent', 'N/A')}")
+        print(f"  理由: {result.get('reason', 'N/A')}")
+        if triggered is not None:
+            print("  [OK] 已自动触发 agent" if triggered else "  [ERROR] 自动触发失败")
+    else:
+        print(f"  原因: {result.get('reason', 'N/A')}")
+
+    if "error" in result:
+        print(f"  [WARNING] 错误: {result['error']}")
+
+    print()
+
+
+def _print_agent_result(agent_name: str, result) -> str:
+    """打印单个 Agent 的结果，返回回复内容"""
+    response = result.get("response", str(result))
+    cost_usd = result.get("cost_usd", 0.0)
+    num_turns = result.get("num_turns", 0)
+    tool_calls = len(result.get("tool_calls", []))
+
+    print(f"\n=== {agent_name} result (成本: ${cost_usd:.4f}, 轮数: {num_turns}, 工具: {tool_calls}) ===")
+    print(response)
+    return response
+
+
+async def _publish_agent_result(issue_number: int, agent_name: str, result) -> None:
+    """Agent 完成后立即打印并发布回复（其他 Agent 仍在运行）"""
+    from issuelab.tools.github import apost_comment
+
+    response = _print_agent_result(agent_name, result)
+
+    # auto_clean 会自动处理 @mentions
+    if await apost_comment(issue_number, response, agent_name=agent_name):
+        print(f"[OK] {agent_name} response posted to issue #{issue_number}")
+    else:
+        print(f"[ERROR] Failed to post {agent_name} response")
+
+
+async def _run_review(
+    issue_number: int, agents: list[str], context: str, comment_count: int, trigger_comment: str, post: bool
+) -> None:
+    """运行评审流程；所有 agent 完成后按 summarizer 的 [CLOSE] 标记自动关闭 Issue
+
+    Args:
+        post: 每个 agent 完成后立即输出并发布（否则全部完成后统一输出）
+    """
+    from issuelab.response_processor import aclose_issue, should_auto_close
+
+    if post:
+        results = await run_agents_parallel(
+            issue_number,
+            agents,
+            context,
+            comment_count,
+            trigger_comment=trigger_comment,
+            on_result=functools.partial(_publish_agent_result, issue_number),
+        )
+    else:
+        results = await run_agents_parallel(
+            issue_number, agents, context, comment_count, trigger_comment=trigger_comment
+        )
+        for agent_name, result in results.items():
+            _print_agent_result(agent_name, result)
+
+    summary = results.get("summarizer")
+    if summary is not None and should_auto_close(summary.get("response", str(summary)), "summarizer"):
+        print(f"\n[INFO] 检测到 [CLOSE] 标记，正在自动关闭 Issue #{issue_number}...")
+        if await aclose_issue(issue_number):
+            print(f"[OK] Issue #{issue_number} 已自动关闭")
+        else:
+            print("[ERROR] 自动关闭失败")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Issue Lab Agent")
     subparsers = parser.add_subparsers(dest="command", help="可用命令")
@@ -70,17 +152,83 @@ def main():
     observe_parser = subparsers.add_parser("observe", help="运行 Observer Agent 分析 Issue")
     observe_parser.add_argument("--issue", type=int, required=True, help="Issue 编号")
     observe_parser.add_argument("--post", action="store_true", help="自动发布触发评论到 Issue")
+    observe_parser.add_argument(
+        "--use-cache", action="store_true", help="使用 Observer 决策缓存（内容未变化时跳过分析）"
+    )
 
     # Observer 批量分析命令（并行）
     observe_batch_parser = subparsers.add_parser("observe-batch", help="并行分析多个 Issues")
-    observe_batch_parser.add_argument("--issues", type=str, required=True, help="Issue 编号列表（逗号分隔）")
+    observe_batch_parser.add_argument("--issues", type=str, default="", help="Issue 编号列表（逗号分隔）")
+    observe_batch_parser.add_argument(
+        "--since-last-scan",
+        action="store_true",
+        help="增量模式：只分析上次成功扫描后有更新的开放 Issues（忽略 --issues）",
+    )
     observe_batch_parser.add_argument(
         "--auto-trigger", action="store_true", help="自动触发 agent（内置agent用label，用户agent用dispatch）"
     )
+    observe_batch_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="同时分析的 Issue 数量上限（默认读取 ISSUELAB_OBSERVER_CONCURRENCY，未设置为 4）",
+    )
+    observe_batch_parser.add_argument(
+        "--packed",
+        action="store_true",
+        help="打包模式：一次 Observer 会话分析多个 Issues（批大小按 ISSUELAB_OBSERVER_PACKED_BUDGET 自适应）",
+    )
+    observe_batch_parser.add_argument(
+        "--no-cache", action="store_true", help="不使用 Observer 决策缓存（强制重新分析所有 Issues）"
+    )
+    observe_batch_parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="关闭规则预过滤（已关闭、跳过标签、最后评论来自 Agent、Agent 冷却期内的 Issue 也交给 Observer）",
+    )
 
     # 列出所有可用 Agent
     subparsers.add_parser("list-agents", help="列出所有可用的 Agent")
 
+    # 常驻守护进程（缓存在作业之间保持预热）
+    serve_parser = subparsers.add_parser("serve", help="启动常驻作业守护进程（execute/observe/dispatch）")
+    serve_target = serve_parser.add_mutually_exclusive_group(required=True)
+    serve_target.add_argument("--socket", type=str, help="监听的 Unix socket 路径")
+    serve_target.add_argument("--port", type=int, help="监听 127.0.0.1 的 TCP 端口（需设置 ISSUELAB_SERVE_TOKEN）")
+    serve_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="同时执行的作业数（默认读取 ISSUELAB_SERVE_CONCURRENCY，未设置为 2）",
+    )
+
+    # 向守护进程提交作业
+    submit_parser = subparsers.add_parser("submit", help="向 serve 守护进程提交作业（JSON）")
+    submit_target = submit_parser.add_mutually_exclusive_group(required=True)
+    submit_target.add_argument("--socket", type=str, help="守护进程的 Unix socket 路径")
+    submit_target.add_argument("--port", type=int, help="守护进程的 TCP 端口")
+    submit_parser.add_argument("--job", type=str, required=True, help='作业 JSON，如 {"type": "execute", ...}')
+
+    # 持久化作业队列
+    enqueue_parser = subparsers.add_parser("enqueue", help="把作业加入本地持久化队列（由 worker 执行）")
+    enqueue_parser.add_argument("--job", type=str, required=True, help='作业 JSON，如 {"type": "execute", ...}')
+    enqueue_parser.add_argument(
+        "--dedup-key", type=str, default=None, help="去重键（默认按作业内容计算，空字符串不去重）"
+    )
+    enqueue_parser.add_argument(
+        "--max-attempts", type=int, default=None, help="最大尝试次数（默认读取 ISSUELAB_JOB_MAX_ATTEMPTS，未设置为 3）"
+    )
+
+    worker_parser = subparsers.add_parser("worker", help="以有限并发消费本地作业队列")
+    worker_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="同时执行的作业数（默认读取 ISSUELAB_WORKER_CONCURRENCY，未设置为 2）",
+    )
+    worker_parser.add_argument("--drain", action="store_true", help="队列中没有可执行的作业时退出")
+    worker_parser.add_argument("--poll-interval", type=float, default=1.0, help="队列为空时的轮询间隔（秒）")
+
     # 个人Agent扫描命令（用于fork仓库）
     personal_scan_parser = subparsers.add_parser("personal-scan", help="个人agent扫描主仓库issues（用于fork仓库）")
     personal_scan_parser.add_argument("--agent", type=str, required=True, help="个人agent名称")
@@ -144,61 +292,37 @@ def main():
         print(f"[START] 执行 agents: {agents}")
 
         trigger_comment = os.environ.get("ISSUELAB_TRIGGER_COMMENT", "")
+
+        # --post：每个 agent 完成后立即输出并发布，不等待最慢的 agent
+        if getattr(args, "post", False):
+            asyncio.run(
+                run_agents_parallel(
+                    args.issue,
+                    agents,
+                    context,
+                    comment_count,
+                    trigger_comment=trigger_comment,
+                    on_result=functools.partial(_publish_agent_result, args.issue),
+                )
+            )
+            return
+
         results = asyncio.run(
             run_agents_parallel(args.issue, agents, context, comment_count, trigger_comment=trigger_comment)
         )
 
         # 输出结果
         for agent_name, result in results.items():
-            response = result.get("response", str(result))
-            cost_usd = result.get("cost_usd", 0.0)
-            num_turns = result.get("num_turns", 0)
-            tool_calls = len(result.get("tool_calls", []))
-
-            print(f"\n=== {agent_name} result (成本: ${cost_usd:.4f}, 轮数: {num_turns}, 工具: {tool_calls}) ===")
-            print(response)
-
-            # 如果需要，自动发布到 Issue（auto_clean 会自动处理 @mentions）
-            if getattr(args, "post", False):
-                if post_comment(args.issue, response, agent_name=agent_name):
-                    print(f"[OK] {agent_name} response posted to issue #{args.issue}")
-                else:
-                    print(f"[ERROR] Failed to post {agent_name} response")
+            _print_agent_result(agent_name, result)
 
     elif args.command == "review":
         # 顺序执行：moderator -> reviewer_a -> reviewer_b -> summarizer
         agents = ["moderator", "reviewer_a", "reviewer_b", "summarizer"]
         trigger_comment = os.environ.get("ISSUELAB_TRIGGER_COMMENT", "")
-        results = asyncio.run(
-            run_agents_parallel(args.issue, agents, context, comment_count, trigger_comment=trigger_comment)
-        )
-
-        for agent_name, result in results.items():
-            response = result.get("response", str(result))
-            cost_usd = result.get("cost_usd", 0.0)
-            num_turns = result.get("num_turns", 0)
-            tool_calls = len(result.get("tool_calls", []))
-
-            print(f"\n=== {agent_name} result (成本: ${cost_usd:.4f}, 轮数: {num_turns}, 工具: {tool_calls}) ===")
-            print(response)
-
-            # 如果需要，自动发布到 Issue（auto_clean 会自动处理 @mentions）
-            if getattr(args, "post", False):
-                if post_comment(args.issue, response, agent_name=agent_name):
-                    print(f"[OK] {agent_name} response posted to issue #{args.issue}")
-                else:
-                    print(f"[ERROR] Failed to post {agent_name} response")
-
-            # 如果是 summarator，检查是否需要自动关闭
-            if agent_name == "summarizer":
-                from issuelab.response_processor import close_issue, should_auto_close
 
-                if should_auto_close(response, agent_name):
-                    print(f"\n[INFO] 检测到 [CLOSE] 标记，正在自动关闭 Issue #{args.issue}...")
-                    if close_issue(args.issue):
-                        print(f"[OK] Issue #{args.issue} 已自动关闭")
-                    else:
-                        print("[ERROR] 自动关闭失败")
+        asyncio.run(
+            _run_review(args.issue, agents, context, comment_count, trigger_comment, post=getattr(args, "post", False))
+        )
 
     elif args.command == "observe":
         # 运行 Observer Agent 分析 Issue
@@ -209,7 +333,19 @@ def main():
         )
         comments_ref = "历史评论已包含在同一文件中。" if issue_file else (comments or "无评论")
 
-        result = asyncio.run(run_observer(args.issue, issue_info.get("title", ""), issue_body_ref, comments_ref))
+        observer_kwargs = {}
+        if getattr(args, "use_cache", False):
+            from issuelab.agents.observer_cache import ObserverDecisionCache, issue_state_hash
+
+            observer_cache = ObserverDecisionCache()
+            observer_kwargs = {
+                "cache": observer_cache,
+                "state_hash": issue_state_hash(issue_info.get("title", ""), issue_info.get("body", ""), comments),
+            }
+
+        result = asyncio.run(
+            run_observer(args.issue, issue_info.get("title", ""), issue_body_ref, comments_ref, **observer_kwargs)
+        )
 
         print(f"\n=== Observer Analysis for Issue #{args.issue} ===")
         print(f"\nAnalysis:\n{result.get('analysis', 'N/A')}")
@@ -223,14 +359,29 @@ def main():
             if getattr(args, "post", False):
                 if result.get("comment") and post_comment(args.issue, result["comment"], agent_name="observer"):
                     print(f"\n[OK] Trigger comment posted to issue #{args.issue}")
+                    # 触发成功后才缓存需要触发的决策（失败时下次重新分析）
+                    if observer_kwargs:
+                        observer_kwargs["cache"].put(args.issue, observer_kwargs["state_hash"], result, triggered=True)
                 else:
                     print("\n[ERROR] Failed to post trigger comment")
         else:
             print(f"Skip Reason: {result.get('reason', 'N/A')}")
 
+        if observer_kwargs:
+            observer_kwargs["cache"].save()
+
     elif args.command == "observe-batch":
         # 并行分析多个 Issues
-        issue_numbers = [int(i.strip()) for i in args.issues.split(",") if i.strip()]
+        if getattr(args, "since_last_scan", False):
+            from issuelab.observer_scan import commit_scan, select_updated_issues
+
+            issue_numbers = select_updated_issues()
+            if not issue_numbers:
+                commit_scan()
+                print("[INFO] 自上次扫描后没有更新的 Issues")
+                return
+        else:
+            issue_numbers = [int(i.strip()) for i in args.issues.split(",") if i.strip()]
 
         if not issue_numbers:
             print("[ERROR] 未提供有效的 Issue 编号")
@@ -238,11 +389,42 @@ def main():
 
         print(f"\n=== 并行分析 {len(issue_numbers)} 个 Issues ===")
 
+        from issuelab.agents.observer_cache import ObserverDecisionCache, issue_state_hash
+        from issuelab.agents.observer_prefilter import ObserverPrefilter
+
+        # 规则预过滤：模型调用前剔除明显无需处理的 Issue（记录跳过原因）
+        prefilter = None if getattr(args, "no_prefilter", False) else ObserverPrefilter()
+        prefiltered_results: list = []
+        # 获取失败、分析出错、触发失败或被推迟的 Issue：增量扫描时保留到下次重试
+        retry_issues: list[int] = []
+
         # 获取所有 Issues 的详情
         issue_data_list = []
         for issue_num in issue_numbers:
             try:
                 data = get_issue_info(issue_num, format_comments=True)
+                skipped = prefilter.skip_decision(issue_num, data) if prefilter is not None else None
+                if skipped is not None:
+                    prefiltered_results.append(skipped)
+                    # 冷却期跳过只是暂缓：增量扫描时留到下次重新评估
+                    if skipped.get("deferred"):
+                        retry_issues.append(issue_num)
+                    continue
+                # 按真实内容计算哈希（issue_body 可能只是文件引用）
+                state_hash = issue_state_hash(data.get("title", ""), data.get("body", ""), data.get("comments", ""))
+
+                if args.packed:
+                    # 打包模式直接内联（截断后的）正文与评论，一次会话分析多个 Issues
+                    issue_data_list.append(
+                        {
+                            "issue_number": issue_num,
+                            "issue_title": data.get("title", ""),
+                            "issue_body": data.get("body", "") or "",
+                            "comments": data.get("comments", "") or "",
+                            "state_hash": state_hash,
+                        }
+                    )
+                    continue
 
                 issue_file = github_tools.write_issue_context_file(
                     issue_number=issue_num,
@@ -258,78 +440,110 @@ def main():
                         "issue_title": data.get("title", ""),
                         "issue_body": f"内容已保存至文件: {issue_file}\n请使用 Read 工具读取该文件后再分析。",
                         "comments": "历史评论已包含在同一文件中。",
+                        "state_hash": state_hash,
                     }
                 )
             except Exception as e:
                 print(f"[WARNING] 获取 Issue #{issue_num} 失败: {e}")
+                retry_issues.append(issue_num)
                 continue
 
         if not issue_data_list:
+            if prefiltered_results:
+                for result in prefiltered_results:
+                    _print_observer_decision(result)
+                print(f"\n总结: {len(prefiltered_results)} 个 Issues 全部被预过滤跳过")
+                if getattr(args, "since_last_scan", False):
+                    commit_scan(retry=retry_issues)
+                return
             print("[ERROR] 无有效的 Issue 数据")
             return
 
+        # 决策缓存：内容与 Agent 矩阵均未变化的 Issue 直接跳过（不会重复触发）
+        observer_cache = None if getattr(args, "no_cache", False) else ObserverDecisionCache()
+        cached_results: list = list(prefiltered_results)
+        pending_data = issue_data_list
+        if observer_cache is not None:
+            cache_hits, pending_data = observer_cache.partition(issue_data_list)
+            cached_results.extend(cache_hits)
+
+        if getattr(args, "auto_trigger", False):
+            # 流式分析：每个决策完成后立即触发，不等待慢 Issue
+            from issuelab.agents.observer import stream_observer_batch
+            from issuelab.observer_trigger import process_observer_stream
+
+            trigger_data = {
+                d["issue_number"]: {"title": d.get("issue_title", ""), "body": d.get("issue_body", "")}
+                for d in issue_data_list
+            }
+            decided: list[bool] = []
+
+            def _on_result(result, triggered: bool) -> None:
+                decided.append(bool(result.get("should_trigger", False)))
+                if result.get("error") or (result.get("should_trigger") and not triggered):
+                    retry_issues.append(result["issue_number"])
+                _print_observer_decision(result, triggered)
+                if observer_cache is not None:
+                    observer_cache.record([result], issue_data_list, triggered=triggered)
+
+            async def _stream_and_trigger() -> int:
+                async with stream_observer_batch(
+                    pending_data, max_concurrency=args.max_concurrency, packed=args.packed
+                ) as decisions:
+                    return await process_observer_stream(decisions, trigger_data, on_result=_on_result)
+
+            print(f"\n{'=' * 60}")
+            print("流式分析（完成一个处理一个）")
+            print(f"{'=' * 60}\n")
+            for result in cached_results:
+                _on_result(result, False)
+            try:
+                asyncio.run(_stream_and_trigger())
+            finally:
+                if observer_cache is not None:
+                    observer_cache.save()
+            if getattr(args, "since_last_scan", False):
+                commit_scan(retry=retry_issues)
+            print(f"\n总结: {sum(decided)}/{len(decided)} 个 Issues 需要触发 Agent")
+            return
+
         # 并行分析
         from issuelab.agents.observer import run_observer_batch
 
-        results = asyncio.run(run_observer_batch(issue_data_list))
+        batch_kwargs: dict = {"max_concurrency": args.max_concurrency} if args.max_concurrency else {}
+        if args.packed:
+            batch_kwargs["packed"] = True
+        results = asyncio.run(run_observer_batch(pending_data, **batch_kwargs)) if pending_data else []
+        if observer_cache is not None:
+            observer_cache.record(results, issue_data_list)
+            observer_cache.save()
+        results = [*cached_results, *results]
 
         # 输出结果
         print(f"\n{'=' * 60}")
         print(f"分析完成：{len(results)} 个 Issues")
         print(f"{'=' * 60}\n")
 
-        triggered_count = 0
         for result in results:
-            issue_num = result.get("issue_number")
-            should_trigger = result.get("should_trigger", False)
-
-            print(f"Issue #{issue_num}:")
-            print(f"  触发: {'[OK] 是' if should_trigger else '[ERROR] 否'}")
-
-            if should_trigger:
-                triggered_count += 1
-                print(f"  Agent: {result.get('agent', 'N/A')}")
-                print(f"  理由: {result.get('reason', 'N/A')}")
-
-                # 🔥 自动触发 agent（通过 label 或 dispatch）
-                if getattr(args, "auto_trigger", False):
-                    from issuelab.observer_trigger import auto_trigger_agent
-
-                    # 查找对应的 issue 数据
-                    issue_info = next((d for d in issue_data_list if d["issue_number"] == issue_num), None)
-                    if issue_info:
-                        success = auto_trigger_agent(
-                            agent_name=result.get("agent", ""),
-                            issue_number=issue_num,
-                            issue_title=issue_info.get("issue_title", ""),
-                            issue_body=issue_info.get("issue_body", ""),
-                        )
-                        if success:
-                            print("  [OK] 已自动触发 agent")
-                        else:
-                            print("  [ERROR] 自动触发失败")
-
-            else:
-                print(f"  原因: {result.get('reason', 'N/A')}")
-
-            if "error" in result:
-                print(f"  [WARNING] 错误: {result['error']}")
-
-            print()
+            _print_observer_decision(result)
 
+        triggered_count = sum(1 for r in results if r.get("should_trigger", False))
         print(f"\n总结: {triggered_count}/{len(results)} 个 Issues 需要触发 Agent")
 
+        # 分析全部完成后才推进高水位线（中途失败时下次从检查点继续；分析出错的 Issue 下次重试）
+        if getattr(args, "since_last_scan", False):
+            retry_issues.extend(r["issue_number"] for r in results if r.get("error"))
+            commit_scan(retry=retry_issues)
+
     elif args.command == "personal-scan":
         # 个人Agent扫描主仓库issues
-        import yaml
-
         from issuelab.personal_scan import scan_issues_for_personal_agent
+        from issuelab.yaml_utils import safe_load_file
 
         # 读取agent配置
         agent_config_path = f"agents/{args.agent}/agent.yml"
         try:
-            with open(agent_config_path) as f:
-                agent_config = yaml.safe_load(f)
+            agent_config = safe_load_file(agent_config_path)
         except FileNotFoundError:
             print(f"[ERROR] 未找到agent配置: {agent_config_path}", file=sys.stderr)
             return 1
@@ -356,13 +570,12 @@ def main():
 
     elif args.command == "personal-reply":
         # 个人Agent回复主仓库issue
-        import yaml
+        from issuelab.yaml_utils import safe_load_file
 
         # 读取agent配置
         agent_config_path = f"agents/{args.agent}/agent.yml"
         try:
-            with open(agent_config_path) as f:
-                agent_config = yaml.safe_load(f)
+            agent_config = safe_load_file(agent_config_path)
         except FileNotFoundError:
             print(f"[ERROR] 未找到agent配置: {agent_config_path}")
             return 1
@@ -453,6 +666,47 @@ def main():
                     except Exception as e:
                         print(f"[WARNING] 保存到 GITHUB_OUTPUT 失败: {e}")
 
+    elif args.command == "serve":
+        from issuelab.serve import serve
+
+        try:
+            asyncio.run(serve(socket_path=args.socket, port=args.port, max_concurrency=args.max_concurrency))
+        except ValueError as e:
+            print(f"[ERROR] {e}", file=sys.stderr)
+            return 1
+
+    elif args.command == "submit":
+        from issuelab.serve import submit_job
+
+        try:
+            job = json.loads(args.job)
+        except json.JSONDecodeError as e:
+            print(f"[ERROR] 无效的作业 JSON: {e}", file=sys.stderr)
+            return 1
+        response = submit_job(job, socket_path=args.socket, port=args.port)
+        print(json.dumps(response, indent=2, ensure_ascii=False))
+        return 0 if response.get("ok") else 1
+
+    elif args.command == "enqueue":
+        from issuelab.job_queue import JobQueue
+
+        try:
+            job = json.loads(args.job)
+            job_id, created = JobQueue().enqueue(job, dedup_key=args.dedup_key, max_attempts=args.max_attempts)
+        except (json.JSONDecodeError, AttributeError, ValueError) as e:
+            print(f"[ERROR] 无效的作业: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps({"id": job_id, "created": created}))
+
+    elif args.command == "worker":
+        from issuelab.job_queue import JobQueue, run_worker
+
+        queue = JobQueue()
+        processed = asyncio.run(
+            run_worker(queue, max_concurrency=args.max_concurrency, poll_interval=args.poll_interval, drain=args.drain)
+        )
+        print(f"[OK] worker 已处理 {processed} 个作业，队列状态: {queue.stats()}")
+
     elif args.command == "list-agents":
         # 列出所有可用的 Agent
         agents = discover_agents()
@@ -7,6 +7,8 @@ import re
 from pathlib import Path
 from typing import Any
 
+from issuelab.agents.io_pool import arun_blocking
+
 # 统一 registry 读取
 from issuelab.agents.registry import BUILTIN_AGENTS, load_registry
 
@@ -17,6 +19,8 @@ AGENTS_DIR = Path(__file__).parent.parent.parent.parent / "agents"
 # 进程级缓存
 _CACHED_AGENTS: dict[str, dict[str, Any]] | None = None
 _CACHED_SIGNATURE: tuple[tuple[str, float], ...] | None = None
+# Agent 矩阵渲染缓存：(discovery 签名, Markdown 文本)
+_CACHED_MATRIX: tuple[tuple, str] | None = None
 
 
 def _get_discovery_signature() -> tuple:
@@ -208,9 +212,23 @@ def discover_agents() -> dict[str, dict[str, Any]]:
     return agents
 
 
+async def adiscover_agents() -> dict[str, dict[str, Any]]:
+    """discover_agents 的异步版本（签名校验与文件读取在共享 I/O 线程池中执行，不阻塞事件循环）"""
+    return await arun_blocking(discover_agents)
+
+
 def get_agent_matrix_markdown() -> str:
-    """生成 Agent 矩阵的 Markdown 表格（用于 Observer Prompt）"""
+    """生成 Agent 矩阵的 Markdown 表格（用于 Observer Prompt）
+
+    渲染结果按 discovery 签名缓存，prompts/agents 文件未变化时直接复用。
+    """
+    global _CACHED_MATRIX
+
     agents = discover_agents()
+    # 只有 agents 来自进程级缓存时签名才可信
+    cacheable = agents is _CACHED_AGENTS
+    if cacheable and _CACHED_MATRIX is not None and _CACHED_MATRIX[0] == _CACHED_SIGNATURE:
+        return _CACHED_MATRIX[1]
 
     lines = [
         "| Agent | 描述 | 何时触发 |",
@@ -225,7 +243,10 @@ def get_agent_matrix_markdown() -> str:
         desc = config.get("description", "")
         lines.append(f"| **{name}** | {desc} | {trigger} |")
 
-    return "\n".join(lines)
+    markdown = "\n".join(lines)
+    if cacheable and _CACHED_SIGNATURE is not None:
+        _CACHED_MATRIX = (_CACHED_SIGNATURE, markdown)
+    return markdown
 
 
 def load_prompt(agent_name: str) -> str:
@@ -234,3 +255,8 @@ def load_prompt(agent_name: str) -> str:
     if agent_name in agents:
         return agents[agent_name]["prompt"]
     return ""
+
+
+async def aload_prompt(agent_name: str) -> str:
+    """load_prompt 的异步版本"""
+    return await arun_blocking(load_prompt, agent_name)
@@ -3,13 +3,14 @@
 处理 Agent 的执行、消息流和日志记录。
 """
 
+import inspect
 import os
 import re
 import sys
-from typing import Any, cast
+from collections.abc import Awaitable, Callable
+from typing import cast
 
 import anyio
-import yaml
 from claude_agent_sdk import (
     AssistantMessage,
     ResultMessage,
@@ -21,9 +22,11 @@ from claude_agent_sdk import (
 )
 
 from issuelab.agents.config import AgentConfig
-from issuelab.agents.options import create_agent_options, format_mcp_servers_for_prompt
+from issuelab.agents.options import aformat_mcp_servers_for_prompt, create_agent_options
 from issuelab.agents.registry import BUILTIN_AGENTS
 from issuelab.logging_config import get_logger
+from issuelab.response_processor import ParsedResponse, parse_response
+from issuelab.results import AgentRunResult, total_cost
 from issuelab.retry import retry_async
 
 logger = get_logger(__name__)
@@ -51,7 +54,7 @@ def _append_output_schema(prompt: str) -> str:
     return f"{prompt}{_OUTPUT_SCHEMA_BLOCK}"
 
 
-async def run_single_agent(prompt: str, agent_name: str) -> dict:
+async def run_single_agent(prompt: str, agent_name: str) -> AgentRunResult:
     """运行单个代理（带完善的中间日志监听）
 
     Args:
@@ -59,29 +62,13 @@ async def run_single_agent(prompt: str, agent_name: str) -> dict:
         agent_name: 代理名称
 
     Returns:
-        {
-            "response": str,  # 代理响应文本
-            "cost_usd": float,  # 成本（美元）
-            "num_turns": int,  # 对话轮数
-            "tool_calls": list[str],  # 工具调用列表
-            "local_id": str,  # 会话 ID
-        }
+        AgentRunResult（兼容字典访问：response / cost_usd / num_turns / tool_calls / local_id 等）
     """
     logger.info(f"[{agent_name}] 开始运行 Agent")
     logger.debug(f"[{agent_name}] Prompt 长度: {len(prompt)} 字符")
 
     # 执行信息收集
-    execution_info: dict[str, Any] = {
-        "response": "",
-        "cost_usd": 0.0,
-        "num_turns": 0,
-        "tool_calls": [],
-        "local_id": "",
-        "text_blocks": [],
-        "input_tokens": 0,
-        "output_tokens": 0,
-        "total_tokens": 0,
-    }
+    execution_info = AgentRunResult()
 
     async def _query_agent():
         options = create_agent_options(agent_name=agent_name)
@@ -102,7 +89,7 @@ async def run_single_agent(prompt: str, agent_name: str) -> dict:
                     if isinstance(block, TextBlock):
                         text = block.text
                         response_text.append(text)
-                        execution_info["text_blocks"].append(text)
+                        execution_info.text_blocks.append(text)
 
                         # 终端流式输出（写入 stderr，避免污染 stdout）
                         print(text, end="", flush=True, file=sys.stderr)
@@ -122,7 +109,7 @@ async def run_single_agent(prompt: str, agent_name: str) -> dict:
                         tool_use_id = getattr(block, "tool_use_id", "")
                         tool_input = getattr(block, "input", {})
                         tool_calls.append(tool_name)
-                        execution_info["tool_calls"].append(tool_name)
+                        execution_info.tool_calls.append(tool_name)
 
                         # 终端输出（写入 stderr，避免污染 stdout）
                         print(f"\n[{tool_name}] id={tool_use_id}", end="", flush=True, file=sys.stderr)
@@ -166,12 +153,12 @@ async def run_single_agent(prompt: str, agent_name: str) -> dict:
                 output_tokens = int(usage.get("output_tokens") or 0)
                 total_tokens = int(usage.get("total_tokens") or (input_tokens + output_tokens))
 
-                execution_info["session_id"] = session_id
-                execution_info["cost_usd"] = cost_usd
-                execution_info["num_turns"] = result_turns
-                execution_info["input_tokens"] = input_tokens
-                execution_info["output_tokens"] = output_tokens
-                execution_info["total_tokens"] = total_tokens
+                execution_info.session_id = session_id
+                execution_info.cost_usd = cost_usd
+                execution_info.num_turns = result_turns
+                execution_info.input_tokens = input_tokens
+                execution_info.output_tokens = output_tokens
+                execution_info.total_tokens = total_tokens
 
                 # 只在第一次收到 ResultMessage 时记录
                 if first_result:
@@ -221,38 +208,31 @@ async def run_single_agent(prompt: str, agent_name: str) -> dict:
                 str,
                 await retry_async(_query_agent, max_retries=3, initial_delay=2.0, backoff_factor=2.0),
             )
-        execution_info["response"] = response
+        execution_info.response = response
 
         # 最终日志
         logger.info(
             f"[{agent_name}] 完成 - "
             f"响应长度: {len(response)} 字符, "
-            f"成本: ${execution_info['cost_usd']:.4f}, "
-            f"轮数: {execution_info['num_turns']}, "
-            f"工具调用: {len(execution_info['tool_calls'])}, "
-            f"输入Token: {execution_info['input_tokens']}, "
-            f"输出Token: {execution_info['output_tokens']}, "
-            f"总Token: {execution_info['total_tokens']}"
+            f"成本: ${execution_info.cost_usd:.4f}, "
+            f"轮数: {execution_info.num_turns}, "
+            f"工具调用: {len(execution_info.tool_calls)}, "
+            f"输入Token: {execution_info.input_tokens}, "
+            f"输出Token: {execution_info.output_tokens}, "
+            f"总Token: {execution_info.total_tokens}"
         )
 
         return execution_info
     except Exception as e:
         logger.error(f"[{agent_name}] 运行失败: {e}", exc_info=True)
-        return {
-            "response": f"[错误] Agent {agent_name} 执行失败: {e}",
-            "cost_usd": 0.0,
-            "num_turns": 0,
-            "tool_calls": [],
-            "session_id": "",
-            "text_blocks": [],
-        }
+        return AgentRunResult(response=f"[错误] Agent {agent_name} 执行失败: {e}")
 
 
 async def run_single_agent_text(prompt: str, agent_name: str | None = None) -> str:
     """轻量封装：只返回响应文本"""
     name = agent_name or "default"
     result = await run_single_agent(prompt, name)
-    return result.get("response", "")
+    return result.response
 
 
 def _extract_urls(text: str) -> list[str]:
@@ -268,23 +248,10 @@ def _extract_urls(text: str) -> list[str]:
     return urls
 
 
-def _extract_yaml_block(text: str) -> str:
-    match = re.search(r"```yaml(.*?)```", text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return ""
-
-
-def _extract_sources_from_yaml(text: str) -> list[str]:
+def _extract_sources_from_yaml(text: str | ParsedResponse) -> list[str]:
     """从 YAML sources 字段提取 URL。"""
-    yaml_text = _extract_yaml_block(text)
-    if not yaml_text:
-        return []
-    try:
-        parsed = yaml.safe_load(yaml_text) or {}
-    except Exception:
-        return []
-    if not isinstance(parsed, dict):
+    parsed = parse_response(text).mapping
+    if not parsed:
         return []
     sources = parsed.get("sources", [])
     urls: list[str] = []
@@ -306,12 +273,13 @@ def _extract_sources_from_yaml(text: str) -> list[str]:
     return deduped
 
 
-def _collect_source_urls(text: str) -> list[str]:
+def _collect_source_urls(text: str | ParsedResponse) -> list[str]:
     """优先从 YAML sources 收集，否则回退为全文 URL。"""
-    from_yaml = _extract_sources_from_yaml(text)
+    parsed = parse_response(text)
+    from_yaml = _extract_sources_from_yaml(parsed)
     if from_yaml:
         return from_yaml
-    return _extract_urls(text)
+    return _extract_urls(parsed.text)
 
 
 def _is_gqy20_multistage_enabled(agent_name: str) -> bool:
@@ -320,18 +288,13 @@ def _is_gqy20_multistage_enabled(agent_name: str) -> bool:
     return os.environ.get("ISSUELAB_GQY20_MULTISTAGE", "1").lower() not in {"0", "false", "no", "off"}
 
 
-async def _run_gqy20_multistage(agent_prompt: str, issue_number: int, task_context: str) -> dict[str, Any]:
+async def _run_gqy20_multistage(agent_prompt: str, issue_number: int, task_context: str) -> AgentRunResult:
     """gqy20 专用多阶段流程：Researcher -> Analyst -> Critic -> Verifier -> Judge。"""
     stages: dict[str, str] = {}
-    total_cost = 0.0
-    total_turns = 0
-    total_input_tokens = 0
-    total_output_tokens = 0
-    total_tokens = 0
-    tool_calls: list[str] = []
+    # 各阶段用量累加到同一个结果上（工具调用去重）
+    total = AgentRunResult(stages=stages)
 
     async def _run_stage(stage_name: str, task: str) -> str:
-        nonlocal total_cost, total_turns, total_input_tokens, total_output_tokens, total_tokens
         stage_prompt = f"""{agent_prompt}
 
 ---
@@ -349,14 +312,7 @@ async def _run_gqy20_multistage(agent_prompt: str, issue_number: int, task_conte
 {task}
 """
         result = await run_single_agent(stage_prompt, "gqy20")
-        total_cost += float(result.get("cost_usd", 0.0))
-        total_turns += int(result.get("num_turns", 0))
-        total_input_tokens += int(result.get("input_tokens", 0))
-        total_output_tokens += int(result.get("output_tokens", 0))
-        total_tokens += int(result.get("total_tokens", 0))
-        stage_tools = result.get("tool_calls", [])
-        if isinstance(stage_tools, list):
-            tool_calls.extend(str(t) for t in stage_tools)
+        total.add_usage(result)
         text = str(result.get("response", "")).strip()
         stages[stage_name] = text
         return text
@@ -535,30 +491,10 @@ confidence: "low|medium|high"
         fallback_urls = _collect_source_urls(fallback_text)
         if fallback_urls:
             judge_text = fallback_text
-            total_cost += float(fallback_result.get("cost_usd", 0.0))
-            total_turns += int(fallback_result.get("num_turns", 0))
-            total_input_tokens += int(fallback_result.get("input_tokens", 0))
-            total_output_tokens += int(fallback_result.get("output_tokens", 0))
-            total_tokens += int(fallback_result.get("total_tokens", 0))
-            stage_tools = fallback_result.get("tool_calls", [])
-            if isinstance(stage_tools, list):
-                tool_calls.extend(str(t) for t in stage_tools)
-
-    unique_tools: list[str] = []
-    for tool in tool_calls:
-        if tool not in unique_tools:
-            unique_tools.append(tool)
-
-    return {
-        "response": judge_text,
-        "cost_usd": total_cost,
-        "num_turns": total_turns,
-        "tool_calls": unique_tools,
-        "input_tokens": total_input_tokens,
-        "output_tokens": total_output_tokens,
-        "total_tokens": total_tokens,
-        "stages": stages,
-    }
+            total.add_usage(fallback_result)
+
+    total.response = judge_text
+    return total
 
 
 async def run_agents_parallel(
@@ -568,7 +504,8 @@ async def run_agents_parallel(
     comment_count: int = 0,
     available_agents: list[dict] | None = None,
     trigger_comment: str | None = None,
-) -> dict:
+    on_result: Callable[[str, AgentRunResult], Awaitable[None] | None] | None = None,
+) -> dict[str, AgentRunResult]:
     """并行运行多个代理
 
     Args:
@@ -577,19 +514,13 @@ async def run_agents_parallel(
         context: 上下文信息（Issue 标题、内容、评论等）
         comment_count: 评论数量（用于增强上下文）
         available_agents: 系统中可用的智能体列表
+        on_result: 每个 agent 完成后立即调用的回调 (agent_name, result)，可为协程函数；
+            在其他 agent 仍在运行时执行（如立即发布评论），回调异常只记录日志
 
     Returns:
-        {
-            agent_name: {
-                "response": str,
-                "cost_usd": float,
-                "num_turns": int,
-                "tool_calls": list[str],
-                "session_id": str,
-            }
-        }
+        {agent_name: AgentRunResult}（结果兼容字典访问：response / cost_usd / num_turns / tool_calls 等）
     """
-    from issuelab.agents.discovery import discover_agents, load_prompt
+    from issuelab.agents.discovery import adiscover_agents, aload_prompt
     from issuelab.agents.observer import run_observer_for_papers, run_pubmed_observer_for_papers
     from issuelab.agents.paper_extractors import (
         extract_issue_body,
@@ -610,15 +541,14 @@ async def run_agents_parallel(
     # 协作指南：统一在执行器注入，覆盖所有入口（CLI/personal-reply/observer_trigger 等）
     # 为避免重复注入：如果上游 context 已包含协作指南标题，则跳过
     if "## 协作指南" not in task_context:
-        agents_dict = discover_agents()
+        agents_dict = await adiscover_agents()
         collaboration_guidelines = build_collaboration_guidelines(agents_dict, available_agents=available_agents)
         if collaboration_guidelines:
             task_context += f"\n\n{collaboration_guidelines}"
 
-    results: dict[str, dict] = {}
-    total_cost = 0.0
+    results: dict[str, AgentRunResult] = {}
 
-    async def run_agent_task(agent_name: str, results: dict[str, dict]) -> None:
+    async def run_agent_task(agent_name: str, results: dict[str, AgentRunResult]) -> None:
         """并行任务：运行单个 agent"""
         logger.info(f"[Issue#{issue_number}] [并行] 开始执行 {agent_name}")
 
@@ -628,44 +558,38 @@ async def run_agents_parallel(
             if agent_name == "pubmed_observer":
                 papers, query = parse_pubmed_papers_from_issue(issue_body)
                 if not papers:
-                    results[agent_name] = {
-                        "response": "[Agent: pubmed_observer]\n未在 Issue 正文中识别到 PubMed 文献列表。",
-                        "cost_usd": 0.0,
-                        "num_turns": 0,
-                        "tool_calls": [],
-                    }
+                    results[agent_name] = AgentRunResult(
+                        response="[Agent: pubmed_observer]\n未在 Issue 正文中识别到 PubMed 文献列表。"
+                    )
                     return
 
                 recommended, raw_result = await run_pubmed_observer_for_papers(papers, query, return_result=True)
                 response = format_pubmed_reanalysis(recommended, query, total=len(papers))
-                raw_result["response"] = response
-                results[agent_name] = raw_result
+                results[agent_name] = AgentRunResult.from_mapping(raw_result)
+                results[agent_name].response = response
                 return
 
             papers = parse_arxiv_papers_from_issue(issue_body)
             if not papers:
-                results[agent_name] = {
-                    "response": "[Agent: arxiv_observer]\n未在 Issue 正文中识别到 arXiv 论文信息。",
-                    "cost_usd": 0.0,
-                    "num_turns": 0,
-                    "tool_calls": [],
-                }
+                results[agent_name] = AgentRunResult(
+                    response="[Agent: arxiv_observer]\n未在 Issue 正文中识别到 arXiv 论文信息。"
+                )
                 return
 
             recommended, raw_result = await run_observer_for_papers(papers, return_result=True)
             response = format_arxiv_reanalysis(recommended, total=len(papers))
-            raw_result["response"] = response
-            results[agent_name] = raw_result
+            results[agent_name] = AgentRunResult.from_mapping(raw_result)
+            results[agent_name].response = response
             return
 
         # 1. 加载 agent 的专属 prompt（定义角色和职责）
-        agent_prompt = load_prompt(agent_name)
+        agent_prompt = await aload_prompt(agent_name)
         if not agent_prompt:
             logger.warning(f"[{agent_name}] 未找到 prompt 文件，使用默认配置")
             agent_prompt = f"你是 {agent_name} 代理。"
 
         if "{mcp_servers}" in agent_prompt:
-            mcp_text = format_mcp_servers_for_prompt(agent_name)
+            mcp_text = await aformat_mcp_servers_for_prompt(agent_name)
             agent_prompt = agent_prompt.replace("{mcp_servers}", mcp_text)
 
         # 2. 构建最终 prompt：角色定义 + 当前任务
@@ -697,21 +621,32 @@ async def run_agents_parallel(
             result = await _run_gqy20_multistage(agent_prompt, issue_number, task_context)
         else:
             result = await run_single_agent(final_prompt, agent_name)
+        result = AgentRunResult.from_mapping(result)
         results[agent_name] = result
-        total_cost_local = result.get("cost_usd", 0.0)
         logger.info(
             f"[Issue#{issue_number}] {agent_name} 完成 - "
-            f"成本: ${total_cost_local:.4f}, "
-            f"轮数: {result.get('num_turns', 0)}, "
-            f"工具: {len(result.get('tool_calls', []))}"
+            f"成本: ${result.cost_usd:.4f}, "
+            f"轮数: {result.num_turns}, "
+            f"工具: {len(result.tool_calls)}"
         )
 
+    async def run_and_report(agent_name: str) -> None:
+        """运行单个 agent，完成后立即回调 on_result（不等待其他 agent）"""
+        await run_agent_task(agent_name, results)
+        if on_result is None or agent_name not in results:
+            return
+        try:
+            outcome = on_result(agent_name, results[agent_name])
+            if inspect.isawaitable(outcome):
+                await outcome
+        except Exception as e:
+            logger.error(f"[Issue#{issue_number}] {agent_name} 结果回调失败: {e}")
+
     # 使用 anyio.create_task_group 实现真正的并行执行
     async with anyio.create_task_group() as tg:
         for agent in agents:
-            tg.start_soon(run_agent_task, agent, results)
+            tg.start_soon(run_and_report, agent)
 
     # 汇总总成本
-    total_cost = sum(r.get("cost_usd", 0.0) for r in results.values())
-    logger.info(f"[Issue#{issue_number}] 所有 Agent 完成 - 总成本: ${total_cost:.4f}")
+    logger.info(f"[Issue#{issue_number}] 所有 Agent 完成 - 总成本: ${total_cost(results.values()):.4f}")
     return results
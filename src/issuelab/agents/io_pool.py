@@ -0,0 +1,111 @@
+"""共享的阻塞 I/O 工作线程池
+
+选项构建与 Agent 发现中的文件读取、MCP 工具列表等阻塞操作，
+原先每次调用都新建并销毁一个 ThreadPoolExecutor。本模块提供进程级共享的：
+
+- 工作线程池（默认 4 个线程，ISSUELAB_IO_WORKERS 覆盖）：run_blocking / arun_blocking
+- 后台事件循环线程：run_coroutine 在同步代码中运行协程，超时会真正取消任务
+
+两者都在首次使用时创建，进程退出时随解释器一起关闭。
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any
+
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_IO_WORKERS = 4
+
+_executor: ThreadPoolExecutor | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_lock = threading.Lock()
+
+
+def get_io_workers(default: int = DEFAULT_IO_WORKERS) -> int:
+    """读取工作线程数（环境变量 ISSUELAB_IO_WORKERS）"""
+    raw = os.environ.get("ISSUELAB_IO_WORKERS", "").strip()
+    try:
+        return max(1, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_IO_WORKERS={raw!r}，使用默认值 {default}")
+        return default
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """获取共享的工作线程池"""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=get_io_workers(), thread_name_prefix="issuelab-io")
+        return _executor
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="issuelab-io-loop", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def run_blocking(func: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+    """在共享线程池中执行阻塞函数并等待结果
+
+    Args:
+        func: 阻塞函数
+        timeout: 等待超时（秒，None 表示一直等待）
+
+    Raises:
+        TimeoutError: 超时（工作线程中的调用会继续执行到结束）
+    """
+    future = get_io_executor().submit(func, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError as exc:
+        future.cancel()
+        raise TimeoutError(f"blocking call timeout after {timeout}s") from exc
+
+
+async def arun_blocking(func: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any) -> Any:
+    """run_blocking 的异步版本（不阻塞当前事件循环）"""
+    future = asyncio.wrap_future(get_io_executor().submit(functools.partial(func, *args, **kwargs)))
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except TimeoutError as exc:
+        raise TimeoutError(f"blocking call timeout after {timeout}s") from exc
+
+
+def run_coroutine(coro: Coroutine[Any, Any, Any], timeout: float | None = None) -> Any:
+    """在共享的后台事件循环中运行协程（供同步代码调用，可在已有事件循环的线程中使用）
+
+    Raises:
+        TimeoutError: 超时（协程会被取消）
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _get_loop())
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError as exc:
+        future.cancel()
+        raise TimeoutError(f"coroutine timeout after {timeout}s") from exc
+
+
+def shutdown_io_pool(wait: bool = False) -> None:
+    """关闭线程池与后台事件循环（测试用；下次使用时重新创建）"""
+    global _executor, _loop
+    with _lock:
+        executor, _executor = _executor, None
+        loop, _loop = _loop, None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+    if loop is not None:
+        loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,181 @@
+"""MCP 工具目录缓存
+
+列出 stdio MCP server 的工具需要启动 server 进程并完成初始化，代价很高，
+而工具列表在 server 配置不变时几乎不会变化。本模块按 server 配置持久化工具列表：
+
+- 缓存键由 command、args、cwd、url 与 env 哈希组成（env 只保存哈希，不落盘明文）
+- 超过 TTL 的条目重新获取（默认 7 天，ISSUELAB_MCP_CATALOG_TTL 覆盖，0 表示禁用缓存）
+- 获取失败或为空的结果不缓存，下次仍会重试
+
+缓存文件位于 Config.get_state_dir() / mcp_catalog.json，供 MCP_LOG_TOOLS 与
+format_mcp_servers_for_prompt 使用。
+"""
+
+import hashlib
+import json
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from issuelab.config import Config
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CATALOG_FILENAME = "mcp_catalog.json"
+CATALOG_VERSION = 1
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+# 进程内共享的目录实例（首次使用时加载）
+_catalog: "McpToolCatalog | None" = None
+
+
+def get_catalog_ttl(default: int = DEFAULT_TTL_SECONDS) -> int:
+    """读取目录缓存 TTL（秒，环境变量 ISSUELAB_MCP_CATALOG_TTL）"""
+    raw = os.environ.get("ISSUELAB_MCP_CATALOG_TTL", "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_MCP_CATALOG_TTL={raw!r}，使用默认值 {default}")
+        return default
+
+
+def server_cache_key(cfg: dict[str, Any]) -> str:
+    """计算 MCP server 配置的缓存键（command/args/cwd/url + env 哈希）"""
+    env = cfg.get("env") or {}
+    env_hash = hashlib.sha256(
+        json.dumps(env, sort_keys=True, ensure_ascii=True, default=str).encode("utf-8")
+    ).hexdigest()
+    identity = {
+        "command": cfg.get("command", ""),
+        "args": [str(arg) for arg in cfg.get("args", []) or []],
+        "cwd": cfg.get("cwd") or "",
+        "url": cfg.get("url") or "",
+        "env": env_hash,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, ensure_ascii=True).encode("utf-8")).hexdigest()[:32]
+
+
+class McpToolCatalog:
+    """持久化的 MCP 工具目录
+
+    Args:
+        path: 缓存文件路径（None 表示 Config.get_state_dir() / mcp_catalog.json）
+        ttl_seconds: 条目有效期（None 表示读取环境变量/默认值，0 表示禁用）
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None, ttl_seconds: int | None = None):
+        self.path = Path(path) if path is not None else Config.get_state_dir() / CATALOG_FILENAME
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else get_catalog_ttl()
+        self._entries: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def entries(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARNING] MCP 工具目录读取失败，忽略: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CATALOG_VERSION:
+            return {}
+        entries = data.get("entries", {})
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, cfg: dict[str, Any], now: float | None = None) -> list[str] | None:
+        """查询未过期的工具列表（未命中返回 None）"""
+        if not self.enabled:
+            return None
+        entry = self.entries.get(server_cache_key(cfg))
+        if not entry:
+            return None
+        now = time.time() if now is None else now
+        if now - float(entry.get("fetched_at", 0)) > self.ttl_seconds:
+            return None
+        tools = entry.get("tools")
+        return list(tools) if isinstance(tools, list) else None
+
+    def put(self, server_name: str, cfg: dict[str, Any], tools: list[str], now: float | None = None) -> None:
+        """记录工具列表并写回文件（空列表视为获取失败，不缓存）"""
+        if not self.enabled or not tools:
+            return
+        self.entries[server_cache_key(cfg)] = {
+            "server": server_name,
+            "tools": sorted(tools),
+            "fetched_at": time.time() if now is None else now,
+        }
+        self.save(now)
+
+    def save(self, now: float | None = None) -> None:
+        """写回缓存文件（清理过期条目，原子替换）"""
+        if self._entries is None:
+            return
+        now = time.time() if now is None else now
+        entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if now - float(entry.get("fetched_at", 0)) <= self.ttl_seconds
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CATALOG_VERSION, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"[WARNING] MCP 工具目录写入失败: {e}")
+            return
+        self._entries = entries
+
+    def get_tools(
+        self,
+        server_name: str,
+        cfg: dict[str, Any],
+        lister: Callable[[str, dict[str, Any]], list[str]] | None = None,
+    ) -> list[str] | None:
+        """获取工具列表：优先使用缓存，未命中时调用 lister 并缓存结果
+
+        Args:
+            server_name: MCP server 名称
+            cfg: server 配置
+            lister: 实际列出工具的函数（None 表示只查缓存，不启动 server）
+
+        Returns:
+            工具名称列表；未命中且不允许获取时返回 None
+        """
+        cached = self.get(cfg)
+        if cached is not None:
+            logger.debug("MCP tool catalog hit for '%s'", server_name)
+            return cached
+        if lister is None:
+            return None
+        tools = lister(server_name, cfg)
+        self.put(server_name, cfg, tools)
+        return tools
+
+
+def get_mcp_catalog() -> McpToolCatalog:
+    """获取进程内共享的工具目录"""
+    global _catalog
+    if _catalog is None:
+        _catalog = McpToolCatalog()
+    return _catalog
+
+
+def clear_mcp_catalog() -> None:
+    """丢弃进程内的目录实例（下次使用时重新读取文件）"""
+    global _catalog
+    _catalog = None
@@ -0,0 +1,462 @@
+"""MCP server 进程池：同一次运行中多个 Agent 共享 stdio MCP server
+
+默认情况下每个 SDK 会话都会各自启动 .mcp.json 中的 stdio MCP server，
+并行 Agent 与 gqy20 多阶段流程因此反复支付进程启动和初始化开销。
+启用 ISSUELAB_MCP_POOL=1 后：
+
+- 每个不同的 server 配置（mcp_catalog.server_cache_key，含工作目录）在本进程中只启动一次
+- server 在 Agent 的工作目录中启动（与 SDK 直接启动时一致），args 中的相对路径仍然有效
+- 进程池在后台事件循环中为每个 server 监听一个 Unix socket，
+  SDK 拿到的配置被改写为启动 issuelab.tools.mcp_shim（把 stdio 转接到 socket）
+- 多路复用器按 JSON-RPC 请求重写 id，把响应路由回对应的会话；
+  initialize 只转发一次，之后的会话直接复用缓存的初始化结果
+- 进程退出时（atexit）或调用 shutdown_mcp_pool() 时关闭所有 server
+"""
+
+import asyncio
+import atexit
+import itertools
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import uuid
+from contextlib import suppress
+from typing import Any
+
+from issuelab.agents.mcp_catalog import server_cache_key
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SHIM_MODULE = "issuelab.tools.mcp_shim"
+# 单条 JSON-RPC 消息上限（工具结果可能很大，asyncio 默认只有 64 KiB）
+STREAM_LIMIT = 32 * 1024 * 1024
+START_TIMEOUT = 10.0
+STOP_TIMEOUT = 5.0
+
+_pool: "McpServerPool | None" = None
+_pool_lock = threading.Lock()
+
+
+def is_mcp_pool_enabled() -> bool:
+    """是否启用 MCP 进程池（环境变量 ISSUELAB_MCP_POOL）"""
+    enabled = os.environ.get("ISSUELAB_MCP_POOL", "").strip().lower() in {"1", "true", "yes", "on"}
+    return enabled and hasattr(socket, "AF_UNIX")
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class McpMultiplexer:
+    """把多个 MCP 客户端会话复用到同一个 stdio server 进程
+
+    Args:
+        name: server 名称（日志用）
+        cfg: .mcp.json 中的 stdio server 配置
+    """
+
+    def __init__(self, name: str, cfg: dict[str, Any]):
+        self.name = name
+        self.cfg = cfg
+        self.starts = 0
+        self._process: asyncio.subprocess.Process | None = None
+        self._start_lock: asyncio.Lock | None = None
+        self._clients: dict[int, asyncio.StreamWriter] = {}
+        self._client_ids = itertools.count(1)
+        self._upstream_ids = itertools.count(1)
+        # 上游请求 id -> (客户端, 客户端原始 id)
+        self._pending: dict[int, tuple[int, Any]] = {}
+        # 转发给客户端的 server 请求 id -> (客户端, 上游原始 id)
+        self._server_requests: dict[int, tuple[int, Any]] = {}
+        self._progress_tokens: dict[Any, int] = {}
+        self._reset_session()
+
+    def _reset_session(self) -> None:
+        self._init_result: dict[str, Any] | None = None
+        self._init_upstream_id: int | None = None
+        self._init_waiters: list[tuple[int, Any]] = []
+        self._initialized_sent = False
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def ensure_started(self) -> None:
+        """启动上游 server（已在运行时直接返回）"""
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.running:
+                return
+            env = {**os.environ, **{k: str(v) for k, v in (self.cfg.get("env") or {}).items()}}
+            self._process = await asyncio.create_subprocess_exec(
+                self.cfg["command"],
+                *[str(arg) for arg in self.cfg.get("args", []) or []],
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                env=env,
+                cwd=self.cfg.get("cwd") or None,
+                limit=STREAM_LIMIT,
+            )
+            self._reset_session()
+            self.starts += 1
+            logger.info(f"[MCP Pool] 启动 server '{self.name}' (pid={self._process.pid})")
+            asyncio.get_running_loop().create_task(self._read_upstream(self._process))
+
+    async def _send_upstream(self, message: dict[str, Any]) -> None:
+        process = self._process
+        if process is None or process.stdin is None:
+            raise ConnectionError(f"MCP server '{self.name}' 未运行")
+        process.stdin.write(_encode(message))
+        await process.stdin.drain()
+
+    async def _send_client(self, client_id: int, message: dict[str, Any]) -> None:
+        writer = self._clients.get(client_id)
+        if writer is None or writer.is_closing():
+            return
+        writer.write(_encode(message))
+        with suppress(ConnectionError):
+            await writer.drain()
+
+    async def _reply_error(self, client_id: int, request_id: Any, message: str) -> None:
+        await self._send_client(
+            client_id, {"jsonrpc": "2.0", "id": request_id, "error": {"code": -32603, "message": message}}
+        )
+
+    # ---- 客户端 -> 上游 ----
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理一个客户端连接（asyncio.start_unix_server 回调）"""
+        client_id = next(self._client_ids)
+        self._clients[client_id] = writer
+        try:
+            await self.ensure_started()
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning(f"[MCP Pool] '{self.name}' 收到无效消息，已忽略")
+                    continue
+                if isinstance(message, dict):
+                    await self._from_client(client_id, message)
+        except (ConnectionError, OSError, ValueError) as e:
+            logger.warning(f"[MCP Pool] '{self.name}' 客户端连接异常: {e}")
+        finally:
+            await self._drop_client(client_id)
+            writer.close()
+
+    async def _from_client(self, client_id: int, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        msg_id = message.get("id")
+
+        if method is None:
+            # 客户端对 server 请求的响应
+            origin = self._server_requests.pop(msg_id, None) if isinstance(msg_id, int) else None
+            if origin is not None:
+                await self._send_upstream({**message, "id": origin[1]})
+            return
+
+        if msg_id is None:
+            await self._notification_from_client(client_id, message)
+            return
+
+        if method == "initialize":
+            await self._initialize(client_id, message)
+            return
+
+        params = message.get("params")
+        meta = params.get("_meta") if isinstance(params, dict) else None
+        token = meta.get("progressToken") if isinstance(meta, dict) else None
+        if token is not None:
+            self._progress_tokens[token] = client_id
+
+        upstream_id = next(self._upstream_ids)
+        self._pending[upstream_id] = (client_id, msg_id)
+        try:
+            await self._send_upstream({**message, "id": upstream_id})
+        except ConnectionError as e:
+            self._pending.pop(upstream_id, None)
+            await self._reply_error(client_id, msg_id, str(e))
+
+    async def _initialize(self, client_id: int, message: dict[str, Any]) -> None:
+        if self._init_result is not None:
+            await self._send_client(client_id, {"jsonrpc": "2.0", "id": message["id"], "result": self._init_result})
+            return
+        self._init_waiters.append((client_id, message["id"]))
+        if self._init_upstream_id is not None:
+            return
+        self._init_upstream_id = next(self._upstream_ids)
+        await self._send_upstream({**message, "id": self._init_upstream_id})
+
+    async def _notification_from_client(self, client_id: int, message: dict[str, Any]) -> None:
+        method = message.get("method")
+        if method == "notifications/initialized":
+            if self._initialized_sent:
+                return
+            self._initialized_sent = True
+        elif method == "notifications/cancelled":
+            params = message.get("params") or {}
+            upstream_id = self._find_upstream_id(client_id, params.get("requestId"))
+            if upstream_id is None:
+                return
+            message = {**message, "params": {**params, "requestId": upstream_id}}
+        await self._send_upstream(message)
+
+    def _find_upstream_id(self, client_id: int, request_id: Any) -> int | None:
+        for upstream_id, origin in self._pending.items():
+            if origin == (client_id, request_id):
+                return upstream_id
+        return None
+
+    async def _drop_client(self, client_id: int) -> None:
+        self._clients.pop(client_id, None)
+        abandoned = [upstream_id for upstream_id, origin in self._pending.items() if origin[0] == client_id]
+        for upstream_id in abandoned:
+            del self._pending[upstream_id]
+            if self.running:
+                with suppress(ConnectionError, OSError):
+                    await self._send_upstream(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "notifications/cancelled",
+                            "params": {"requestId": upstream_id, "reason": "client disconnected"},
+                        }
+                    )
+        self._init_waiters = [waiter for waiter in self._init_waiters if waiter[0] != client_id]
+        self._progress_tokens = {k: v for k, v in self._progress_tokens.items() if v != client_id}
+
+    # ---- 上游 -> 客户端 ----
+
+    async def _read_upstream(self, process: asyncio.subprocess.Process) -> None:
+        assert process.stdout is not None
+        try:
+            while line := await process.stdout.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(message, dict):
+                    await self._from_upstream(message)
+        except (ConnectionError, OSError, ValueError) as e:
+            logger.warning(f"[MCP Pool] 读取 server '{self.name}' 输出失败: {e}")
+        finally:
+            if process is self._process:
+                await self._upstream_exited()
+
+    async def _from_upstream(self, message: dict[str, Any]) -> None:
+        msg_id = message.get("id")
+        method = message.get("method")
+
+        if method is None:
+            if msg_id is not None and msg_id == self._init_upstream_id:
+                await self._initialized(message)
+                return
+            origin = self._pending.pop(msg_id, None) if isinstance(msg_id, int) else None
+            if origin is not None:
+                await self._send_client(origin[0], {**message, "id": origin[1]})
+            return
+
+        if msg_id is not None:
+            # server 发起的请求（ping / roots/list / sampling）：交给任一在线客户端处理
+            if not self._clients:
+                await self._send_upstream(
+                    {"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32603, "message": "no client connected"}}
+                )
+                return
+            client_id = next(iter(self._clients))
+            proxy_id = next(self._upstream_ids)
+            self._server_requests[proxy_id] = (client_id, msg_id)
+            await self._send_client(client_id, {**message, "id": proxy_id})
+            return
+
+        params = message.get("params")
+        token = params.get("progressToken") if isinstance(params, dict) else None
+        if method == "notifications/progress" and token in self._progress_tokens:
+            await self._send_client(self._progress_tokens[token], message)
+            return
+        for client_id in list(self._clients):
+            await self._send_client(client_id, message)
+
+    async def _initialized(self, message: dict[str, Any]) -> None:
+        waiters, self._init_waiters = self._init_waiters, []
+        if "result" in message:
+            self._init_result = message["result"]
+        else:
+            # 初始化失败：允许下一个会话重试
+            self._init_upstream_id = None
+        for client_id, request_id in waiters:
+            await self._send_client(client_id, {**message, "id": request_id})
+
+    async def _upstream_exited(self) -> None:
+        returncode = self._process.returncode if self._process else None
+        logger.warning(f"[MCP Pool] server '{self.name}' 已退出 (returncode={returncode})")
+        pending = list(self._pending.values()) + self._init_waiters
+        self._pending.clear()
+        self._reset_session()
+        for client_id, request_id in pending:
+            await self._reply_error(client_id, request_id, f"MCP server '{self.name}' exited")
+        # 关闭现有会话；SDK 重新连接时会重新启动 server
+        for writer in list(self._clients.values()):
+            writer.close()
+
+    async def stop(self) -> None:
+        """关闭上游 server 与所有客户端连接"""
+        process, self._process = self._process, None
+        for writer in list(self._clients.values()):
+            writer.close()
+        if process is None or process.returncode is not None:
+            return
+        if process.stdin is not None:
+            with suppress(OSError):
+                process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), STOP_TIMEOUT)
+        except TimeoutError:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), STOP_TIMEOUT)
+            except TimeoutError:
+                process.kill()
+                await process.wait()
+        logger.info(f"[MCP Pool] 已关闭 server '{self.name}'")
+
+
+class McpServerPool:
+    """本进程共享的 MCP server 池（后台线程运行事件循环）"""
+
+    def __init__(self):
+        self.token = uuid.uuid4().hex[:12]
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._dir: str | None = None
+        self._servers: dict[str, tuple[McpMultiplexer, asyncio.AbstractServer, str]] = {}
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._dir = tempfile.mkdtemp(prefix="issuelab-mcp-")
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name="issuelab-mcp-pool", daemon=True)
+            self._thread.start()
+        return self._loop
+
+    def _run(self, coro: Any, timeout: float = START_TIMEOUT) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result(timeout)
+
+    @staticmethod
+    def _launch_config(cfg: dict[str, Any], cwd: str | os.PathLike[str] | None) -> dict[str, Any]:
+        """确定 server 的实际启动目录（配置中的 cwd 优先，否则为 Agent 工作目录）"""
+        launch_cwd = cfg.get("cwd") or cwd
+        return {**cfg, "cwd": str(launch_cwd)} if launch_cwd else cfg
+
+    def endpoint(self, name: str, cfg: dict[str, Any], cwd: str | os.PathLike[str] | None = None) -> dict[str, Any]:
+        """返回指向共享 server 的 stdio 配置（非 stdio 配置原样返回）
+
+        首次调用时在后台预热启动 server，与 SDK 会话的启动并行。
+
+        Args:
+            name: server 名称
+            cfg: .mcp.json 中的 server 配置
+            cwd: Agent 工作目录（SDK 会在此目录启动 server），工作目录不同的 Agent 不共享 server
+        """
+        if not isinstance(cfg, dict) or not cfg.get("command"):
+            return cfg
+        cfg = self._launch_config(cfg, cwd)
+        key = server_cache_key(cfg)
+        with self._lock:
+            entry = self._servers.get(key)
+            if entry is None:
+                loop = self._ensure_loop()
+                assert self._dir is not None
+                socket_path = os.path.join(self._dir, f"{key[:16]}.sock")
+                mux = McpMultiplexer(name, cfg)
+                server = self._run(asyncio.start_unix_server(mux.handle_client, path=socket_path, limit=STREAM_LIMIT))
+                entry = (mux, server, socket_path)
+                self._servers[key] = entry
+                future = asyncio.run_coroutine_threadsafe(mux.ensure_started(), loop)
+                future.add_done_callback(lambda f, n=name: self._log_start_failure(n, f))
+        return {"type": "stdio", "command": sys.executable, "args": ["-m", SHIM_MODULE, entry[2]]}
+
+    @staticmethod
+    def _log_start_failure(name: str, future: Any) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"[MCP Pool] 预热 server '{name}' 失败: {future.exception()}")
+
+    def rewrite(self, servers: dict[str, Any], cwd: str | os.PathLike[str] | None = None) -> dict[str, Any]:
+        """把 MCP 配置中的 stdio server 改写为共享端点"""
+        return {name: self.endpoint(name, cfg, cwd) for name, cfg in servers.items()}
+
+    def multiplexer(
+        self, name: str, cfg: dict[str, Any], cwd: str | os.PathLike[str] | None = None
+    ) -> McpMultiplexer | None:
+        """查询已注册的多路复用器（测试/诊断用）"""
+        entry = self._servers.get(server_cache_key(self._launch_config(cfg, cwd)))
+        return entry[0] if entry else None
+
+    def close(self) -> None:
+        """关闭所有 server、停止事件循环并清理 socket 目录"""
+        with self._lock:
+            if self._loop is None:
+                return
+            servers, self._servers = list(self._servers.values()), {}
+
+            async def _shutdown() -> None:
+                for mux, server, _path in servers:
+                    server.close()
+                    await mux.stop()
+
+            try:
+                self._run(_shutdown(), timeout=STOP_TIMEOUT * 3)
+            except Exception as e:
+                logger.warning(f"[MCP Pool] 关闭进程池失败: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                self._thread.join(STOP_TIMEOUT)
+            self._loop = None
+            self._thread = None
+            if self._dir:
+                shutil.rmtree(self._dir, ignore_errors=True)
+                self._dir = None
+
+
+def get_mcp_pool() -> McpServerPool:
+    """获取本进程共享的 MCP 进程池"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = McpServerPool()
+        return _pool
+
+
+def shutdown_mcp_pool() -> None:
+    """关闭 MCP 进程池（进程退出时自动调用）"""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def mcp_pool_token() -> str:
+    """当前进程池标识（用于选项缓存键：进程池重建后旧端点失效）"""
+    return get_mcp_pool().token if is_mcp_pool_enabled() else ""
+
+
+def pool_mcp_servers(servers: dict[str, Any], cwd: str | os.PathLike[str] | None = None) -> dict[str, Any]:
+    """启用进程池时改写 MCP 配置，否则原样返回
+
+    Args:
+        servers: MCP server 配置
+        cwd: Agent 工作目录（共享 server 在此目录启动）
+    """
+    if not servers or not is_mcp_pool_enabled():
+        return servers
+    return get_mcp_pool().rewrite(servers, cwd)
+
+
+atexit.register(shutdown_mcp_pool)
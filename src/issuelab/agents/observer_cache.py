@@ -0,0 +1,222 @@
+"""Observer 决策缓存
+
+observer.yml 每小时扫描一次，大部分 Issue 在两次扫描之间没有任何变化。
+本模块按 (Issue 内容哈希, Agent 矩阵版本) 持久化上一次的 Observer 决策：
+
+- 内容与 Agent 矩阵都未变化且未过期 → 跳过分析，也不会重复触发
+- 超过 TTL 的条目强制重新分析（默认 24 小时，ISSUELAB_OBSERVER_CACHE_TTL 覆盖，0 表示禁用缓存）
+
+缓存文件位于 Config.get_state_dir() / observer_cache.json，workflow 通过 actions/cache 在运行间保留。
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from issuelab.config import Config
+from issuelab.logging_config import get_logger
+from issuelab.results import ObserverDecision
+
+logger = get_logger(__name__)
+
+CACHE_FILENAME = "observer_cache.json"
+CACHE_VERSION = 1
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+# 缓存中保留的决策字段
+_DECISION_FIELDS = ("should_trigger", "agent", "reason", "analysis")
+
+
+def get_cache_ttl(default: int = DEFAULT_TTL_SECONDS) -> int:
+    """读取缓存 TTL（秒，环境变量 ISSUELAB_OBSERVER_CACHE_TTL）"""
+    raw = os.environ.get("ISSUELAB_OBSERVER_CACHE_TTL", "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_OBSERVER_CACHE_TTL={raw!r}，使用默认值 {default}")
+        return default
+
+
+def issue_state_hash(title: str, body: str, comments: str) -> str:
+    """计算 Issue 内容哈希（标题、正文、评论任一变化都会改变哈希）"""
+    digest = hashlib.sha256()
+    for part in (title, body, comments):
+        data = (part or "").encode("utf-8")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def agent_matrix_version() -> str:
+    """计算 Agent 矩阵版本（可触发的 Agent 列表或 Observer prompt 变化时失效）"""
+    from issuelab.agents.discovery import discover_agents, get_agent_matrix_markdown
+
+    observer_prompt = discover_agents().get("observer", {}).get("prompt", "")
+    digest = hashlib.sha256()
+    digest.update(get_agent_matrix_markdown().encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(observer_prompt.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ObserverDecisionCache:
+    """持久化的 Observer 决策缓存
+
+    Args:
+        path: 缓存文件路径（None 表示 Config.get_state_dir() / observer_cache.json）
+        ttl_seconds: 条目有效期（None 表示读取环境变量/默认值，0 表示禁用）
+        matrix_version: Agent 矩阵版本（None 表示首次使用时计算）
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        ttl_seconds: int | None = None,
+        matrix_version: str | None = None,
+    ):
+        self.path = Path(path) if path is not None else Config.get_state_dir() / CACHE_FILENAME
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else get_cache_ttl()
+        self._matrix_version = matrix_version
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._dirty = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @property
+    def matrix_version(self) -> str:
+        if self._matrix_version is None:
+            self._matrix_version = agent_matrix_version()
+        return self._matrix_version
+
+    @property
+    def entries(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = self._load()
+        return self._entries
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARNING] Observer 缓存读取失败，忽略: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        entries = data.get("entries", {})
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, issue_number: int, state_hash: str, now: float | None = None) -> ObserverDecision | None:
+        """查询缓存；命中时返回跳过决策（should_trigger=False，避免重复触发）
+
+        Args:
+            issue_number: Issue 编号
+            state_hash: issue_state_hash() 计算的内容哈希
+            now: 当前时间戳（测试用）
+
+        Returns:
+            命中时返回 ObserverDecision（extra 中 cached=True），否则返回 None
+        """
+        if not self.enabled:
+            return None
+        entry = self.entries.get(str(issue_number))
+        if not entry or entry.get("state_hash") != state_hash or entry.get("matrix_version") != self.matrix_version:
+            return None
+        now = time.time() if now is None else now
+        decided_at = float(entry.get("decided_at", 0))
+        if now - decided_at > self.ttl_seconds:
+            return None
+
+        previous = entry.get("decision", {})
+        decision = ObserverDecision(
+            agent=str(previous.get("agent", "") or ""),
+            reason=f"Issue 自上次分析后无变化，跳过（上次决策: {previous.get('reason', '') or 'N/A'}）",
+            analysis=str(previous.get("analysis", "") or ""),
+            issue_number=issue_number,
+        )
+        decision["cached"] = True
+        decision["cached_should_trigger"] = bool(previous.get("should_trigger", False))
+        return decision
+
+    def put(
+        self,
+        issue_number: int,
+        state_hash: str,
+        decision: ObserverDecision | dict,
+        now: float | None = None,
+        triggered: bool = False,
+    ):
+        """记录一次新的决策（带 error 的决策不缓存）
+
+        需要触发的决策只有在触发成功后（triggered=True）才缓存，
+        否则缓存命中会在整个 TTL 内跳过该 Issue，失败的触发永远不会重试。
+        """
+        if not self.enabled or decision.get("error") or decision.get("cached"):
+            return
+        if decision.get("should_trigger") and not triggered:
+            return
+        self.entries[str(issue_number)] = {
+            "state_hash": state_hash,
+            "matrix_version": self.matrix_version,
+            "decided_at": time.time() if now is None else now,
+            "decision": {key: decision.get(key) for key in _DECISION_FIELDS},
+        }
+        self._dirty = True
+
+    def partition(self, issue_data_list: list[dict]) -> tuple[list[ObserverDecision], list[dict]]:
+        """把 Issues 分为缓存命中（直接跳过）和需要分析的两部分
+
+        Args:
+            issue_data_list: Issue 数据列表，带 state_hash 字段的 Issue 才参与缓存
+
+        Returns:
+            (命中的跳过决策列表, 需要分析的 Issue 数据列表)
+        """
+        hits: list[ObserverDecision] = []
+        pending: list[dict] = []
+        for issue_data in issue_data_list:
+            state_hash = issue_data.get("state_hash")
+            cached = self.get(issue_data["issue_number"], state_hash) if state_hash else None
+            if cached is None:
+                pending.append(issue_data)
+            else:
+                hits.append(cached)
+        if hits:
+            logger.info(f"[Observer] 缓存命中 {len(hits)} 个 Issues，跳过分析")
+        return hits, pending
+
+    def record(
+        self, decisions: list[ObserverDecision] | list[dict], issue_data_list: list[dict], triggered: bool = False
+    ) -> None:
+        """按 issue_number 把批量决策写入缓存（triggered 表示需要触发的决策已成功触发）"""
+        hashes = {d["issue_number"]: d.get("state_hash") for d in issue_data_list}
+        for decision in decisions:
+            state_hash = hashes.get(decision.get("issue_number"))
+            if state_hash:
+                self.put(decision["issue_number"], state_hash, decision, triggered=triggered)
+
+    def save(self, now: float | None = None) -> None:
+        """写回缓存文件（清理过期条目，原子替换；未修改时不写）"""
+        if not self._dirty or self._entries is None:
+            return
+        now = time.time() if now is None else now
+        entries = {
+            key: entry
+            for key, entry in self._entries.items()
+            if now - float(entry.get("decided_at", 0)) <= self.ttl_seconds
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "entries": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._entries = entries
+        self._dirty = False
+        logger.info(f"[Observer] 缓存已保存: {len(entries)} 条 -> {self.path}")
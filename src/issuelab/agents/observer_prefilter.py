@@ -0,0 +1,223 @@
+"""Observer 规则预过滤
+
+每个进入 Observer 的 Issue 都要消耗一次 LLM 调用。本模块在模型调用前用廉价规则
+剔除明显无需处理的 Issue，并记录跳过原因：
+
+- Issue 已关闭，或带有跳过标签（bot:processing、bot:quiet、stale 等）
+- 最后一条评论来自 bot 或 Agent（等待人类回复，无需再次触发）
+- 最近一次 Agent 回复距今不足冷却时间（默认 2 小时，ISSUELAB_OBSERVER_COOLDOWN_HOURS 覆盖，0 表示关闭）
+
+冷却期跳过只是"推迟"：决策带 deferred=True，observe-batch --since-last-scan 会把这些 Issue
+留给下次扫描重新选中，而不是随高水位线推进永久跳过。
+
+Agent 最近回复之后的新内容里出现明确的触发信号时，不受"最后评论者"与"冷却时间"规则限制：
+
+- @agent 提及：按 mention_tokenizer 的分词结果精确匹配用户名（@echo 不会匹配 @echoes）
+- trigger_conditions：整句按短语匹配，两端不能紧邻英文字母/数字（"bug" 不会匹配 "debugging"）
+
+trigger_conditions 多为描述性句子（如"新论文 Issue"），评论中很少逐字出现，
+因此实际上主要由 @agent 提及覆盖跳过规则。
+"""
+
+import os
+import re
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from issuelab.logging_config import get_logger
+from issuelab.mention_tokenizer import tokenize_mentions
+from issuelab.results import ObserverDecision
+
+logger = get_logger(__name__)
+
+DEFAULT_SKIP_LABELS = ("bot:processing", "bot:quiet", "stale", "wontfix", "duplicate", "invalid")
+DEFAULT_COOLDOWN_HOURS = 2.0
+
+# 跳过原因代码
+SKIP_CLOSED = "closed"
+SKIP_LABEL = "label"
+SKIP_LAST_COMMENT_BY_AGENT = "last_comment_by_agent"
+SKIP_AGENT_COOLDOWN = "agent_cooldown"
+# 条件过期后需要重新评估的跳过原因（其余原因在 Issue 再次更新前都成立）
+DEFERRED_SKIP_CODES = frozenset({SKIP_AGENT_COOLDOWN})
+
+# gh CLI 返回的 GitHub App 账号不带 [bot] 后缀
+_BOT_LOGINS = {"github-actions", "dependabot", "issuelab-bot"}
+_AGENT_PREFIX_RE = re.compile(r"^\s*\[Agent:\s*[^\]]+\]")
+
+
+def get_cooldown_hours(default: float = DEFAULT_COOLDOWN_HOURS) -> float:
+    """读取 Agent 回复冷却时间（小时，环境变量 ISSUELAB_OBSERVER_COOLDOWN_HOURS）"""
+    raw = os.environ.get("ISSUELAB_OBSERVER_COOLDOWN_HOURS", "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_OBSERVER_COOLDOWN_HOURS={raw!r}，使用默认值 {default}")
+        return default
+
+
+def collect_trigger_keywords(agents: dict[str, dict[str, Any]] | None = None) -> list[str]:
+    """从 Agent 矩阵收集触发关键词（trigger_conditions 与 @agent 提及，小写去重）
+
+    Args:
+        agents: discover_agents() 的结果（None 表示实时发现）
+
+    Returns:
+        关键词列表
+    """
+    if agents is None:
+        from issuelab.agents.discovery import discover_agents
+
+        agents = discover_agents()
+
+    keywords: dict[str, None] = {}
+    for name, config in agents.items():
+        if name == "observer":
+            continue
+        keywords.setdefault(f"@{name}".lower(), None)
+        for condition in config.get("trigger_conditions", []) or []:
+            if isinstance(condition, str) and condition.strip():
+                keywords.setdefault(condition.strip().lower(), None)
+    return list(keywords)
+
+
+def _phrase_pattern(phrase: str) -> re.Pattern[str]:
+    """短语匹配（空白可变长，两端不能紧邻英文字母/数字；中文按字面匹配）"""
+    body = r"\s+".join(re.escape(word) for word in phrase.split())
+    return re.compile(rf"(?<![0-9a-z_]){body}(?![0-9a-z_])")
+
+
+def is_agent_comment(comment: dict[str, Any]) -> bool:
+    """判断评论是否来自 bot 或 Agent"""
+    author = comment.get("author") or {}
+    login = str(author.get("login", "") if isinstance(author, dict) else author)
+    if login.endswith("[bot]") or login in _BOT_LOGINS or comment.get("authorIsBot"):
+        return True
+    return bool(_AGENT_PREFIX_RE.match(comment.get("body", "") or ""))
+
+
+def _parse_timestamp(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _label_names(labels: Iterable[Any]) -> set[str]:
+    return {label.get("name", "") if isinstance(label, dict) else str(label) for label in labels or []}
+
+
+class ObserverPrefilter:
+    """Observer 规则预过滤器
+
+    Args:
+        skip_labels: 带有任一标签的 Issue 直接跳过
+        cooldown_hours: Agent 回复后的冷却时间（None 表示读取环境变量/默认值，0 表示关闭）
+        keywords: 触发关键词（None 表示首次需要时从 Agent 矩阵收集）
+    """
+
+    def __init__(
+        self,
+        skip_labels: Iterable[str] = DEFAULT_SKIP_LABELS,
+        cooldown_hours: float | None = None,
+        keywords: Iterable[str] | None = None,
+    ):
+        self.skip_labels = set(skip_labels)
+        self.cooldown_hours = cooldown_hours if cooldown_hours is not None else get_cooldown_hours()
+        self._keywords = [k.lower() for k in keywords] if keywords is not None else None
+        self._condition_patterns: list[tuple[str, re.Pattern[str]]] | None = None
+
+    @property
+    def keywords(self) -> list[str]:
+        if self._keywords is None:
+            self._keywords = collect_trigger_keywords()
+        return self._keywords
+
+    def _conditions(self) -> list[tuple[str, re.Pattern[str]]]:
+        if self._condition_patterns is None:
+            self._condition_patterns = [
+                (k, _phrase_pattern(k)) for k in self.keywords if not k.startswith("@") and k.split()
+            ]
+        return self._condition_patterns
+
+    def _match_keyword(self, text: str) -> str | None:
+        mentioned = {name.lower() for name in tokenize_mentions(text).unique(case_sensitive=False)}
+        for keyword in self.keywords:
+            if keyword.startswith("@") and keyword[1:] in mentioned:
+                return keyword
+        lowered = text.lower()
+        return next((k for k, pattern in self._conditions() if pattern.search(lowered)), None)
+
+    def check(self, issue: dict[str, Any], now: datetime | None = None) -> tuple[str, str] | None:
+        """检查单个 Issue 是否可以跳过
+
+        Args:
+            issue: get_issue_info() 返回的数据（使用 state、labels、title、body 与 raw_comments）
+            now: 当前时间（测试用）
+
+        Returns:
+            (原因代码, 原因说明)；需要交给 Observer 分析时返回 None
+        """
+        if str(issue.get("state", "")).lower() == "closed":
+            return SKIP_CLOSED, "Issue 已关闭"
+
+        matched_labels = sorted(_label_names(issue.get("labels", [])) & self.skip_labels)
+        if matched_labels:
+            return SKIP_LABEL, f"带有跳过标签: {', '.join(matched_labels)}"
+
+        comments = issue.get("raw_comments")
+        if not isinstance(comments, list) or not comments:
+            return None
+
+        last_agent_index = max((i for i, c in enumerate(comments) if is_agent_comment(c)), default=None)
+        if last_agent_index is None:
+            return None
+
+        # Agent 最近回复之后出现触发关键词 → 交给 Observer
+        new_text = "\n".join(c.get("body", "") or "" for c in comments[last_agent_index + 1 :])
+        if new_text and self._match_keyword(new_text):
+            return None
+
+        if last_agent_index == len(comments) - 1:
+            return SKIP_LAST_COMMENT_BY_AGENT, "最后一条评论来自 bot/Agent，等待人类回复"
+
+        if self.cooldown_hours > 0:
+            replied_at = _parse_timestamp(comments[last_agent_index].get("createdAt"))
+            now = now or datetime.now(UTC)
+            if replied_at is not None:
+                elapsed = (now - replied_at).total_seconds() / 3600
+                if elapsed < self.cooldown_hours:
+                    return (
+                        SKIP_AGENT_COOLDOWN,
+                        f"Agent {elapsed:.1f} 小时前刚回复（冷却 {self.cooldown_hours:g} 小时），且无触发关键词",
+                    )
+        return None
+
+    def skip_decision(
+        self, issue_number: int, issue: dict[str, Any], now: datetime | None = None
+    ) -> ObserverDecision | None:
+        """检查 Issue，可跳过时返回记录了原因的跳过决策
+
+        Args:
+            issue_number: Issue 编号
+            issue: get_issue_info() 返回的数据
+            now: 当前时间（测试用）
+
+        Returns:
+            跳过决策（extra 中 prefiltered=True、skip_code 为原因代码，
+            deferred 表示只是暂缓、稍后需要重新评估）；需要分析时返回 None
+        """
+        verdict = self.check(issue, now=now)
+        if verdict is None:
+            return None
+        code, reason = verdict
+        decision = ObserverDecision(reason=f"预过滤跳过: {reason}", issue_number=issue_number)
+        decision["prefiltered"] = True
+        decision["skip_code"] = code
+        decision["deferred"] = code in DEFERRED_SKIP_CODES
+        logger.info(f"[Observer] 预过滤跳过 Issue #{issue_number}: {reason}")
+        return decision
@@ -3,28 +3,54 @@
 处理 SDK 选项的创建和缓存管理。
 """
 
+import asyncio
 import json
 import os
 import re
-from concurrent.futures import ThreadPoolExecutor
-from concurrent.futures import TimeoutError as FutureTimeoutError
+import time
 from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
-import yaml
 from claude_agent_sdk import AgentDefinition, ClaudeAgentOptions
 
 from issuelab.agents.config import AgentConfig
 from issuelab.agents.discovery import AGENTS_DIR, discover_agents
+from issuelab.agents.io_pool import arun_blocking, run_blocking, run_coroutine
+from issuelab.agents.mcp_catalog import get_mcp_catalog
+from issuelab.agents.mcp_pool import mcp_pool_token, pool_mcp_servers
 from issuelab.agents.registry import BUILTIN_AGENTS, get_agent_config
 from issuelab.config import Config
 from issuelab.logging_config import get_logger
+from issuelab.lru import LRUCache
+from issuelab.yaml_utils import safe_load
 
 logger = get_logger(__name__)
 
-# 全局缓存：存储 Agent 选项
-_cached_agent_options: dict[tuple, ClaudeAgentOptions] = {}
+# 选项缓存最大条目数（ISSUELAB_OPTIONS_CACHE_SIZE 覆盖，0 表示不限制）
+DEFAULT_OPTIONS_CACHE_SIZE = 64
+
+
+def _get_options_cache_size(default: int = DEFAULT_OPTIONS_CACHE_SIZE) -> int:
+    """读取选项缓存容量（环境变量 ISSUELAB_OPTIONS_CACHE_SIZE）"""
+    raw = os.environ.get("ISSUELAB_OPTIONS_CACHE_SIZE", "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_OPTIONS_CACHE_SIZE={raw!r}，使用默认值 {default}")
+        return default
+
+
+# 全局缓存：存储 Agent 选项（有界 LRU，长期运行的进程内存可控）
+_cached_agent_options: LRUCache = LRUCache(_get_options_cache_size(), name="agent_options")
+
+# 快速路径：调用参数 -> (文件指纹, 上次校验时间, 完整缓存键)
+# 完整缓存键需要读取 agent.yml / .mcp.json 并遍历 skills、subagents 目录；
+# 指纹只 stat 相关路径，TTL 内连 stat 都省掉，命中时只是一次字典查找
+_options_fast_path: LRUCache = LRUCache(_cached_agent_options.maxsize, name="agent_options_fast_path")
+
+# 指纹校验间隔（秒，ISSUELAB_OPTIONS_CACHE_TTL 覆盖，0 表示每次调用都校验指纹）
+DEFAULT_OPTIONS_CACHE_TTL = 30.0
 
 
 _TOOL_AND_CITATION_RULES = (
@@ -35,6 +61,9 @@ _TOOL_AND_CITATION_RULES = (
     "Output must include traceable source links (URLs) for factual statements so readers can verify them."
 )
 
+# prompt 中每个 MCP server 最多列出的工具数
+_PROMPT_MAX_TOOLS = 30
+
 # 内置系统智能体默认运行上限（当未在 agents/<name>/agent.yml 显式配置时生效）
 _BUILTIN_DEFAULT_OVERRIDES: dict[str, float | int] = {
     "max_turns": 100,
@@ -47,11 +76,16 @@ def clear_agent_options_cache() -> None:
 
     在测试或配置更改后调用此函数以确保使用最新的配置。
     """
-    global _cached_agent_options
-    _cached_agent_options = {}
+    _cached_agent_options.clear()
+    _options_fast_path.clear()
     logger.info("Agent 选项缓存已清除")
 
 
+def get_agent_options_cache_stats() -> dict[str, Any]:
+    """Agent 选项缓存统计（条目数、命中/未命中、淘汰次数、命中率）"""
+    return _cached_agent_options.stats()
+
+
 def _get_agent_run_overrides(agent_name: str | None) -> dict[str, float | int]:
     """读取 agent.yml 中的运行覆盖参数"""
     if not agent_name:
@@ -97,6 +131,33 @@ def _get_agent_feature_flags(agent_name: str | None) -> dict[str, bool]:
     return flags
 
 
+def _get_agent_subagent_scope(agent_name: str | None) -> frozenset[str] | None:
+    """读取 subagent 注册范围
+
+    - subagent_mode: all（默认）注册所有已发现的 agent 和 .claude/agents 下的全部 subagent
+    - subagent_mode: declared 只注册 agent.yml 中 subagents 列出的名称，
+      未声明的 subagent 文件不会被读取
+
+    模式优先取 agent.yml 的 subagent_mode，其次是环境变量 ISSUELAB_SUBAGENT_MODE。
+
+    Returns:
+        declared 模式下返回声明的名称集合，all 模式返回 None
+    """
+    mode = os.environ.get("ISSUELAB_SUBAGENT_MODE", "all").strip().lower()
+    config = get_agent_config(agent_name, agents_dir=AGENTS_DIR, include_disabled=False) if agent_name else None
+    if config and isinstance(config.get("subagent_mode"), str):
+        mode = config["subagent_mode"].strip().lower()
+    if mode != "declared":
+        return None
+
+    declared = config.get("subagents") if config else None
+    if isinstance(declared, str):
+        declared = declared.split(",")
+    if not isinstance(declared, list):
+        return frozenset()
+    return frozenset(str(name).strip() for name in declared if str(name).strip())
+
+
 def _read_mcp_servers_from_file(path: Path) -> dict[str, Any]:
     """读取 .mcp.json 并返回 mcpServers 字典
 
@@ -109,13 +170,38 @@ def _read_mcp_servers_from_file(path: Path) -> dict[str, Any]:
 
     try:
         raw_text = _read_text_with_timeout(path)
-        raw = json.loads(raw_text)
-    except (json.JSONDecodeError, OSError) as exc:
+    except OSError as exc:
         logger.warning("读取 MCP 配置失败: %s (%s)", path, exc)
         return {}
     except TimeoutError as exc:
         logger.warning("读取 MCP 配置超时，已跳过: %s (%s)", path, exc)
         return {}
+    return _parse_mcp_servers(path, raw_text)
+
+
+async def _aread_mcp_servers_from_file(path: Path) -> dict[str, Any]:
+    """_read_mcp_servers_from_file 的异步版本"""
+    if not path.exists():
+        return {}
+
+    try:
+        raw_text = await _aread_text_with_timeout(path)
+    except OSError as exc:
+        logger.warning("读取 MCP 配置失败: %s (%s)", path, exc)
+        return {}
+    except TimeoutError as exc:
+        logger.warning("读取 MCP 配置超时，已跳过: %s (%s)", path, exc)
+        return {}
+    return _parse_mcp_servers(path, raw_text)
+
+
+def _parse_mcp_servers(path: Path, raw_text: str) -> dict[str, Any]:
+    """解析 .mcp.json 内容"""
+    try:
+        raw = json.loads(raw_text)
+    except json.JSONDecodeError as exc:
+        logger.warning("读取 MCP 配置失败: %s (%s)", path, exc)
+        return {}
 
     if not isinstance(raw, dict):
         logger.warning("MCP 配置格式错误（非 dict）: %s", path)
@@ -171,23 +257,33 @@ def _resolve_mcp_server_env(servers: dict[str, Any]) -> dict[str, Any]:
     return resolved
 
 
+def _config_load_timeout_ms() -> int:
+    return int(os.environ.get("MCP_CONFIG_LOAD_TIMEOUT_MS", "3000"))
+
+
 def _read_text_with_timeout(path: Path) -> str:
-    """读取文件内容（带超时）"""
-    timeout_ms = int(os.environ.get("MCP_CONFIG_LOAD_TIMEOUT_MS", "3000"))
+    """读取文件内容（带超时，在共享 I/O 线程池中执行）"""
+    timeout_ms = _config_load_timeout_ms()
     timeout_sec = max(timeout_ms, 0) / 1000.0
 
-    def _read() -> str:
+    if timeout_sec <= 0:
         return path.read_text(encoding="utf-8")
 
-    if timeout_sec <= 0:
-        return _read()
+    try:
+        return run_blocking(path.read_text, encoding="utf-8", timeout=timeout_sec)
+    except TimeoutError as exc:
+        raise TimeoutError(f"read timeout after {timeout_ms}ms") from exc
 
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(_read)
-        try:
-            return future.result(timeout=timeout_sec)
-        except FutureTimeoutError as exc:
-            raise TimeoutError(f"read timeout after {timeout_ms}ms") from exc
+
+async def _aread_text_with_timeout(path: Path) -> str:
+    """_read_text_with_timeout 的异步版本（不阻塞事件循环）"""
+    timeout_ms = _config_load_timeout_ms()
+    timeout_sec = max(timeout_ms, 0) / 1000.0
+
+    try:
+        return await arun_blocking(path.read_text, encoding="utf-8", timeout=timeout_sec if timeout_sec > 0 else None)
+    except TimeoutError as exc:
+        raise TimeoutError(f"read timeout after {timeout_ms}ms") from exc
 
 
 def load_mcp_servers_for_agent(agent_name: str | None, root_dir: Path | None = None) -> dict[str, Any]:
@@ -205,18 +301,63 @@ def load_mcp_servers_for_agent(agent_name: str | None, root_dir: Path | None = N
     return _resolve_mcp_server_env(servers)
 
 
+async def aload_mcp_servers_for_agent(agent_name: str | None, root_dir: Path | None = None) -> dict[str, Any]:
+    """load_mcp_servers_for_agent 的异步版本（全局与 per-agent 配置并发读取）"""
+    root = root_dir or AGENTS_DIR.parent
+    paths = [root / ".mcp.json"]
+    if agent_name:
+        paths.append(root / "agents" / agent_name / ".mcp.json")
+
+    servers: dict[str, Any] = {}
+    for loaded in await asyncio.gather(*(_aread_mcp_servers_from_file(path) for path in paths)):
+        servers.update(loaded)
+    return _resolve_mcp_server_env(servers)
+
+
+def _format_mcp_server_line(name: str, cfg: Any, tools: list[str] | None) -> str:
+    cfg_type = cfg.get("type", "") if isinstance(cfg, dict) else ""
+    type_text = f" [{cfg_type}]" if cfg_type else ""
+    tools_text = ""
+    if tools:
+        shown = ", ".join(tools[:_PROMPT_MAX_TOOLS])
+        more = f" 等 {len(tools)} 个" if len(tools) > _PROMPT_MAX_TOOLS else ""
+        tools_text = f": {shown}{more}"
+    return f"- {name}{type_text}{tools_text}"
+
+
 def format_mcp_servers_for_prompt(agent_name: str | None, root_dir: Path | None = None) -> str:
-    """为 prompt 格式化 MCP 服务器列表"""
+    """为 prompt 格式化 MCP 服务器列表
+
+    工具目录缓存中有记录时附带工具名称；MCP_PROMPT_TOOLS=1 时缓存未命中会启动 server 获取。
+    """
     servers = load_mcp_servers_for_agent(agent_name, root_dir=root_dir)
     if not servers:
         return "（未配置 MCP 工具）"
+    fetch = os.environ.get("MCP_PROMPT_TOOLS") == "1"
     lines = []
     for name, cfg in servers.items():
-        cfg_type = ""
+        tools = _list_mcp_tools_cached(name, cfg, fetch=fetch) if isinstance(cfg, dict) else None
+        lines.append(_format_mcp_server_line(name, cfg, tools))
+    return "\n".join(lines)
+
+
+async def aformat_mcp_servers_for_prompt(agent_name: str | None, root_dir: Path | None = None) -> str:
+    """format_mcp_servers_for_prompt 的异步版本（供已在事件循环中的调用方使用）"""
+    servers = await aload_mcp_servers_for_agent(agent_name, root_dir=root_dir)
+    if not servers:
+        return "（未配置 MCP 工具）"
+    fetch = os.environ.get("MCP_PROMPT_TOOLS") == "1"
+    catalog = get_mcp_catalog()
+    timeout_ms = int(os.environ.get("MCP_LIST_TOOLS_TIMEOUT_MS", "3000"))
+    lines = []
+    for name, cfg in servers.items():
+        tools: list[str] | None = None
         if isinstance(cfg, dict):
-            cfg_type = cfg.get("type", "")
-        type_text = f" [{cfg_type}]" if cfg_type else ""
-        lines.append(f"- {name}{type_text}")
+            tools = catalog.get(cfg)
+            if tools is None and fetch:
+                tools = await _alist_tools_for_mcp_server(name, cfg, timeout_ms=timeout_ms)
+                await arun_blocking(catalog.put, name, cfg, tools)
+        lines.append(_format_mcp_server_line(name, cfg, tools))
     return "\n".join(lines)
 
 
@@ -266,7 +407,7 @@ def _parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
 
     meta_str = match.group(1)
     try:
-        metadata = yaml.safe_load(meta_str) or {}
+        metadata = safe_load(meta_str) or {}
     except Exception:
         metadata = {}
 
@@ -274,14 +415,23 @@ def _parse_frontmatter(content: str) -> tuple[dict[str, Any], str]:
     return metadata, body
 
 
-def _load_subagents_from_dir(path: Path, default_tools: list[str]) -> dict[str, AgentDefinition]:
-    """从 .claude/agents 加载 subagents"""
+def _subagent_files(agents_dir: Path, names: frozenset[str] | None) -> list[Path]:
+    """列出 subagent 文件（names 不为 None 时只按文件名匹配声明的 subagent）"""
+    if names is None:
+        return list(agents_dir.glob("*.md"))
+    return [agents_dir / f"{name}.md" for name in sorted(names) if (agents_dir / f"{name}.md").is_file()]
+
+
+def _load_subagents_from_dir(
+    path: Path, default_tools: list[str], names: frozenset[str] | None = None
+) -> dict[str, AgentDefinition]:
+    """从 .claude/agents 加载 subagents（names 不为 None 时只读取声明的文件）"""
     agents_dir = path / ".claude" / "agents"
     if not agents_dir.exists():
         return {}
 
     subagents: dict[str, AgentDefinition] = {}
-    for md in agents_dir.glob("*.md"):
+    for md in _subagent_files(agents_dir, names):
         try:
             content = md.read_text(encoding="utf-8")
         except OSError:
@@ -319,14 +469,14 @@ def _subagents_signature(subagents: dict[str, AgentDefinition]) -> str:
     return json.dumps(sorted(subagents.keys()), ensure_ascii=True)
 
 
-def _subagents_signature_from_dir(path: Path) -> list[tuple[str, float]]:
+def _subagents_signature_from_dir(path: Path, names: frozenset[str] | None = None) -> list[tuple[str, float]]:
     """获取 subagents 目录签名（基于文件名与 mtime）"""
     agents_dir = path / ".claude" / "agents"
     if not agents_dir.exists():
         return []
 
     entries = []
-    for md in agents_dir.glob("*.md"):
+    for md in _subagent_files(agents_dir, names):
         try:
             entries.append((md.name, md.stat().st_mtime))
         except OSError:
@@ -342,23 +492,12 @@ def _subagents_signature_for_cache(
 
 
 def _run_async_in_thread(coro, timeout_ms: int) -> Any:
-    """在独立线程中运行 async 任务，避免与当前事件循环冲突"""
+    """在共享的后台事件循环中运行 async 任务，避免与当前事件循环冲突（超时会取消任务）"""
     timeout_sec = max(timeout_ms, 0) / 1000.0
-
-    def _runner():
-        import anyio
-
-        async def _async_runner():
-            return await coro
-
-        return anyio.run(_async_runner)
-
-    with ThreadPoolExecutor(max_workers=1) as executor:
-        future = executor.submit(_runner)
-        try:
-            return future.result(timeout=timeout_sec if timeout_sec > 0 else None)
-        except FutureTimeoutError as exc:
-            raise TimeoutError(f"async task timeout after {timeout_ms}ms") from exc
+    try:
+        return run_coroutine(coro, timeout=timeout_sec if timeout_sec > 0 else None)
+    except TimeoutError as exc:
+        raise TimeoutError(f"async task timeout after {timeout_ms}ms") from exc
 
 
 async def _list_tools_stdio(server_name: str, cfg: dict[str, Any]) -> list[str]:
@@ -373,8 +512,7 @@ async def _list_tools_stdio(server_name: str, cfg: dict[str, Any]) -> list[str]:
         cwd=cfg.get("cwd"),
     )
 
-    async with stdio_client(params) as (read_stream, write_stream):
-        session = ClientSession(read_stream, write_stream)
+    async with stdio_client(params) as (read_stream, write_stream), ClientSession(read_stream, write_stream) as session:
         await session.initialize()
         result = await session.list_tools()
         tools = result.tools or []
@@ -400,6 +538,46 @@ def _list_tools_for_mcp_server(server_name: str, cfg: dict[str, Any], timeout_ms
         return []
 
 
+async def _alist_tools_for_mcp_server(server_name: str, cfg: dict[str, Any], timeout_ms: int) -> list[str]:
+    """_list_tools_for_mcp_server 的异步版本（直接在当前事件循环中运行）"""
+    if "command" not in cfg:
+        logger.debug("Skip MCP tool listing for '%s': non-stdio server", server_name)
+        return []
+
+    timeout_sec = max(timeout_ms, 0) / 1000.0
+    try:
+        return await asyncio.wait_for(_list_tools_stdio(server_name, cfg), timeout_sec if timeout_sec > 0 else None)
+    except TimeoutError as exc:
+        logger.warning("List tools timeout for MCP server '%s': %s", server_name, exc)
+        return []
+    except Exception as exc:  # pragma: no cover - best effort
+        logger.warning("List tools failed for MCP server '%s': %s", server_name, exc)
+        return []
+
+
+def _list_mcp_tools_cached(
+    server_name: str, cfg: dict[str, Any], timeout_ms: int | None = None, fetch: bool = True
+) -> list[str] | None:
+    """列出 MCP server 工具（优先使用持久化的工具目录缓存）
+
+    Args:
+        server_name: MCP server 名称
+        cfg: server 配置
+        timeout_ms: 启动 server 获取工具列表的超时（None 表示读取 MCP_LIST_TOOLS_TIMEOUT_MS）
+        fetch: 缓存未命中时是否启动 server 获取
+
+    Returns:
+        工具名称列表；未命中且 fetch=False 时返回 None
+    """
+    if timeout_ms is None:
+        timeout_ms = int(os.environ.get("MCP_LIST_TOOLS_TIMEOUT_MS", "3000"))
+
+    def _lister(name: str, server_cfg: dict[str, Any]) -> list[str]:
+        return _list_tools_for_mcp_server(name, server_cfg, timeout_ms=timeout_ms)
+
+    return get_mcp_catalog().get_tools(server_name, cfg, _lister if fetch else None)
+
+
 def _mcp_cache_key(servers: dict[str, Any]) -> str:
     """生成 MCP 配置的稳定缓存键"""
     if not servers:
@@ -410,6 +588,54 @@ def _mcp_cache_key(servers: dict[str, Any]) -> str:
         return str(servers)
 
 
+def _get_options_cache_ttl(default: float = DEFAULT_OPTIONS_CACHE_TTL) -> float:
+    """读取指纹校验间隔（秒，环境变量 ISSUELAB_OPTIONS_CACHE_TTL）"""
+    raw = os.environ.get("ISSUELAB_OPTIONS_CACHE_TTL", "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_OPTIONS_CACHE_TTL={raw!r}，使用默认值 {default}")
+        return default
+
+
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _dir_entries_signature(path: Path) -> tuple[tuple[str, int], ...] | None:
+    """目录下各条目的 (名称, mtime) 签名（只 stat，不读取内容）"""
+    try:
+        with os.scandir(path) as it:
+            return tuple(sorted((entry.name, entry.stat().st_mtime_ns) for entry in it))
+    except OSError:
+        return None
+
+
+def _options_fingerprint(agent_name: str | None) -> tuple:
+    """基于 stat 的选项指纹，覆盖完整缓存键依赖的所有文件
+
+    包括 agents 目录、agent.yml、全局/per-agent .mcp.json，
+    以及项目、agent、用户目录下的 .claude/skills 与 .claude/agents。
+    """
+    root = AGENTS_DIR.parent
+    home = Path(os.path.expanduser("~"))
+    bases = [root, home]
+    files = [AGENTS_DIR, root / ".mcp.json"]
+    if agent_name:
+        agent_root = AGENTS_DIR / agent_name
+        bases.append(agent_root)
+        files.extend([agent_root / "agent.yml", agent_root / ".mcp.json"])
+
+    return (
+        tuple(_stat_signature(path) for path in files),
+        tuple(_dir_entries_signature(base / ".claude" / sub) for base in bases for sub in ("skills", "agents")),
+    )
+
+
 def _create_agent_options_impl(
     max_turns: int | None,
     max_budget_usd: float | None,
@@ -419,8 +645,13 @@ def _create_agent_options_impl(
     cwd: Path,
     subagents_sig: str,
     enable_subagents: bool,
+    subagent_scope: frozenset[str] | None = None,
 ) -> ClaudeAgentOptions:
-    """创建 Agent 选项的实际实现（无缓存）"""
+    """创建 Agent 选项的实际实现（无缓存）
+
+    subagent_scope 不为 None 时只注册声明的 agent/subagent，
+    未声明的 prompt 不会进入选项，也不会读取未声明的 subagent 文件。
+    """
     env = Config.get_anthropic_env()
     env["CLAUDE_AGENT_SDK_SKIP_VERSION_CHECK"] = "true"
 
@@ -444,6 +675,8 @@ def _create_agent_options_impl(
     for name, config in agents.items():
         if name == "observer":
             continue
+        if subagent_scope is not None and name not in subagent_scope:
+            continue
         agent_definitions[name] = AgentDefinition(
             description=config["description"],
             prompt=config["prompt"],
@@ -454,8 +687,8 @@ def _create_agent_options_impl(
     if enable_subagents:
         # per-agent subagents from .claude/agents
         subagent_tools = base_tools
-        project_subagents = _load_subagents_from_dir(cwd, subagent_tools)
-        user_subagents = _load_subagents_from_dir(Path(os.path.expanduser("~")), subagent_tools)
+        project_subagents = _load_subagents_from_dir(cwd, subagent_tools, subagent_scope)
+        user_subagents = _load_subagents_from_dir(Path(os.path.expanduser("~")), subagent_tools, subagent_scope)
 
         # programmatic subagents override file-based on name collision
         for name, definition in {**user_subagents, **project_subagents}.items():
@@ -473,7 +706,8 @@ def _create_agent_options_impl(
     else:
         logger.info("Subagents disabled for agent '%s'", agent_name or "default")
 
-    allowed_tools = main_tools[:]
+    # declared 模式下没有可委派的 subagent 时不需要 Task 工具
+    allowed_tools = main_tools[:] if agent_definitions or subagent_scope is None else base_tools[:]
     if mcp_servers:
         allowed_tools.extend([f"mcp__{name}__*" for name in mcp_servers])
     if os.environ.get("MCP_LOG_DETAIL") == "1":
@@ -521,8 +755,30 @@ def create_agent_options(
 
     Note:
         此函数使用缓存来避免重复创建相同的配置。
-        如果需要强制刷新配置，请先调用 clear_agent_options_cache()。
+        相关文件的 stat 指纹每 ISSUELAB_OPTIONS_CACHE_TTL 秒（默认 30）校验一次；
+        环境变量等文件以外的变化，请先调用 clear_agent_options_cache() 强制刷新。
     """
+    # 快速路径：TTL 内直接复用；TTL 过期后只比对 stat 指纹
+    fast_key = (
+        max_turns,
+        max_budget_usd,
+        agent_name or "",
+        str(AGENTS_DIR),
+        os.path.expanduser("~"),
+        mcp_pool_token(),
+    )
+    fast_entry = _options_fast_path.lookup(fast_key)
+    if fast_entry is not None:
+        fingerprint, checked_at, cache_key = fast_entry
+        if cache_key in _cached_agent_options:
+            now = time.monotonic()
+            if now - checked_at < _get_options_cache_ttl():
+                return _cached_agent_options.lookup(cache_key)
+            if _options_fingerprint(agent_name) == fingerprint:
+                _options_fast_path[fast_key] = (fingerprint, now, cache_key)
+                return _cached_agent_options.lookup(cache_key)
+    fingerprint = _options_fingerprint(agent_name)
+
     overrides = _get_agent_run_overrides(agent_name)
     feature_flags = _get_agent_feature_flags(agent_name)
     # 使用默认值 + per-agent 覆盖
@@ -565,9 +821,10 @@ def create_agent_options(
         logger.info("Skills disabled for agent '%s'", agent_name or "default")
 
     # per-agent subagents signature for cache (avoid loading full files on cache hit)
+    subagent_scope = _get_agent_subagent_scope(agent_name)
     if feature_flags["enable_subagents"]:
-        project_subagents_sig = _subagents_signature_from_dir(cwd)
-        user_subagents_sig = _subagents_signature_from_dir(Path(os.path.expanduser("~")))
+        project_subagents_sig = _subagents_signature_from_dir(cwd, subagent_scope)
+        user_subagents_sig = _subagents_signature_from_dir(Path(os.path.expanduser("~")), subagent_scope)
         subagents_sig = _subagents_signature_for_cache(project_subagents_sig, user_subagents_sig)
     else:
         subagents_sig = "disabled"
@@ -579,17 +836,21 @@ def create_agent_options(
         _mcp_cache_key(mcp_servers),
         _skills_signature(cwd),
         subagents_sig,
+        "all" if subagent_scope is None else "declared:" + ",".join(sorted(subagent_scope)),
+        fast_key[-1],
     )
 
     # 检查缓存
-    if cache_key in _cached_agent_options:
+    cached = _cached_agent_options.lookup(cache_key)
+    if cached is not None:
         logger.debug(f"使用缓存的 Agent 选项 (key={cache_key})")
-        return _cached_agent_options[cache_key]
+        _options_fast_path[fast_key] = (fingerprint, time.monotonic(), cache_key)
+        return cached
 
     if os.environ.get("MCP_LOG_TOOLS") == "1" and mcp_servers:
         timeout_ms = int(os.environ.get("MCP_LIST_TOOLS_TIMEOUT_MS", "3000"))
         for name, cfg in mcp_servers.items():
-            tools = _list_tools_for_mcp_server(name, cfg, timeout_ms=timeout_ms)
+            tools = _list_mcp_tools_cached(name, cfg, timeout_ms=timeout_ms) if isinstance(cfg, dict) else []
             if tools:
                 logger.info("MCP tools for '%s': %s", name, ", ".join(sorted(tools)))
             else:
@@ -599,14 +860,22 @@ def create_agent_options(
         effective_max_turns,
         effective_max_budget,
         agent_name=agent_name,
-        mcp_servers=mcp_servers,
+        # ISSUELAB_MCP_POOL=1 时 stdio server 改为连接本进程共享的 server
+        mcp_servers=pool_mcp_servers(mcp_servers, cwd),
         cwd=cwd,
         subagents_sig=subagents_sig,
         enable_subagents=feature_flags["enable_subagents"],
+        subagent_scope=subagent_scope,
     )
 
     # 存入缓存
     _cached_agent_options[cache_key] = options
+    _options_fast_path[fast_key] = (fingerprint, time.monotonic(), cache_key)
     logger.debug(f"创建新的 Agent 选项并缓存 (key={cache_key})")
+    stats = _cached_agent_options.stats()
+    logger.debug(
+        f"[Stats] Agent 选项缓存: {stats['size']}/{stats['maxsize']} 条, 命中 {stats['hits']}, "
+        f"未命中 {stats['misses']}, 淘汰 {stats['evictions']}"
+    )
 
     return options
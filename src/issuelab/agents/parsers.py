@@ -6,11 +6,12 @@
 import re
 
 from issuelab.logging_config import get_logger
+from issuelab.results import ObserverDecision
 
 logger = get_logger(__name__)
 
 
-def parse_observer_response(response: str, issue_number: int | None = None) -> dict[str, object]:
+def parse_observer_response(response: str, issue_number: int | None = None) -> ObserverDecision:
     """解析 Observer Agent 的响应
 
     Args:
@@ -18,55 +19,104 @@ def parse_observer_response(response: str, issue_number: int | None = None) -> d
         issue_number: Issue 编号（可选，用于日志记录）
 
     Returns:
-        解析后的决策结果 {
-            "should_trigger": bool,
-            "agent": str,
-            "comment": str,
-            "reason": str,
-            "analysis": str,
-        }
+        解析后的决策结果 ObserverDecision（兼容字典访问：should_trigger / agent / comment / reason / analysis）
     """
     # 如果提供了 issue_number，记录日志
     if issue_number is not None:
         logger.debug(f"解析 Issue #{issue_number} 的 Observer 响应")
 
-    result = {
-        "should_trigger": False,
-        "agent": "",
-        "comment": "",
-        "reason": "",
-        "analysis": "",
-    }
+    yaml_data = _try_parse_yaml(response)
+    if not isinstance(yaml_data, dict):
+        return ObserverDecision()
+
+    return _decision_from_yaml(yaml_data)
+
 
+def parse_observer_batch_response(response: str, issue_numbers: list[int]) -> dict[int, ObserverDecision]:
+    """解析 Observer 打包模式（一次分析多个 Issue）的响应
+
+    期望格式::
+
+        decisions:
+          - issue_number: 12
+            should_trigger: false
+            agent: ""
+            reason: ""
+
+    也接受顶层直接为列表的 YAML。
+
+    Args:
+        response: Agent 响应文本（YAML 格式）
+        issue_numbers: 本次打包的 Issue 编号（用于过滤模型臆造的编号）
+
+    Returns:
+        {issue_number: ObserverDecision}，缺失或无法解析的 Issue 不在结果中
+    """
     yaml_data = _try_parse_yaml(response)
-    if yaml_data is None:
-        return result
+    items = yaml_data.get("decisions") if isinstance(yaml_data, dict) else yaml_data
+    if not isinstance(items, list):
+        logger.warning("打包响应中未找到 decisions 列表")
+        return {}
+
+    expected = set(issue_numbers)
+    decisions: dict[int, ObserverDecision] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        number = _coerce_issue_number(item.get("issue_number", item.get("issue")))
+        if number is None or number not in expected or number in decisions:
+            continue
+        decision = _decision_from_yaml(item)
+        decision.issue_number = number
+        decisions[number] = decision
+
+    missing = expected - decisions.keys()
+    if missing:
+        logger.info(f"打包响应缺少 {len(missing)} 个 Issue 的决策: {sorted(missing)}")
+    return decisions
+
+
+def _coerce_issue_number(value: object) -> int | None:
+    """将 12 / "12" / "#12" 转换为 Issue 编号"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        match = re.search(r"\d+", value)
+        if match:
+            return int(match.group())
+    return None
+
 
-    result["should_trigger"] = yaml_data.get("should_trigger", False)
-    result["agent"] = yaml_data.get("agent", "") or yaml_data.get("trigger_agent", "")
-    result["comment"] = yaml_data.get("comment", "") or yaml_data.get("trigger_comment", "")
-    result["reason"] = yaml_data.get("reason", "") or yaml_data.get("skip_reason", "")
-    result["analysis"] = yaml_data.get("analysis", "")
+def _decision_from_yaml(yaml_data: dict) -> ObserverDecision:
+    """从 YAML 字典构建决策（兼容 trigger_agent / trigger_comment / skip_reason 等别名）"""
+    result = ObserverDecision()
+    result.should_trigger = yaml_data.get("should_trigger", False)
+    result.agent = yaml_data.get("agent", "") or yaml_data.get("trigger_agent", "")
+    result.comment = yaml_data.get("comment", "") or yaml_data.get("trigger_comment", "")
+    result.reason = yaml_data.get("reason", "") or yaml_data.get("skip_reason", "")
+    result.analysis = yaml_data.get("analysis", "")
 
     # 如果没有解析到触发评论，使用默认格式
-    agent_name = str(result["agent"]) if result["agent"] is not None else ""
-    if result["should_trigger"] and agent_name and not result["comment"]:
-        result["comment"] = _get_default_trigger_comment(agent_name)
-        result["agent"] = agent_name
+    agent_name = str(result.agent) if result.agent is not None else ""
+    if result.should_trigger and agent_name and not result.comment:
+        result.comment = _get_default_trigger_comment(agent_name)
+        result.agent = agent_name
 
     return result
 
 
-def _try_parse_yaml(response: str) -> dict | None:
+def _try_parse_yaml(response: str) -> dict | list | None:
     """尝试解析 YAML 格式的响应
 
     Args:
         response: Agent 响应文本
 
     Returns:
-        解析后的字典，失败返回 None
+        解析后的字典（打包模式下可能是列表），失败返回 None
     """
-    import yaml
+    from issuelab.yaml_utils import YAMLError, safe_load
 
     # 清理响应文本
     text = response.strip()
@@ -84,14 +134,14 @@ def _try_parse_yaml(response: str) -> dict | None:
             if len(lines) >= 2:
                 yaml_content = "\n".join(lines[1:])
                 try:
-                    return yaml.safe_load(yaml_content)
-                except yaml.YAMLError:
+                    return safe_load(yaml_content)
+                except YAMLError:
                     pass
     elif text.startswith("---"):
         # 可能直接是 YAML 文档
         try:
-            return yaml.safe_load(text)
-        except yaml.YAMLError:
+            return safe_load(text)
+        except YAMLError:
             pass
 
     # 检查是否是简单的键值对格式（每行一个）
@@ -107,8 +157,8 @@ def _try_parse_yaml(response: str) -> dict | None:
 
     if yaml_like:
         try:
-            return yaml.safe_load(text)
-        except yaml.YAMLError:
+            return safe_load(text)
+        except YAMLError:
             pass
 
     return None
@@ -170,7 +220,7 @@ def _parse_structured_recommendations(response: str, paper_count: int) -> list[d
     recommended: list[dict[str, object]] = []
 
     yaml_data = _try_parse_yaml(response)
-    if yaml_data is None:
+    if not isinstance(yaml_data, dict):
         logger.warning("无法解析论文推荐结果")
         return recommended
 
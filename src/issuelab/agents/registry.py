@@ -11,7 +11,7 @@ import logging
 from pathlib import Path
 from typing import Any
 
-import yaml
+from issuelab.yaml_utils import YAMLError, safe_load_file
 
 logger = logging.getLogger(__name__)
 
@@ -77,8 +77,7 @@ def load_registry(agents_dir: Path, include_disabled: bool = False) -> dict[str,
             continue
 
         try:
-            with open(agent_yml, encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            config = safe_load_file(agent_yml)
 
             if not config:
                 logger.warning("Empty config in %s", agent_yml)
@@ -97,7 +96,7 @@ def load_registry(agents_dir: Path, include_disabled: bool = False) -> dict[str,
 
             registry[username] = config
 
-        except yaml.YAMLError as e:
+        except YAMLError as e:
             logger.error("Error parsing %s: %s", agent_yml.name, e)
         except Exception as e:
             logger.error("Error loading %s: %s", agent_yml.name, e)
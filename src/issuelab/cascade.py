@@ -0,0 +1,261 @@
+"""@mention 级联控制
+
+Agent 回复中的 @mention 会触发新的 agent，被触发的 agent 又可能继续 @ 其他 agent，
+形成一条触发链。本模块为这条链携带级联上下文，并在每一跳上检查：
+
+- 深度上限：链路超过 max_depth 后不再继续触发
+- 环路检测：链路上已经出现过的 agent 不会被再次触发（A → B → A）
+- 扇出预算：整条级联（同一个 Issue）最多触发 max_fanout_per_issue 个 agent
+
+级联上下文通过 dispatch 的 client_payload / agent.yml 的 workflow 输入在进程间传递，
+在被触发的进程中以 ISSUELAB_CASCADE_* 环境变量的形式读取。
+
+预算不依赖共享存储：父节点在触发子节点时扣除本次触发数量，剩余预算均分给各子节点，
+因此整棵触发树的总触发次数不会超过根节点的预算。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ENV_CASCADE_ID = "ISSUELAB_CASCADE_ID"
+ENV_CASCADE_DEPTH = "ISSUELAB_CASCADE_DEPTH"
+ENV_CASCADE_CHAIN = "ISSUELAB_CASCADE_CHAIN"
+ENV_CASCADE_BUDGET = "ISSUELAB_CASCADE_BUDGET"
+
+DEFAULT_CASCADE_POLICY: dict[str, Any] = {
+    "enabled": True,
+    "max_depth": 3,
+    "max_fanout_per_issue": 8,
+}
+
+# 被拦截原因
+BLOCK_CYCLE = "cycle"
+BLOCK_MAX_DEPTH = "max_depth"
+BLOCK_FANOUT_BUDGET = "fanout_budget"
+
+
+def get_cascade_policy(policy: Mapping[str, Any] | None = None) -> dict[str, Any]:
+    """从 mention 策略中取出级联配置（缺失字段使用默认值）
+
+    Args:
+        policy: load_mention_policy() 返回的策略配置（None 则自动加载）
+
+    Returns:
+        级联配置字典 {enabled, max_depth, max_fanout_per_issue}
+    """
+    if policy is None:
+        from issuelab.mention_policy import load_mention_policy
+
+        policy = load_mention_policy()
+
+    merged = dict(DEFAULT_CASCADE_POLICY)
+    cascade = policy.get("cascade") if isinstance(policy, Mapping) else None
+    if isinstance(cascade, Mapping):
+        merged.update({k: v for k, v in cascade.items() if v is not None})
+    merged["max_depth"] = max(0, _to_int(merged.get("max_depth"), DEFAULT_CASCADE_POLICY["max_depth"]))
+    merged["max_fanout_per_issue"] = max(
+        0, _to_int(merged.get("max_fanout_per_issue"), DEFAULT_CASCADE_POLICY["max_fanout_per_issue"])
+    )
+    return merged
+
+
+def _to_int(value: Any, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _split_chain(value: Any) -> list[str]:
+    items = value if isinstance(value, (list, tuple)) else str(value or "").split(",")
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+@dataclass
+class CascadeContext:
+    """一条 @mention 触发链的级联上下文
+
+    Attributes:
+        cascade_id: 级联 ID（同一条触发链共享）
+        depth: 当前 agent 在链上的深度（由人工触发的 agent 为 0）
+        chain: 从根到当前 agent 的 agent 名称链路
+        budget: 当前子树还能触发的 agent 数量
+    """
+
+    cascade_id: str
+    depth: int = 0
+    chain: list[str] = field(default_factory=list)
+    budget: int = DEFAULT_CASCADE_POLICY["max_fanout_per_issue"]
+
+    @classmethod
+    def new(cls, agent_name: str | None = None, policy: Mapping[str, Any] | None = None) -> CascadeContext:
+        """创建根级联上下文"""
+        cascade_policy = get_cascade_policy(policy)
+        return cls(
+            cascade_id=uuid.uuid4().hex[:12],
+            depth=0,
+            chain=[agent_name] if agent_name else [],
+            budget=cascade_policy["max_fanout_per_issue"],
+        )
+
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any] | None) -> CascadeContext | None:
+        """从 client_payload / workflow 输入中读取级联上下文
+
+        Args:
+            data: 包含 cascade_id / cascade_depth / cascade_chain / cascade_budget 的字典
+
+        Returns:
+            级联上下文；没有 cascade_id 时返回 None
+        """
+        if not data:
+            return None
+        cascade_id = str(data.get("cascade_id") or "").strip()
+        if not cascade_id:
+            return None
+        return cls(
+            cascade_id=cascade_id,
+            depth=max(0, _to_int(data.get("cascade_depth"), 0)),
+            chain=_split_chain(data.get("cascade_chain")),
+            budget=max(0, _to_int(data.get("cascade_budget"), DEFAULT_CASCADE_POLICY["max_fanout_per_issue"])),
+        )
+
+    @classmethod
+    def from_env(
+        cls,
+        agent_name: str | None = None,
+        policy: Mapping[str, Any] | None = None,
+        environ: Mapping[str, str] | None = None,
+    ) -> CascadeContext:
+        """从 ISSUELAB_CASCADE_* 环境变量读取级联上下文，不存在时创建根上下文
+
+        Args:
+            agent_name: 当前运行的 agent（确保出现在链路末尾）
+            policy: mention 策略配置（创建根上下文时用于读取预算）
+            environ: 环境变量（默认 os.environ）
+
+        Returns:
+            级联上下文
+        """
+        env = os.environ if environ is None else environ
+        context = cls.from_mapping(
+            {
+                "cascade_id": env.get(ENV_CASCADE_ID),
+                "cascade_depth": env.get(ENV_CASCADE_DEPTH),
+                "cascade_chain": env.get(ENV_CASCADE_CHAIN),
+                "cascade_budget": env.get(ENV_CASCADE_BUDGET),
+            }
+        )
+        if context is None:
+            return cls.new(agent_name, policy)
+        if agent_name and (not context.chain or context.chain[-1].lower() != agent_name.lower()):
+            context.chain.append(agent_name)
+        return context
+
+    def contains(self, agent_name: str) -> bool:
+        """agent 是否已经出现在链路上"""
+        lowered = agent_name.lower()
+        return any(name.lower() == lowered for name in self.chain)
+
+    def child(self, agent_name: str, budget: int) -> CascadeContext:
+        """派生被触发 agent 的级联上下文"""
+        return CascadeContext(
+            cascade_id=self.cascade_id,
+            depth=self.depth + 1,
+            chain=[*self.chain, agent_name],
+            budget=max(0, budget),
+        )
+
+    def to_payload(self) -> dict[str, str]:
+        """转换为 client_payload / workflow 输入（所有值均为字符串）"""
+        return {
+            "cascade_id": self.cascade_id,
+            "cascade_depth": str(self.depth),
+            "cascade_chain": ",".join(self.chain),
+            "cascade_budget": str(self.budget),
+        }
+
+    def to_env(self) -> dict[str, str]:
+        """转换为 ISSUELAB_CASCADE_* 环境变量"""
+        payload = self.to_payload()
+        return {
+            ENV_CASCADE_ID: payload["cascade_id"],
+            ENV_CASCADE_DEPTH: payload["cascade_depth"],
+            ENV_CASCADE_CHAIN: payload["cascade_chain"],
+            ENV_CASCADE_BUDGET: payload["cascade_budget"],
+        }
+
+    def to_cli_args(self) -> list[str]:
+        """转换为 dispatch CLI 参数"""
+        payload = self.to_payload()
+        return [
+            "--cascade-id",
+            payload["cascade_id"],
+            "--cascade-depth",
+            payload["cascade_depth"],
+            "--cascade-chain",
+            payload["cascade_chain"],
+            "--cascade-budget",
+            payload["cascade_budget"],
+        ]
+
+
+def plan_cascade(
+    mentions: list[str],
+    context: CascadeContext,
+    policy: Mapping[str, Any] | None = None,
+) -> tuple[dict[str, CascadeContext], dict[str, str]]:
+    """对一组 @mentions 应用深度、环路和扇出预算限制
+
+    Args:
+        mentions: 已通过策略过滤的 agent 列表（保持原顺序）
+        context: 当前 agent 的级联上下文
+        policy: mention 策略配置（None 则自动加载）
+
+    Returns:
+        (children, blocked) 元组
+        - children: {agent_name: 子级联上下文}，按原顺序排列
+        - blocked: {agent_name: 拦截原因}（cycle / max_depth / fanout_budget）
+    """
+    cascade_policy = get_cascade_policy(policy)
+    blocked: dict[str, str] = {}
+    candidates: list[str] = []
+
+    for name in mentions:
+        if any(c.lower() == name.lower() for c in candidates):
+            continue
+        if not cascade_policy["enabled"]:
+            candidates.append(name)
+        elif context.contains(name):
+            blocked[name] = BLOCK_CYCLE
+        elif context.depth + 1 > cascade_policy["max_depth"]:
+            blocked[name] = BLOCK_MAX_DEPTH
+        else:
+            candidates.append(name)
+
+    if cascade_policy["enabled"]:
+        budget = min(context.budget, cascade_policy["max_fanout_per_issue"])
+        for name in candidates[budget:]:
+            blocked[name] = BLOCK_FANOUT_BUDGET
+        candidates = candidates[:budget]
+        remaining = budget - len(candidates)
+    else:
+        remaining = context.budget
+
+    children: dict[str, CascadeContext] = {}
+    if candidates:
+        share, extra = divmod(max(0, remaining), len(candidates))
+        for index, name in enumerate(candidates):
+            children[name] = context.child(name, share + (1 if index < extra else 0))
+
+    if blocked:
+        logger.info(f"[CASCADE] {context.cascade_id} depth={context.depth} 拦截 {len(blocked)} 个@mentions: {blocked}")
+    return children, blocked
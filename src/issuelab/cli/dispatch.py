@@ -18,6 +18,13 @@ import jwt
 import requests
 
 from issuelab.agents.registry import load_registry
+from issuelab.cascade import CascadeContext
+
+# Installation Token 有效期为 1 小时，缓存时间留出余量
+DEFAULT_TOKEN_CACHE_TTL = 3000
+
+# (repository, app_id) -> (token, 过期时间 monotonic)
+_installation_tokens: dict[tuple[str, str], tuple[str, float]] = {}
 
 
 def match_triggers(mentions: list[str], registry: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
@@ -169,10 +176,28 @@ def generate_installation_token(installation_id: int, app_jwt: str) -> str | Non
         return None
 
 
+def get_token_cache_ttl(default: int = DEFAULT_TOKEN_CACHE_TTL) -> int:
+    """读取 Installation Token 缓存时间（秒，环境变量 ISSUELAB_TOKEN_CACHE_TTL，0 表示不缓存）"""
+    raw = os.environ.get("ISSUELAB_TOKEN_CACHE_TTL", "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        print(f"[WARNING] 无效的 ISSUELAB_TOKEN_CACHE_TTL={raw!r}，使用默认值 {default}", file=sys.stderr)
+        return default
+
+
+def clear_token_cache() -> None:
+    """清空 Installation Token 缓存"""
+    _installation_tokens.clear()
+
+
 def get_token_for_repository(repository: str, app_id: str, private_key: str) -> str | None:
     """
     为指定仓库获取 GitHub App Installation Token
 
+    Token 在进程内缓存 ISSUELAB_TOKEN_CACHE_TTL 秒（常驻进程中重复分发时
+    不再重复生成 JWT、查询 Installation 与申请 Token）。
+
     Args:
         repository: 仓库全名 (owner/repo)
         app_id: GitHub App ID
@@ -181,6 +206,12 @@ def get_token_for_repository(repository: str, app_id: str, private_key: str) ->
     Returns:
         Installation Access Token，失败返回 None
     """
+    ttl = get_token_cache_ttl()
+    cache_key = (repository.lower(), str(app_id))
+    cached = _installation_tokens.get(cache_key)
+    if ttl and cached and cached[1] > time.monotonic():
+        return cached[0]
+
     owner, repo = repository.split("/")
 
     # 1. 生成 App JWT
@@ -192,7 +223,10 @@ def get_token_for_repository(repository: str, app_id: str, private_key: str) ->
         return None
 
     # 3. 生成 Installation Token
-    return generate_installation_token(installation_id, app_jwt)
+    token = generate_installation_token(installation_id, app_jwt)
+    if token and ttl:
+        _installation_tokens[cache_key] = (token, time.monotonic() + ttl)
+    return token
 
 
 @retry_on_failure(max_attempts=3, delay=2)
@@ -393,6 +427,10 @@ def main(argv: list[str] | None = None) -> int:
         action="store_true",
         help="Dry run mode - validate configuration without actually dispatching",
     )
+    parser.add_argument("--cascade-id", help="Mention cascade ID (propagated to triggered agents)")
+    parser.add_argument("--cascade-depth", type=int, default=0, help="Mention cascade depth of the triggered agent")
+    parser.add_argument("--cascade-chain", default="", help="Mention cascade chain (comma-separated agent names)")
+    parser.add_argument("--cascade-budget", type=int, help="Remaining mention cascade fan-out budget")
     parser.add_argument("--app-id", help="GitHub App ID (required)")
     parser.add_argument("--app-private-key", help="GitHub App Private Key (required)")
 
@@ -495,6 +533,20 @@ def main(argv: list[str] | None = None) -> int:
         except json.JSONDecodeError:
             print(f"Warning: Invalid JSON in available_agents: {args.available_agents}", file=sys.stderr)
 
+    # 级联上下文（repository_dispatch 通过 client_payload 传递；
+    # workflow_dispatch 的输入由目标 workflow 固定声明，不额外附加）
+    cascade = CascadeContext.from_mapping(
+        {
+            "cascade_id": args.cascade_id,
+            "cascade_depth": args.cascade_depth,
+            "cascade_chain": args.cascade_chain,
+            "cascade_budget": args.cascade_budget,
+        }
+    )
+    if cascade is not None:
+        client_payload.update(cascade.to_payload())
+        print(f"Cascade: {cascade.cascade_id} depth={cascade.depth} budget={cascade.budget}")
+
     # 分发事件
     success_count = 0
     failed_agents: list[dict[str, str]] = []
@@ -10,9 +10,10 @@
 import argparse
 import json
 import os
-import re
 import sys
 
+from issuelab.mention_tokenizer import tokenize_mentions
+
 
 def parse_github_mentions(text: str) -> list[str]:
     """
@@ -35,20 +36,9 @@ def parse_github_mentions(text: str) -> list[str]:
     if not text:
         return []
 
-    # 匹配 @username 模式
-    # GitHub 用户名规则：字母、数字、连字符、下划线，不能以连字符或下划线开头或结尾
-    pattern = r"@([a-zA-Z0-9_](?:[a-zA-Z0-9_-]*[a-zA-Z0-9_])?)"
-    matches = re.findall(pattern, text)
-
-    # 去重并保持顺序
-    seen = set()
-    result = []
-    for username in matches:
-        if username not in seen:
-            seen.add(username)
-            result.append(username)
-
-    return result
+    # GitHub 用户名规则：字母、数字、连字符、下划线，不能以连字符开头或结尾
+    # 代码围栏与 URL 中的 @ 不视为提及
+    return tokenize_mentions(text).unique()
 
 
 def write_github_output(mentions: list[str]) -> None:
@@ -10,23 +10,50 @@ from typing import Any
 logger = logging.getLogger(__name__)
 
 
-def load_collaboration_config() -> dict[str, Any]:
-    """加载协作配置
+# 进程级缓存：配置按 (文件路径, mtime) 缓存，协作指南按 (配置签名, 输入) 缓存
+_CONFIG_CACHE: tuple[tuple[str, float] | None, dict[str, Any]] | None = None
+_GUIDELINES_CACHE: dict[tuple, str] = {}
+_GUIDELINES_CACHE_SIZE = 32
 
-    Returns:
-        协作配置字典，如果加载失败返回默认配置（disabled）
-    """
+
+def _find_config_file() -> Path | None:
     config_paths = [
         Path(__file__).parent.parent.parent / "config" / "collaboration.yml",
         Path.cwd() / "config" / "collaboration.yml",
     ]
-
-    config_file = None
     for path in config_paths:
         if path.exists():
-            config_file = path
-            break
+            return path
+    return None
+
+
+def _config_signature(config_file: Path | None) -> tuple[str, float] | None:
+    if config_file is None:
+        return None
+    try:
+        return str(config_file), config_file.stat().st_mtime
+    except OSError:
+        return None
+
+
+def _load_config_cached() -> tuple[tuple[str, float] | None, dict[str, Any]]:
+    """读取协作配置（配置文件路径与 mtime 未变化时复用上次解析结果）
+
+    Returns:
+        (配置签名, 协作配置字典)
+    """
+    global _CONFIG_CACHE
 
+    config_file = _find_config_file()
+    signature = _config_signature(config_file)
+    if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == signature:
+        return _CONFIG_CACHE
+
+    _CONFIG_CACHE = (signature, _parse_collaboration_config(config_file))
+    return _CONFIG_CACHE
+
+
+def _parse_collaboration_config(config_file: Path | None) -> dict[str, Any]:
     # 默认配置（禁用）
     default_config = {
         "enabled": False,
@@ -38,10 +65,9 @@ def load_collaboration_config() -> dict[str, Any]:
         return default_config
 
     try:
-        import yaml
+        from issuelab.yaml_utils import safe_load_file
 
-        with open(config_file, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        config = safe_load_file(config_file)
 
         if not config or "collaboration" not in config:
             logger.warning("collaboration.yml 格式错误，协作指南已禁用")
@@ -59,6 +85,17 @@ def load_collaboration_config() -> dict[str, Any]:
         return default_config
 
 
+def load_collaboration_config() -> dict[str, Any]:
+    """加载协作配置
+
+    解析结果按配置文件 mtime 缓存，文件未修改时不会重复读取和解析 YAML。
+
+    Returns:
+        协作配置字典，如果加载失败返回默认配置（disabled）
+    """
+    return dict(_load_config_cached()[1])
+
+
 def build_collaboration_guidelines(
     agents: dict[str, dict],
     available_agents: list[dict] | None = None,
@@ -77,11 +114,25 @@ def build_collaboration_guidelines(
     """
     try:
         # 加载配置
-        config = load_collaboration_config()
+        signature, config = _load_config_cached()
 
         if not config.get("enabled", False):
             return ""
 
+        cache_key = (
+            signature,
+            tuple((str(name), str((info or {}).get("description", "Agent"))) for name, info in (agents or {}).items()),
+            tuple(
+                (str(agent.get("name") or ""), str(agent.get("description") or ""))
+                for agent in available_agents or []
+                if isinstance(agent, dict)
+            ),
+            available_agents_placeholder,
+        )
+        cached = _GUIDELINES_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         template = config.get("guidelines_template", "")
         if not template:
             return ""
@@ -119,6 +170,10 @@ def build_collaboration_guidelines(
         # 替换模板变量
         guidelines = template.format(available_agents=available_agents_text)
 
+        if len(_GUIDELINES_CACHE) >= _GUIDELINES_CACHE_SIZE:
+            _GUIDELINES_CACHE.clear()
+        _GUIDELINES_CACHE[cache_key] = guidelines
+
         logger.debug(f"构建协作指南成功，包含 {len(agents)} 个 agents")
         return guidelines
 
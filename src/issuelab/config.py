@@ -83,3 +83,13 @@ class Config:
         """获取日志文件路径"""
         log_file = os.environ.get("LOG_FILE")
         return Path(log_file) if log_file else None
+
+    # 状态目录（缓存、检查点等跨运行持久化的数据）
+    @staticmethod
+    def get_state_dir() -> Path:
+        """获取状态目录
+
+        优先级: ISSUELAB_STATE_DIR > 当前目录下的 .issuelab
+        """
+        state_dir = os.environ.get("ISSUELAB_STATE_DIR")
+        return Path(state_dir) if state_dir else Path.cwd() / ".issuelab"
@@ -0,0 +1,369 @@
+"""持久化作业队列（SQLite）
+
+workflow 中直接由 CLI 启动的 Agent 运行在 runner 超时或崩溃时会丢失。
+本模块把 execute / observe / dispatch 作业（格式见 issuelab.jobs）写入本地 SQLite 队列：
+
+- 状态: queued → running → done / failed
+- 租约: worker 领取作业后持有租约并定期续期；租约过期（worker 崩溃）后作业可被重新领取
+- 重试: 失败后按指数退避重新排队，超过 max_attempts 次标记为 failed
+- 去重: 相同 dedup_key 的作业在 queued/running 期间只保留一个（默认按作业内容计算）
+
+队列文件位于 Config.get_state_dir() / jobs.sqlite3。run_worker 以有限并发持续消费队列。
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from issuelab.config import Config
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+QUEUE_FILENAME = "jobs.sqlite3"
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_LEASE_SECONDS = 900
+DEFAULT_RETRY_DELAY = 30.0
+DEFAULT_WORKER_CONCURRENCY = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedup_key TEXT,
+    state TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS jobs_active_dedup
+    ON jobs(dedup_key) WHERE dedup_key IS NOT NULL AND state IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs(state, available_at);
+"""
+
+
+def _env_number(name: str, default: float, minimum: float) -> float:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return max(minimum, float(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 {name}={raw!r}，使用默认值 {default}")
+        return default
+
+
+def get_lease_seconds(default: int = DEFAULT_LEASE_SECONDS) -> int:
+    """读取作业租约时长（秒，环境变量 ISSUELAB_JOB_LEASE_SECONDS）"""
+    return int(_env_number("ISSUELAB_JOB_LEASE_SECONDS", default, 1))
+
+
+def get_max_attempts(default: int = DEFAULT_MAX_ATTEMPTS) -> int:
+    """读取作业最大尝试次数（环境变量 ISSUELAB_JOB_MAX_ATTEMPTS）"""
+    return int(_env_number("ISSUELAB_JOB_MAX_ATTEMPTS", default, 1))
+
+
+def get_worker_concurrency(default: int = DEFAULT_WORKER_CONCURRENCY) -> int:
+    """读取 worker 并发数（环境变量 ISSUELAB_WORKER_CONCURRENCY）"""
+    return int(_env_number("ISSUELAB_WORKER_CONCURRENCY", default, 1))
+
+
+def job_dedup_key(job: dict[str, Any]) -> str:
+    """按作业内容计算去重键（字段顺序无关）"""
+    canonical = json.dumps(job, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return f"{job.get('type', '')}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]}"
+
+
+@dataclass
+class QueuedJob:
+    """已领取的作业"""
+
+    id: int
+    job: dict[str, Any]
+    attempts: int
+    max_attempts: int
+    lease_owner: str
+
+
+class JobQueue:
+    """SQLite 作业队列（线程安全，多进程通过 SQLite 锁协调）
+
+    Args:
+        path: 队列文件路径（默认 Config.get_state_dir() / jobs.sqlite3）
+        retry_delay: 首次重试前的等待时间（秒），之后按 2 的幂次递增
+    """
+
+    def __init__(self, path: Path | None = None, retry_delay: float = DEFAULT_RETRY_DELAY):
+        self.path = Path(path) if path is not None else Config.get_state_dir() / QUEUE_FILENAME
+        self.retry_delay = retry_delay
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _transaction(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在 BEGIN IMMEDIATE 事务中执行（多个 worker 进程之间互斥）"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = func(*args)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+    def enqueue(
+        self, job: dict[str, Any], dedup_key: str | None = None, max_attempts: int | None = None
+    ) -> tuple[int, bool]:
+        """加入作业
+
+        Args:
+            job: 作业（必须包含 type）
+            dedup_key: 去重键（默认按作业内容计算，传空字符串表示不去重）
+            max_attempts: 最大尝试次数（默认读取 ISSUELAB_JOB_MAX_ATTEMPTS，未设置为 3）
+
+        Returns:
+            (作业 ID, 是否新建)；已有相同 dedup_key 的未完成作业时返回该作业 ID 与 False
+        """
+        if not isinstance(job.get("type"), str):
+            raise ValueError("job requires a string 'type'")
+        key = job_dedup_key(job) if dedup_key is None else (dedup_key or None)
+        attempts = max_attempts or get_max_attempts()
+
+        def _insert() -> tuple[int, bool]:
+            if key is not None:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE dedup_key = ? AND state IN ('queued', 'running')", (key,)
+                ).fetchone()
+                if row is not None:
+                    return row["id"], False
+            now = time.time()
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (job_type, payload, dedup_key, max_attempts, available_at, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job["type"], json.dumps(job, ensure_ascii=False), key, attempts, now, now, now),
+            )
+            return int(cursor.lastrowid), True
+
+        job_id, created = self._transaction(_insert)
+        if created:
+            logger.info(f"[OK] 作业 #{job_id} 已入队: {job['type']}")
+        else:
+            logger.info(f"[INFO] 作业已在队列中（去重）: #{job_id}")
+        return job_id, created
+
+    def claim(self, owner: str, lease_seconds: int | None = None) -> QueuedJob | None:
+        """领取下一个可执行的作业（包括租约已过期的 running 作业）"""
+        lease = lease_seconds or get_lease_seconds()
+
+        def _claim() -> QueuedJob | None:
+            now = time.time()
+            while True:
+                row = self._conn.execute(
+                    "SELECT * FROM jobs WHERE (state = 'queued' AND available_at <= ?)"
+                    " OR (state = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                    (now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["state"] == "running" and row["attempts"] >= row["max_attempts"]:
+                    # worker 在最后一次尝试中崩溃
+                    self._conn.execute(
+                        "UPDATE jobs SET state = 'failed', error = ?, lease_owner = NULL, updated_at = ? WHERE id = ?",
+                        (f"lease expired (owner {row['lease_owner']})", now, row["id"]),
+                    )
+                    continue
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1, lease_owner = ?,"
+                    " lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (owner, now + lease, now, row["id"]),
+                )
+                return QueuedJob(
+                    id=row["id"],
+                    job=json.loads(row["payload"]),
+                    attempts=row["attempts"] + 1,
+                    max_attempts=row["max_attempts"],
+                    lease_owner=owner,
+                )
+
+        return self._transaction(_claim)
+
+    def heartbeat(self, job: QueuedJob, lease_seconds: int | None = None) -> bool:
+        """续期租约（返回 False 表示租约已被他人接管）"""
+        lease = lease_seconds or get_lease_seconds()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND state = 'running'"
+                " AND lease_owner = ?",
+                (time.time() + lease, time.time(), job.id, job.lease_owner),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job: QueuedJob, result: Any = None) -> bool:
+        """标记作业完成"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = 'done', result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL,"
+                " updated_at = ? WHERE id = ? AND state = 'running' AND lease_owner = ?",
+                (json.dumps(result, ensure_ascii=False, default=str), time.time(), job.id, job.lease_owner),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job: QueuedJob, error: str) -> str:
+        """记录失败：未超过最大尝试次数时按指数退避重新排队
+
+        Returns:
+            作业的新状态（queued 或 failed）
+        """
+        state = "queued" if job.attempts < job.max_attempts else "failed"
+        available_at = time.time() + self.retry_delay * (2 ** (job.attempts - 1))
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, available_at = ?, lease_owner = NULL, lease_expires = NULL,"
+                " updated_at = ? WHERE id = ? AND state = 'running' AND lease_owner = ?",
+                (state, error, available_at, time.time(), job.id, job.lease_owner),
+            )
+        return state
+
+    def release(self, job: QueuedJob) -> bool:
+        """交还作业（worker 退出时）：立即重新排队，且不计入尝试次数"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = 'queued', attempts = attempts - 1, available_at = ?, lease_owner = NULL,"
+                " lease_expires = NULL, updated_at = ? WHERE id = ? AND state = 'running' AND lease_owner = ?",
+                (time.time(), time.time(), job.id, job.lease_owner),
+            )
+        return cursor.rowcount == 1
+
+    def get(self, job_id: int) -> dict[str, Any] | None:
+        """查询作业记录"""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["payload"] = json.loads(record["payload"])
+        record["result"] = json.loads(record["result"]) if record["result"] else None
+        return record
+
+    def stats(self) -> dict[str, int]:
+        """各状态的作业数"""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state").fetchall()
+        counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        counts.update({row["state"]: row["n"] for row in rows})
+        return counts
+
+
+async def _run_one(queue: JobQueue, claimed: QueuedJob, lease_seconds: int) -> None:
+    """执行一个作业，期间定期续期租约
+
+    租约被其他 worker 接管时立即取消执行，避免同一作业重复发布评论或分发。
+    """
+    from issuelab.jobs import run_job
+
+    job_task = asyncio.create_task(run_job(claimed.job))
+    lease_lost = False
+
+    async def _keep_lease() -> None:
+        nonlocal lease_lost
+        while not job_task.done():
+            await asyncio.sleep(lease_seconds / 3)
+            if not queue.heartbeat(claimed, lease_seconds):
+                lease_lost = True
+                logger.warning(f"[WARNING] 作业 #{claimed.id} 的租约已被接管，取消执行")
+                job_task.cancel()
+                return
+
+    heartbeat = asyncio.create_task(_keep_lease())
+    try:
+        result = await job_task
+    except asyncio.CancelledError:
+        if lease_lost:
+            # 作业已由其他 worker 接管，不再修改其记录
+            return
+        # worker 退出：立即交还作业（不计入尝试次数）而不是等待租约过期
+        queue.release(claimed)
+        raise
+    except Exception as e:
+        state = queue.fail(claimed, f"{type(e).__name__}: {e}")
+        logger.error(
+            f"[ERROR] 作业 #{claimed.id} 失败（第 {claimed.attempts}/{claimed.max_attempts} 次）: {e}，状态: {state}"
+        )
+    else:
+        queue.complete(claimed, result)
+        logger.info(f"[OK] 作业 #{claimed.id} 完成")
+    finally:
+        heartbeat.cancel()
+
+
+async def run_worker(
+    queue: JobQueue,
+    max_concurrency: int | None = None,
+    poll_interval: float = 1.0,
+    drain: bool = False,
+    lease_seconds: int | None = None,
+    owner: str | None = None,
+) -> int:
+    """以有限并发持续消费队列
+
+    Args:
+        queue: 作业队列
+        max_concurrency: 同时执行的作业数（默认读取 ISSUELAB_WORKER_CONCURRENCY，未设置为 2）
+        poll_interval: 队列为空时的轮询间隔（秒）
+        drain: 为 True 时队列中没有可执行的作业且当前作业都完成后返回
+        lease_seconds: 租约时长（默认读取 ISSUELAB_JOB_LEASE_SECONDS）
+        owner: worker 标识（默认 hostname:pid:随机后缀）
+
+    Returns:
+        本次处理的作业数
+    """
+    concurrency = max_concurrency or get_worker_concurrency()
+    lease = lease_seconds or get_lease_seconds()
+    owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    running: set[asyncio.Task] = set()
+    processed = 0
+    logger.info(f"[INFO] worker {owner} 启动（并发 {concurrency}）")
+
+    try:
+        while True:
+            while len(running) < concurrency:
+                claimed = queue.claim(owner, lease)
+                if claimed is None:
+                    break
+                processed += 1
+                running.add(asyncio.create_task(_run_one(queue, claimed, lease)))
+
+            if drain and not running:
+                return processed
+            if running:
+                _, running = await asyncio.wait(running, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            else:
+                await asyncio.sleep(poll_interval)
+    finally:
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -0,0 +1,170 @@
+"""作业执行（供常驻的 serve 守护进程调用）
+
+作业是一个 JSON 字典，type 字段决定处理函数：
+
+- execute: {"type": "execute", "issue": 1, "agents": ["echo"], "post": false, "trigger_comment": ""}
+- observe: {"type": "observe", "issue": 1, "post": false}
+- dispatch: {"type": "dispatch", "args": {"mentions": "alice", "source_repo": "o/r", "issue_number": 1}}
+
+逻辑与同名 CLI 子命令一致，但不解析命令行也不退出进程，返回可 JSON 序列化的结果。
+在同一进程中重复执行时，Agent 发现、选项、Token 与 MCP 等进程级缓存都会被复用。
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from issuelab.agents.io_pool import arun_blocking
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _parse_agents(agents: Any) -> list[str]:
+    """解析 agents 字段（列表或逗号/空格分隔的字符串）"""
+    if isinstance(agents, str):
+        agents = agents.replace(",", " ").split()
+    return [str(agent).strip().lower() for agent in agents or [] if str(agent).strip()]
+
+
+def _require_issue(job: dict[str, Any]) -> int:
+    try:
+        return int(job["issue"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise ValueError("job requires an integer 'issue'") from exc
+
+
+async def _load_issue_context(issue_number: int) -> tuple[dict[str, Any], str]:
+    """获取 Issue 信息并写入上下文文件
+
+    Returns:
+        (issue_info, issue_file)
+    """
+    from issuelab.tools.github import aget_issue_info, write_issue_context_file
+
+    issue_info = await aget_issue_info(issue_number, format_comments=True)
+    issue_file = await arun_blocking(
+        write_issue_context_file,
+        issue_number=issue_number,
+        title=issue_info.get("title", ""),
+        body=issue_info.get("body", ""),
+        comments=issue_info.get("comments", ""),
+        comment_count=issue_info.get("comment_count", 0),
+    )
+    return issue_info, issue_file
+
+
+async def run_execute_job(job: dict[str, Any]) -> dict[str, Any]:
+    """并行执行 Agent（对应 execute 子命令）"""
+    from issuelab.agents.executor import run_agents_parallel
+    from issuelab.tools.github import apost_comment
+
+    issue_number = _require_issue(job)
+    agents = _parse_agents(job.get("agents"))
+    if not agents:
+        raise ValueError("execute job requires at least one agent")
+
+    issue_info, issue_file = await _load_issue_context(issue_number)
+    context = f"**Issue 内容文件**: {issue_file}\n请使用 Read 工具读取该文件后再进行分析。"
+    posted: dict[str, bool] = {}
+
+    async def _post_as_completed(agent_name: str, result: Any) -> None:
+        # 每个 agent 完成后立即发布，不等待其他 agent
+        posted[agent_name] = await apost_comment(
+            issue_number, result.get("response", str(result)), agent_name=agent_name
+        )
+
+    run_kwargs: dict[str, Any] = {"on_result": _post_as_completed} if job.get("post") else {}
+    results = await run_agents_parallel(
+        issue_number,
+        agents,
+        context,
+        issue_info.get("comment_count", 0),
+        trigger_comment=job.get("trigger_comment") or "",
+        **run_kwargs,
+    )
+
+    summary: dict[str, Any] = {}
+    for agent_name, result in results.items():
+        entry = {
+            "response": result.get("response", str(result)),
+            "cost_usd": result.get("cost_usd", 0.0),
+            "num_turns": result.get("num_turns", 0),
+            "tool_calls": len(result.get("tool_calls", [])),
+        }
+        if job.get("post"):
+            entry["posted"] = posted.get(agent_name, False)
+        summary[agent_name] = entry
+    return {"issue": issue_number, "results": summary}
+
+
+async def run_observe_job(job: dict[str, Any]) -> dict[str, Any]:
+    """运行 Observer 分析 Issue（对应 observe 子命令）"""
+    from issuelab.agents.observer import run_observer
+    from issuelab.tools.github import apost_comment
+
+    issue_number = _require_issue(job)
+    issue_info, issue_file = await _load_issue_context(issue_number)
+    result = dict(
+        await run_observer(
+            issue_number,
+            issue_info.get("title", ""),
+            f"内容已保存至文件: {issue_file}\n请使用 Read 工具读取该文件后再分析。",
+            "历史评论已包含在同一文件中。",
+        )
+    )
+    if job.get("post") and result.get("should_trigger") and result.get("comment"):
+        result["posted"] = await apost_comment(issue_number, result["comment"], agent_name="observer")
+    return result
+
+
+def _to_argv(args: dict[str, Any]) -> list[str]:
+    """把 {"source_repo": "o/r", "dry_run": true} 转换为 ["--source-repo", "o/r", "--dry-run"]"""
+    argv: list[str] = []
+    for key, value in args.items():
+        if value is None or value is False:
+            continue
+        flag = "--" + key.replace("_", "-")
+        if value is True:
+            argv.append(flag)
+        else:
+            argv.extend([flag, value if isinstance(value, str) else str(value)])
+    return argv
+
+
+async def run_dispatch_job(job: dict[str, Any]) -> dict[str, Any]:
+    """向用户仓库分发事件（对应 issuelab.cli.dispatch）"""
+    from issuelab.cli.dispatch import main as dispatch_main
+
+    args = job.get("args")
+    if not isinstance(args, dict):
+        raise ValueError("dispatch job requires an 'args' object")
+    try:
+        # 分发流程包含多次网络请求，使用独立线程而不是共享 I/O 池，避免占满池中的线程
+        # 导致 _read_text_with_timeout 等短时读取超时
+        exit_code = await asyncio.to_thread(dispatch_main, _to_argv(args))
+    except SystemExit as exc:
+        # argparse 参数错误会调用 sys.exit，不能让它终止常驻进程
+        raise ValueError(f"invalid dispatch args (exit code {exc.code})") from None
+    return {"exit_code": exit_code}
+
+
+JOB_HANDLERS: dict[str, Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]] = {
+    "execute": run_execute_job,
+    "observe": run_observe_job,
+    "dispatch": run_dispatch_job,
+}
+
+
+async def run_job(job: dict[str, Any]) -> dict[str, Any]:
+    """按 type 执行作业
+
+    Raises:
+        ValueError: 未知的作业类型或参数无效
+    """
+    job_type = job.get("type")
+    handler = JOB_HANDLERS.get(job_type) if isinstance(job_type, str) else None
+    if handler is None:
+        raise ValueError(f"unknown job type: {job_type!r}")
+    logger.info(f"[INFO] 开始作业: {job_type}")
+    return await handler(job)
@@ -0,0 +1,69 @@
+"""带统计信息的有界 LRU 缓存
+
+用于长期运行的进程（如 serve / worker）中的进程级缓存：条目数有上限，
+并记录命中、未命中与淘汰次数，便于通过 stats() 观察缓存效果。
+"""
+
+from collections import OrderedDict
+from typing import Any
+
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache(OrderedDict):
+    """有界 LRU 缓存（仍是 dict 子类，可直接当字典使用）
+
+    通过 lookup() 查询会更新访问顺序并计入命中/未命中；
+    写入超过 maxsize 时淘汰最久未使用的条目。
+
+    Args:
+        maxsize: 最大条目数（<= 0 表示不限制）
+        name: 缓存名称（日志用）
+    """
+
+    def __init__(self, maxsize: int = 128, name: str = "cache"):
+        super().__init__()
+        self.maxsize = maxsize
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, key: Any, default: Any = None) -> Any:
+        """查询并更新 LRU 顺序（计入命中/未命中统计）"""
+        value = super().get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if self.maxsize > 0:
+            while len(self) > self.maxsize:
+                evicted, _ = self.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"[{self.name}] LRU 淘汰: {evicted!r}")
+
+    def stats(self) -> dict[str, Any]:
+        """返回缓存统计信息"""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = self.evictions = 0
@@ -4,17 +4,14 @@
 """
 
 import logging
-import re
 from pathlib import Path
 from typing import Any
 
 from issuelab.agents.registry import BUILTIN_AGENTS, load_registry
+from issuelab.mention_tokenizer import replace_mentions, tokenize_mentions
 
 logger = logging.getLogger(__name__)
 
-# 统一的 @mention 匹配规则（支持字母、数字、下划线、连字符）
-MENTION_PATTERN = re.compile(r"@([a-zA-Z0-9_-]+)")
-
 
 def load_mention_policy() -> dict[str, Any]:
     """加载 @ 提及策略配置
@@ -47,6 +44,11 @@ def load_mention_policy() -> dict[str, Any]:
             "max_per_issue": 10,
             "max_per_hour": 5,
         },
+        "cascade": {
+            "enabled": True,
+            "max_depth": 3,
+            "max_fanout_per_issue": 8,
+        },
     }
 
     if not config_file:
@@ -55,10 +57,9 @@ def load_mention_policy() -> dict[str, Any]:
 
     # 加载 YAML 配置
     try:
-        import yaml
+        from issuelab.yaml_utils import safe_load_file
 
-        with open(config_file, encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+        config = safe_load_file(config_file)
 
         if not config or "mention_policy" not in config:
             logger.warning("[WARN] mention_policy.yml 格式错误，使用默认配置")
@@ -151,12 +152,8 @@ def extract_mentions(text: str) -> list[str]:
     if not text:
         return []
 
-    matches = MENTION_PATTERN.findall(text)
     # 过滤纯数字（GitHub 用户名不能是纯数字）
-    matches = [m for m in matches if not m.isdigit()]
-
-    # 去重并保持顺序
-    return list(dict.fromkeys(matches))
+    return tokenize_mentions(text).unique(skip_numeric=True)
 
 
 def rank_mentions_by_frequency(text: str) -> list[str]:
@@ -164,38 +161,15 @@ def rank_mentions_by_frequency(text: str) -> list[str]:
     if not text:
         return []
 
-    matches = MENTION_PATTERN.findall(text)
-    matches = [m for m in matches if not m.isdigit()]
-    if not matches:
-        return []
-
-    counts: dict[str, int] = {}
-    first_index: dict[str, int] = {}
-    canonical: dict[str, str] = {}
-
-    for idx, mention in enumerate(matches):
-        key = mention.lower()
-        counts[key] = counts.get(key, 0) + 1
-        if key not in first_index:
-            first_index[key] = idx
-            canonical[key] = mention
-
-    ordered_keys = sorted(counts.keys(), key=lambda k: (-counts[k], first_index[k]))
-    return [canonical[k] for k in ordered_keys]
+    return tokenize_mentions(text).ranked(skip_numeric=True)
 
 
 def clean_mentions_in_text(text: str, replacement: str = "用户 {username}") -> str:
-    """清理文本中的所有 @mentions"""
+    """清理文本中的所有 @mentions（代码围栏与 URL 中的内容保持原样）"""
     if not text:
         return text
 
-    def replace_fn(match: re.Match) -> str:
-        username = match.group(1)
-        if username.isdigit():
-            return match.group(0)
-        return replacement.format(username=username)
-
-    return MENTION_PATTERN.sub(replace_fn, text)
+    return replace_mentions(text, replacement, skip_numeric=True)
 
 
 def build_mention_section(mentions: list[str], format_type: str = "labeled") -> str:
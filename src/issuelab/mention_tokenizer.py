@@ -0,0 +1,143 @@
+"""@mention 分词器：单次扫描提取 mentions 的位置、次数与首次出现顺序
+
+所有 @mention 相关的解析（cli.mentions / parser / mention_policy）都基于本模块：
+
+- 一个预编译的正则，单次线性扫描完成分词
+- 跳过代码围栏（``` / ~~~）和 URL 中的 @（与 GitHub 的提及语义一致）
+- @ 前面紧跟字母、数字或下划线时不视为提及（如邮箱 foo@bar.com）
+- 结果按文本缓存，同一段长评论被多处解析时只扫描一次
+
+本模块只依赖标准库，保证 scripts/parse_mentions.py 的轻量启动。
+"""
+
+import re
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+# 单个分词正则：按顺序尝试 代码围栏 → URL → @mention
+# GitHub 用户名规则：字母、数字、连字符、下划线，不能以连字符开头或结尾
+_TOKEN_PATTERN = re.compile(
+    r"(?P<fence>^[ \t]*(?P<mark>`{3,}|~{3,})[^`\n]*(?:\n.*?^[ \t]*(?P=mark)[`~]*[ \t]*$|.*\Z))"
+    r"|(?P<url>\b(?:https?|ftp)://[^\s<>\"']+|\bwww\.[^\s<>\"']+)"
+    r"|(?<![A-Za-z0-9_])@(?P<name>[A-Za-z0-9_](?:[A-Za-z0-9_-]*[A-Za-z0-9_])?)",
+    re.MULTILINE | re.DOTALL,
+)
+
+_SCAN_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True, slots=True)
+class Mention:
+    """一次 @mention 出现
+
+    Attributes:
+        name: 用户名（不含 @，保留原始大小写）
+        start: "@" 在文本中的位置
+        end: 用户名结束位置（不含）
+    """
+
+    name: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True, slots=True)
+class MentionScan:
+    """一段文本的 @mention 扫描结果
+
+    Attributes:
+        mentions: 按出现顺序排列的所有 mention
+        counts: 出现次数（键为小写用户名，只读：扫描结果按文本缓存并在调用方之间共享）
+        first_seen: 不区分大小写去重后的用户名（保留首次出现的大小写，按首次出现排序）
+    """
+
+    mentions: tuple[Mention, ...]
+    counts: Mapping[str, int]
+    first_seen: tuple[str, ...]
+
+    @property
+    def names(self) -> list[str]:
+        """所有 mention 名称（含重复，按出现顺序）"""
+        return [m.name for m in self.mentions]
+
+    def unique(self, *, case_sensitive: bool = True, skip_numeric: bool = False) -> list[str]:
+        """去重后的 mention 名称（保持首次出现顺序）
+
+        Args:
+            case_sensitive: 是否区分大小写去重
+            skip_numeric: 是否跳过纯数字（GitHub 用户名不能是纯数字）
+
+        Returns:
+            用户名列表
+        """
+        names = dict.fromkeys(m.name for m in self.mentions) if case_sensitive else self.first_seen
+        return [n for n in names if not (skip_numeric and n.isdigit())]
+
+    def ranked(self, *, skip_numeric: bool = True) -> list[str]:
+        """按出现次数降序、首次出现位置升序排序（不区分大小写，保留首次大小写）"""
+        # first_seen 已按首次出现排序，sorted 为稳定排序
+        names = [n for n in self.first_seen if not (skip_numeric and n.isdigit())]
+        return sorted(names, key=lambda n: -self.counts[n.lower()])
+
+
+@lru_cache(maxsize=_SCAN_CACHE_SIZE)
+def tokenize_mentions(text: str) -> MentionScan:
+    """扫描文本中的 @mentions（单次扫描，结果按文本缓存）
+
+    Args:
+        text: 要解析的文本
+
+    Returns:
+        MentionScan 扫描结果
+
+    Example:
+        >>> scan = tokenize_mentions("@alice and @Bob, cc @alice")
+        >>> scan.names
+        ['alice', 'Bob', 'alice']
+        >>> dict(scan.counts)
+        {'alice': 2, 'bob': 1}
+    """
+    mentions: list[Mention] = []
+    counts: dict[str, int] = {}
+    first_seen: dict[str, str] = {}
+
+    for match in _TOKEN_PATTERN.finditer(text or ""):
+        name = match.group("name")
+        if name is None:
+            continue
+        mentions.append(Mention(name, match.start(), match.end()))
+        key = name.lower()
+        counts[key] = counts.get(key, 0) + 1
+        first_seen.setdefault(key, name)
+
+    return MentionScan(tuple(mentions), MappingProxyType(counts), tuple(first_seen.values()))
+
+
+def replace_mentions(text: str, replacement: str, *, skip_numeric: bool = True) -> str:
+    """按扫描到的位置替换 @mentions（代码围栏与 URL 保持原样）
+
+    Args:
+        text: 原始文本
+        replacement: 替换模板，支持 {username} 占位符
+        skip_numeric: 是否保留纯数字提及（如 @123）
+
+    Returns:
+        替换后的文本
+    """
+    if not text:
+        return text
+
+    parts: list[str] = []
+    cursor = 0
+    for mention in tokenize_mentions(text).mentions:
+        if skip_numeric and mention.name.isdigit():
+            continue
+        parts.append(text[cursor : mention.start])
+        parts.append(replacement.format(username=mention.name))
+        cursor = mention.end
+    if not parts:
+        return text
+    parts.append(text[cursor:])
+    return "".join(parts)
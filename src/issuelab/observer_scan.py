@@ -0,0 +1,234 @@
+"""Observer 增量扫描：只选择上次成功扫描后有更新的 Issues
+
+observe-batch 原先每次都分析全部开放 Issues。增量模式下：
+
+- 记录上次成功扫描的高水位线（Issue 的最大 updated_at）
+- 通过 REST API 按 updated 升序分页拉取 since 高水位线之后更新的 Issues（跳过 PR 和排除标签）
+- 每拉完一页就写入检查点；运行中断后下次从检查点继续（以已处理的最大 updated_at 为游标）
+- 分析全部完成后调用 commit_scan() 推进高水位线；获取/分析/触发失败的 Issue 通过 retry 参数
+  保留在检查点中，下次扫描时重新选中（否则它们落在高水位线之下，增量扫描再也不会看到）
+
+检查点文件位于 Config.get_state_dir() / observer_scan.json。
+"""
+
+import json
+import os
+import subprocess
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+from issuelab.config import Config
+from issuelab.logging_config import get_logger
+from issuelab.retry import retry_sync
+
+logger = get_logger(__name__)
+
+CHECKPOINT_FILENAME = "observer_scan.json"
+CHECKPOINT_VERSION = 1
+PER_PAGE = 100
+DEFAULT_EXCLUDE_LABELS = ("bot:processing", "bot:quiet")
+
+FetchPage = Callable[[str | None, int], list[dict[str, Any]]]
+
+
+@dataclass
+class ScanCheckpoint:
+    """增量扫描检查点
+
+    Attributes:
+        high_water_mark: 上次成功扫描的最大 updated_at（ISO 8601），None 表示从未扫描
+        since: 进行中的扫描起点（None 表示没有进行中的扫描）
+        cursor: 进行中的扫描已处理到的最大 updated_at
+        issues: 进行中的扫描已选中的 Issue 编号
+        complete: 进行中的扫描是否已拉取完所有分页
+        retry: 上次扫描中未成功处理、需要在下次扫描中重新选中的 Issue 编号
+    """
+
+    high_water_mark: str | None = None
+    since: str | None = None
+    cursor: str | None = None
+    issues: list[int] = field(default_factory=list)
+    complete: bool = False
+    retry: list[int] = field(default_factory=list)
+
+    @property
+    def in_progress(self) -> bool:
+        return self.since is not None or bool(self.issues)
+
+    @classmethod
+    def load(cls, path: Path) -> "ScanCheckpoint":
+        """读取检查点（文件不存在或损坏时返回空检查点）"""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARNING] 扫描检查点读取失败，忽略: {e}")
+            return cls()
+        if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+            return cls()
+        progress = data.get("in_progress") or {}
+        return cls(
+            high_water_mark=data.get("high_water_mark"),
+            since=progress.get("since"),
+            cursor=progress.get("cursor"),
+            issues=[int(n) for n in progress.get("issues", [])],
+            complete=bool(progress.get("complete", False)),
+            retry=[int(n) for n in data.get("retry", [])],
+        )
+
+    def save(self, path: Path) -> None:
+        """原子写入检查点"""
+        data: dict[str, Any] = {"version": CHECKPOINT_VERSION, "high_water_mark": self.high_water_mark}
+        if self.retry:
+            data["retry"] = self.retry
+        if self.in_progress:
+            data["in_progress"] = {
+                "since": self.since,
+                "cursor": self.cursor,
+                "issues": self.issues,
+                "complete": self.complete,
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def get_checkpoint_path() -> Path:
+    """获取检查点文件路径"""
+    return Config.get_state_dir() / CHECKPOINT_FILENAME
+
+
+@retry_sync(max_retries=3, initial_delay=1.0, backoff_factor=2.0)
+def fetch_issues_page(since: str | None, page: int, repo: str | None = None) -> list[dict[str, Any]]:
+    """拉取一页按 updated 升序排列的开放 Issues（包含 PR，由调用方过滤）
+
+    Args:
+        since: 只返回该时间之后更新的 Issues（ISO 8601，None 表示全部）
+        page: 页码（从 1 开始）
+        repo: 仓库（owner/name），None 表示当前仓库
+
+    Returns:
+        REST API 返回的 Issue 列表
+    """
+    params = {"state": "open", "sort": "updated", "direction": "asc", "per_page": PER_PAGE, "page": page}
+    if since:
+        params["since"] = since
+    endpoint = f"repos/{repo or '{owner}/{repo}'}/issues?{urlencode(params)}"
+
+    result = subprocess.run(
+        ["gh", "api", endpoint],
+        capture_output=True,
+        text=True,
+        env=Config.prepare_github_env(),
+    )
+    if result.returncode != 0:
+        logger.error(f"拉取 Issues 失败 (page={page}): {result.stderr}")
+        raise RuntimeError(f"Failed to list issues: {result.stderr}")
+
+    data = json.loads(result.stdout or "[]")
+    return data if isinstance(data, list) else []
+
+
+def _is_selectable(item: dict[str, Any], exclude_labels: set[str]) -> bool:
+    if "pull_request" in item:
+        return False
+    labels = {label.get("name", "") if isinstance(label, dict) else str(label) for label in item.get("labels", [])}
+    return not labels & exclude_labels
+
+
+def select_updated_issues(
+    repo: str | None = None,
+    checkpoint_path: Path | None = None,
+    exclude_labels: tuple[str, ...] = DEFAULT_EXCLUDE_LABELS,
+    fetch_page: FetchPage | None = None,
+) -> list[int]:
+    """选择上次成功扫描后有更新的开放 Issues
+
+    每拉取一页就更新检查点；存在未完成的扫描时从其游标继续，
+    已选中的 Issue 会保留（直到 commit_scan() 被调用）。
+    上次扫描中需要重试的 Issue 排在最前面。
+
+    Args:
+        repo: 仓库（owner/name），None 表示当前仓库
+        checkpoint_path: 检查点文件路径（None 表示默认位置）
+        exclude_labels: 需要排除的标签
+        fetch_page: 分页拉取函数 (since, page) -> items（测试用）
+
+    Returns:
+        Issue 编号列表（按 updated 升序）
+    """
+    path = checkpoint_path or get_checkpoint_path()
+    fetch = fetch_page or (lambda since, page: fetch_issues_page(since, page, repo=repo))
+    excluded = set(exclude_labels)
+
+    checkpoint = ScanCheckpoint.load(path)
+    if checkpoint.in_progress:
+        logger.info(
+            f"[SCAN] 继续未完成的扫描: since={checkpoint.since}, cursor={checkpoint.cursor}, "
+            f"已选中 {len(checkpoint.issues)} 个"
+        )
+    else:
+        checkpoint.since = checkpoint.high_water_mark or ""
+        checkpoint.cursor = checkpoint.high_water_mark
+        checkpoint.issues = list(checkpoint.retry)
+        logger.info(
+            f"[SCAN] 开始增量扫描: since={checkpoint.since or '（首次，全量）'}, 重试 {len(checkpoint.retry)} 个"
+        )
+
+    selected = dict.fromkeys(checkpoint.issues)
+    # 本次运行固定 since 逐页拉取；中断后下次以检查点游标为新的 since 从第 1 页继续
+    run_since = checkpoint.cursor or None
+    page = 1
+    while not checkpoint.complete:
+        items = fetch(run_since, page)
+        for item in items:
+            if _is_selectable(item, excluded):
+                selected.setdefault(int(item["number"]), None)
+            updated_at = item.get("updated_at")
+            if updated_at and (checkpoint.cursor is None or updated_at > checkpoint.cursor):
+                checkpoint.cursor = updated_at
+
+        checkpoint.issues = list(selected)
+        checkpoint.complete = len(items) < PER_PAGE
+        checkpoint.save(path)
+        logger.debug(f"[SCAN] page={page} 返回 {len(items)} 条，累计选中 {len(selected)} 个")
+        page += 1
+
+    logger.info(f"[SCAN] 选中 {len(selected)} 个自上次扫描后更新的 Issues")
+    return list(selected)
+
+
+def commit_scan(checkpoint_path: Path | None = None, retry: Iterable[int] = ()) -> str | None:
+    """标记进行中的扫描已处理：推进高水位线并清除进度
+
+    Args:
+        checkpoint_path: 检查点文件路径（None 表示默认位置）
+        retry: 本次未成功处理（获取失败、分析出错、触发失败或被推迟）的 Issue，下次扫描重新选中
+
+    Returns:
+        新的高水位线
+    """
+    path = checkpoint_path or get_checkpoint_path()
+    checkpoint = ScanCheckpoint.load(path)
+    if not checkpoint.in_progress:
+        return checkpoint.high_water_mark
+
+    if checkpoint.cursor:
+        checkpoint.high_water_mark = checkpoint.cursor
+    checkpoint.since = None
+    checkpoint.cursor = None
+    checkpoint.issues = []
+    checkpoint.complete = False
+    checkpoint.retry = list(dict.fromkeys(int(n) for n in retry))
+    checkpoint.save(path)
+    logger.info(f"[SCAN] 高水位线推进到 {checkpoint.high_water_mark}")
+    if checkpoint.retry:
+        logger.info(f"[SCAN] {len(checkpoint.retry)} 个 Issue 下次重试: {checkpoint.retry}")
+    return checkpoint.high_water_mark
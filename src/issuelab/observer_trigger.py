@@ -12,8 +12,11 @@ import logging
 import os
 import subprocess
 import sys
+from collections.abc import AsyncIterable, Callable, Iterable, Mapping
+from typing import Any
 
 from issuelab.agents.registry import BUILTIN_AGENTS, is_registered_agent
+from issuelab.cascade import CascadeContext
 
 logger = logging.getLogger(__name__)
 
@@ -34,30 +37,24 @@ def is_builtin_agent(agent_name: str) -> bool:
     return agent_name.lower() in BUILTIN_AGENTS
 
 
-def trigger_builtin_agent(agent_name: str, issue_number: int) -> bool:
+def trigger_builtin_agent(agent_name: str, issue_number: int, cascade: CascadeContext | None = None) -> bool:
     """
     触发内置agent（通过workflow dispatch）
 
     Args:
         agent_name: Agent名称
         issue_number: Issue编号
+        cascade: 级联上下文（作为 workflow 输入传递给被触发的 agent）
 
     Returns:
         True: 触发成功
         False: 触发失败
     """
+    cmd = _builtin_agent_cmd(agent_name, issue_number, cascade)
+
     try:
         subprocess.run(
-            [
-                "gh",
-                "workflow",
-                "run",
-                "agent.yml",
-                "-f",
-                f"agent={agent_name.lower()}",
-                "-f",
-                f"issue_number={issue_number}",
-            ],
+            cmd,
             check=True,
             capture_output=True,
             text=True,
@@ -72,7 +69,47 @@ def trigger_builtin_agent(agent_name: str, issue_number: int) -> bool:
         return False
 
 
-def trigger_user_agent(username: str, issue_number: int, issue_title: str, issue_body: str) -> bool:
+async def atrigger_builtin_agent(agent_name: str, issue_number: int, cascade: CascadeContext | None = None) -> bool:
+    """trigger_builtin_agent 的异步版本（gh 子进程不阻塞事件循环）"""
+    import anyio
+
+    try:
+        await anyio.run_process(_builtin_agent_cmd(agent_name, issue_number, cascade), check=True)
+        logger.info(f"[OK] 已触发 workflow agent.yml: agent={agent_name}, issue=#{issue_number}")
+        return True
+    except subprocess.CalledProcessError as e:
+        stderr = e.stderr.decode("utf-8", "replace") if isinstance(e.stderr, bytes) else e.stderr
+        logger.error(f"[ERROR] 触发workflow失败: {stderr}")
+        return False
+    except Exception as e:
+        logger.error(f"[ERROR] 触发内置agent失败: {e}")
+        return False
+
+
+def _builtin_agent_cmd(agent_name: str, issue_number: int, cascade: CascadeContext | None) -> list[str]:
+    cmd = [
+        "gh",
+        "workflow",
+        "run",
+        "agent.yml",
+        "-f",
+        f"agent={agent_name.lower()}",
+        "-f",
+        f"issue_number={issue_number}",
+    ]
+    if cascade is not None:
+        for key, value in cascade.to_payload().items():
+            cmd.extend(["-f", f"{key}={value}"])
+    return cmd
+
+
+def trigger_user_agent(
+    username: str,
+    issue_number: int,
+    issue_title: str,
+    issue_body: str,
+    cascade: CascadeContext | None = None,
+) -> bool:
     """
     触发用户agent（通过dispatch系统或本地执行）
 
@@ -85,6 +122,7 @@ def trigger_user_agent(username: str, issue_number: int, issue_title: str, issue
         issue_number: Issue编号
         issue_title: Issue标题
         issue_body: Issue内容
+        cascade: 级联上下文（随 dispatch payload 传递）
 
     Returns:
         True: 触发成功
@@ -103,10 +141,17 @@ def trigger_user_agent(username: str, issue_number: int, issue_title: str, issue
         return False
 
     # 统一走 dispatch 到用户仓库
-    return dispatch_user_agent(username, issue_number, issue_title, issue_body, source_repo)
+    return dispatch_user_agent(username, issue_number, issue_title, issue_body, source_repo, cascade=cascade)
 
 
-def dispatch_user_agent(username: str, issue_number: int, issue_title: str, issue_body: str, source_repo: str) -> bool:
+def dispatch_user_agent(
+    username: str,
+    issue_number: int,
+    issue_title: str,
+    issue_body: str,
+    source_repo: str,
+    cascade: CascadeContext | None = None,
+) -> bool:
     """Dispatch用户agent到fork仓库"""
     try:
         from issuelab.cli.dispatch import main as dispatch_main
@@ -124,6 +169,8 @@ def dispatch_user_agent(username: str, issue_number: int, issue_title: str, issu
             "--issue-body",
             issue_body,
         ]
+        if cascade is not None:
+            sys.argv.extend(cascade.to_cli_args())
 
         exit_code = dispatch_main()
         if exit_code == 0:
@@ -138,7 +185,13 @@ def dispatch_user_agent(username: str, issue_number: int, issue_title: str, issu
         return False
 
 
-def auto_trigger_agent(agent_name: str, issue_number: int, issue_title: str, issue_body: str) -> bool:
+def auto_trigger_agent(
+    agent_name: str,
+    issue_number: int,
+    issue_title: str,
+    issue_body: str,
+    cascade: CascadeContext | None = None,
+) -> bool:
     """
     根据agent类型自动选择触发方式
 
@@ -147,15 +200,17 @@ def auto_trigger_agent(agent_name: str, issue_number: int, issue_title: str, iss
         issue_number: Issue编号
         issue_title: Issue标题
         issue_body: Issue内容
+        cascade: 被触发agent的级联上下文（None 表示开启新的级联）
 
     Returns:
         True: 触发成功
         False: 触发失败
     """
+    cascade_kwargs = {"cascade": cascade} if cascade is not None else {}
     if is_builtin_agent(agent_name):
-        return trigger_builtin_agent(agent_name, issue_number)
+        return trigger_builtin_agent(agent_name, issue_number, **cascade_kwargs)
     elif is_registered_agent(agent_name)[0]:
-        return trigger_user_agent(agent_name, issue_number, issue_title, issue_body)
+        return trigger_user_agent(agent_name, issue_number, issue_title, issue_body, **cascade_kwargs)
     else:
         logger.warning(
             f"[WARNING] Agent '{agent_name}' 不是内置 agent 也未注册，跳过触发。 "
@@ -164,7 +219,60 @@ def auto_trigger_agent(agent_name: str, issue_number: int, issue_title: str, iss
         return False
 
 
-def process_observer_results(results: list[dict], issue_data: dict[int, dict], auto_trigger: bool = True) -> int:
+def _trigger_target(result: Mapping[str, Any], issue_data: dict[int, dict]) -> tuple[str, int, dict] | None:
+    """解析单条 Observer 决策的触发目标 (agent_name, issue_number, issue)，不需要触发或数据缺失时返回 None"""
+    if not result.get("should_trigger", False):
+        return None
+
+    issue_number = result["issue_number"]
+    agent_name = result.get("agent")
+
+    if not agent_name:
+        logger.warning(f"[WARNING] Issue #{issue_number} 缺少agent名称")
+        return None
+
+    if issue_number not in issue_data:
+        logger.warning(f"[WARNING] Issue #{issue_number} 缺少数据")
+        return None
+
+    return agent_name, issue_number, issue_data[issue_number]
+
+
+def _trigger_for_result(result: Mapping[str, Any], issue_data: dict[int, dict]) -> bool:
+    """按单条 Observer 决策触发 agent（不需要触发或数据缺失时返回 False）"""
+    target = _trigger_target(result, issue_data)
+    if target is None:
+        return False
+    agent_name, issue_number, issue = target
+    return auto_trigger_agent(
+        agent_name=agent_name,
+        issue_number=issue_number,
+        issue_title=issue.get("title", ""),
+        issue_body=issue.get("body", ""),
+    )
+
+
+async def _atrigger_for_result(result: Mapping[str, Any], issue_data: dict[int, dict]) -> bool:
+    """_trigger_for_result 的异步版本
+
+    内置 agent 直接以异步子进程调用 gh；用户 agent 的 dispatch 仍是同步 HTTP 调用，放到工作线程执行。
+    """
+    import anyio
+
+    target = _trigger_target(result, issue_data)
+    if target is None:
+        return False
+    agent_name, issue_number, issue = target
+    if is_builtin_agent(agent_name):
+        return await atrigger_builtin_agent(agent_name, issue_number)
+    return await anyio.to_thread.run_sync(
+        auto_trigger_agent, agent_name, issue_number, issue.get("title", ""), issue.get("body", "")
+    )
+
+
+def process_observer_results(
+    results: Iterable[Mapping[str, Any]], issue_data: dict[int, dict], auto_trigger: bool = True
+) -> int:
     """
     处理Observer批量分析结果，自动触发agent
 
@@ -179,33 +287,42 @@ def process_observer_results(results: list[dict], issue_data: dict[int, dict], a
     if not auto_trigger:
         return 0
 
-    triggered_count = 0
+    triggered_count = sum(1 for result in results if _trigger_for_result(result, issue_data))
 
-    for result in results:
-        if not result.get("should_trigger", False):
-            continue
+    logger.info(f"[INFO] 总计触发 {triggered_count} 个agent")
+    return triggered_count
 
-        issue_number = result["issue_number"]
-        agent_name = result.get("agent")
 
-        if not agent_name:
-            logger.warning(f"[WARNING] Issue #{issue_number} 缺少agent名称")
-            continue
+async def process_observer_stream(
+    results: AsyncIterable[Mapping[str, Any]],
+    issue_data: dict[int, dict],
+    auto_trigger: bool = True,
+    on_result: Callable[[Mapping[str, Any], bool], None] | None = None,
+) -> int:
+    """
+    流式处理Observer分析结果：每个决策到达后立即触发agent，不等待整批分析完成
 
-        if issue_number not in issue_data:
-            logger.warning(f"[WARNING] Issue #{issue_number} 缺少数据")
-            continue
+    内置 agent 以异步 gh 子进程触发，用户 agent 的 HTTP dispatch 在工作线程中执行，
+    都不会阻塞仍在分析的 Issues。
 
-        issue = issue_data[issue_number]
-        success = auto_trigger_agent(
-            agent_name=agent_name,
-            issue_number=issue_number,
-            issue_title=issue.get("title", ""),
-            issue_body=issue.get("body", ""),
-        )
+    Args:
+        results: Observer决策的异步迭代器（如 stream_observer_batch 产出的接收流）
+        issue_data: Issue数据字典 {issue_number: {title, body}}
+        auto_trigger: 是否自动触发
+        on_result: 每条决策处理完成后的回调 (result, triggered)
 
-        if success:
+    Returns:
+        成功触发的agent数量
+    """
+    triggered_count = 0
+    async for result in results:
+        triggered = False
+        if auto_trigger:
+            triggered = await _atrigger_for_result(result, issue_data)
+        if triggered:
             triggered_count += 1
+        if on_result is not None:
+            on_result(result, triggered)
 
     logger.info(f"[INFO] 总计触发 {triggered_count} 个agent")
     return triggered_count
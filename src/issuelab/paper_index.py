@@ -0,0 +1,263 @@
+"""论文去重索引：arXiv / PubMed 监控共用
+
+原先每次运行都要列出仓库 Issues 再做标题匹配（PubMed 还是 O(论文数 × Issue 数) 的前缀子串扫描）。
+本模块持久化一个去重索引，记录已创建 Issue 的论文标识：
+
+- arXiv id（去掉版本号）、PMID、DOI（小写）、规范化标题
+- 查询为 O(1) 字典查找；创建 Issue 后调用 add() 更新
+- 索引为空时从仓库现有 Issues 回填一次（bootstrap），之后不再列出 Issues
+
+索引文件位于 Config.get_state_dir() / paper_index.json，workflow 通过 actions/cache 在运行间保留。
+"""
+
+import json
+import os
+import re
+import unicodedata
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+from issuelab.config import Config
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "paper_index.json"
+INDEX_VERSION = 1
+KEY_KINDS = ("arxiv", "pmid", "doi", "title")
+# 过短的标题容易误判重复，不参与标题去重
+MIN_TITLE_LENGTH = 12
+
+# 由监控脚本创建的 Issue 标题前缀
+ISSUE_TITLE_PREFIXES = ("[论文讨论]", "[文献]")
+
+_ARXIV_URL_RE = re.compile(r"arxiv\.org/(?:abs|pdf)/([a-z\-]+(?:\.[a-z]{2})?/\d{7}|\d{4}\.\d{4,5})", re.IGNORECASE)
+_ARXIV_VERSION_RE = re.compile(r"v\d+$")
+_PMID_URL_RE = re.compile(r"pubmed\.ncbi\.nlm\.nih\.gov/(\d+)")
+_DOI_RE = re.compile(r"\b(10\.\d{4,9}/[^\s\])>\"'<]+)")
+_NUMBERED_TITLE_RE = re.compile(r"^\s*#{2,4}\s+\d+\.\s+(.+?)\s*$", re.MULTILINE)
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_title(title: str) -> str:
+    """规范化标题：NFKC、小写、去掉标点和空白"""
+    text = unicodedata.normalize("NFKC", title or "").lower()
+    for prefix in ISSUE_TITLE_PREFIXES:
+        if text.startswith(prefix):
+            text = text[len(prefix) :]
+            break
+    return _NON_WORD_RE.sub("", text)
+
+
+def normalize_arxiv_id(value: str) -> str:
+    """规范化 arXiv id（去掉 URL、arXiv: 前缀和版本号）"""
+    text = (value or "").strip()
+    match = _ARXIV_URL_RE.search(text)
+    if match:
+        text = match.group(1)
+    text = re.sub(r"^arxiv:", "", text, flags=re.IGNORECASE)
+    return _ARXIV_VERSION_RE.sub("", text).lower()
+
+
+def normalize_doi(value: str) -> str:
+    """规范化 DOI（去掉 doi.org 前缀，小写）"""
+    text = (value or "").strip()
+    text = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:)", "", text, flags=re.IGNORECASE)
+    return text.rstrip(".").lower()
+
+
+def paper_keys(paper: dict[str, Any]) -> list[tuple[str, str]]:
+    """提取论文的去重键 [(类型, 值)]
+
+    支持 monitor_arxiv（id/url）与 monitor_pubmed（pmid/doi）产生的论文字典。
+    """
+    keys: list[tuple[str, str]] = []
+    url = str(paper.get("url", "") or "")
+
+    if paper.get("arxiv_id"):
+        arxiv_source = str(paper["arxiv_id"])
+    elif "arxiv.org" in url:
+        arxiv_source = url
+    elif paper.get("id") and not paper.get("pmid"):
+        arxiv_source = str(paper["id"])
+    else:
+        arxiv_source = ""
+    arxiv_id = normalize_arxiv_id(arxiv_source)
+    if arxiv_id:
+        keys.append(("arxiv", arxiv_id))
+
+    pmid = str(paper.get("pmid", "") or "").strip()
+    if not pmid:
+        match = _PMID_URL_RE.search(url)
+        pmid = match.group(1) if match else ""
+    if pmid:
+        keys.append(("pmid", pmid))
+
+    doi = normalize_doi(str(paper.get("doi", "") or ""))
+    if doi:
+        keys.append(("doi", doi))
+
+    title = normalize_title(str(paper.get("title", "") or ""))
+    if len(title) >= MIN_TITLE_LENGTH:
+        keys.append(("title", title))
+    return keys
+
+
+def issue_keys(title: str, body: str) -> list[tuple[str, str]]:
+    """从已有 Issue 的标题和正文中提取去重键（bootstrap 用）"""
+    keys: list[tuple[str, str]] = []
+    text = body or ""
+    keys.extend(("arxiv", normalize_arxiv_id(m.group(1))) for m in _ARXIV_URL_RE.finditer(text))
+    keys.extend(("pmid", m.group(1)) for m in _PMID_URL_RE.finditer(text))
+    keys.extend(("doi", normalize_doi(m.group(1))) for m in _DOI_RE.finditer(text))
+
+    titles = [m.group(1) for m in _NUMBERED_TITLE_RE.finditer(text)]
+    if (title or "").startswith("[论文讨论]"):
+        titles.append(title)
+    for candidate in titles:
+        normalized = normalize_title(candidate)
+        if len(normalized) >= MIN_TITLE_LENGTH:
+            keys.append(("title", normalized))
+    return keys
+
+
+def get_index_path() -> Path:
+    """获取索引文件路径"""
+    return Config.get_state_dir() / INDEX_FILENAME
+
+
+class PaperIndex:
+    """持久化的论文去重索引
+
+    Args:
+        path: 索引文件路径（None 表示 Config.get_state_dir() / paper_index.json）
+    """
+
+    def __init__(self, path: str | os.PathLike[str] | None = None):
+        self.path = Path(path) if path is not None else get_index_path()
+        self.entries: dict[str, dict[str, int]] = {kind: {} for kind in KEY_KINDS}
+        self.bootstrapped_repos: list[str] = []
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str] | None = None) -> "PaperIndex":
+        """读取索引（文件不存在或损坏时返回空索引）"""
+        index = cls(path)
+        try:
+            with open(index.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return index
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARNING] 论文索引读取失败，忽略: {e}")
+            return index
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return index
+        for kind in KEY_KINDS:
+            values = data.get("entries", {}).get(kind, {})
+            if isinstance(values, dict):
+                index.entries[kind] = {str(k): int(v or 0) for k, v in values.items()}
+        index.bootstrapped_repos = [str(r) for r in data.get("bootstrapped_repos", [])]
+        return index
+
+    def save(self) -> None:
+        """原子写入索引（未修改时不写）"""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": INDEX_VERSION, "bootstrapped_repos": self.bootstrapped_repos, "entries": self.entries},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+        logger.info(f"[INFO] 论文索引已保存: {len(self)} 个键 -> {self.path}")
+
+    def __len__(self) -> int:
+        return sum(len(values) for values in self.entries.values())
+
+    def find(self, paper: dict[str, Any]) -> int | None:
+        """查找论文对应的 Issue 编号（0 表示编号未知），不存在时返回 None"""
+        for kind, value in paper_keys(paper):
+            if value in self.entries[kind]:
+                return self.entries[kind][value]
+        return None
+
+    def contains(self, paper: dict[str, Any]) -> bool:
+        return self.find(paper) is not None
+
+    def add(self, paper: dict[str, Any], issue_number: int | None = None) -> None:
+        """记录已创建 Issue 的论文"""
+        self._add_keys(paper_keys(paper), issue_number)
+
+    def _add_keys(self, keys: Iterable[tuple[str, str]], issue_number: int | None) -> None:
+        for kind, value in keys:
+            if value and self.entries[kind].get(value) != (issue_number or 0):
+                self.entries[kind][value] = issue_number or 0
+                self._dirty = True
+
+    def filter_new(self, papers: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """过滤掉已有 Issue 的论文（同批次内重复的论文也只保留一篇）"""
+        seen = PaperIndex(self.path)
+        filtered = []
+        for paper in papers:
+            issue_number = self.find(paper)
+            if issue_number is not None:
+                logger.debug(f"跳过已存在: {paper.get('title', '')[:50]}... (Issue #{issue_number or '?'})")
+                continue
+            if seen.contains(paper):
+                continue
+            seen.add(paper)
+            filtered.append(paper)
+        return filtered
+
+    def is_bootstrapped(self, repo_name: str) -> bool:
+        return repo_name in self.bootstrapped_repos
+
+    def bootstrap(self, repo_name: str, issues: Iterable[Any]) -> int:
+        """从仓库现有 Issues 回填索引（每个仓库只需一次）
+
+        Args:
+            repo_name: 仓库名（owner/repo）
+            issues: 带 title、body、number 属性的 Issue 对象（如 PyGithub Issue）
+
+        Returns:
+            回填的 Issue 数量
+        """
+        count = 0
+        for issue in issues:
+            title = getattr(issue, "title", "") or ""
+            if not title.startswith(ISSUE_TITLE_PREFIXES):
+                continue
+            self._add_keys(issue_keys(title, getattr(issue, "body", "") or ""), getattr(issue, "number", None))
+            count += 1
+        self.bootstrapped_repos.append(repo_name)
+        self._dirty = True
+        logger.info(f"[INFO] 论文索引从 {repo_name} 的 {count} 个论文 Issue 回填完成")
+        return count
+
+
+def load_paper_index(
+    repo_name: str,
+    list_issues: Callable[[], Iterable[Any]],
+    path: str | os.PathLike[str] | None = None,
+) -> PaperIndex:
+    """读取论文索引，首次用于该仓库时从现有 Issues 回填
+
+    Args:
+        repo_name: 仓库名（owner/repo）
+        list_issues: 列出仓库全部 Issues 的函数（仅在需要回填时调用）
+        path: 索引文件路径（None 表示默认位置）
+
+    Returns:
+        PaperIndex
+    """
+    index = PaperIndex.load(path)
+    if not index.is_bootstrapped(repo_name):
+        index.bootstrap(repo_name, list_issues())
+        index.save()
+    return index
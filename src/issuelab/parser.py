@@ -1,8 +1,7 @@
 """Agent @mention 解析器：从评论中提取并映射 Agent 名称"""
 
-import re
-
 from issuelab.agents.registry import AGENT_NAMES
+from issuelab.mention_tokenizer import tokenize_mentions
 
 
 def parse_agent_mentions(comment_body: str) -> list[str]:
@@ -16,25 +15,15 @@ def parse_agent_mentions(comment_body: str) -> list[str]:
     Returns:
         标准化的 Agent 名称列表
     """
-    pattern = r"@([a-zA-Z_]+)"
-    raw_mentions = re.findall(pattern, comment_body, re.IGNORECASE)
-
-    # 映射到标准名称
+    # 不区分大小写去重后映射到标准名称
     agents = []
-    for m in raw_mentions:
+    for m in tokenize_mentions(comment_body).unique(case_sensitive=False):
         normalized = m.lower()
         if normalized in AGENT_NAMES:
             agents.append(AGENT_NAMES[normalized])
 
     # 去重，保持顺序
-    seen = set()
-    unique_agents = []
-    for a in agents:
-        if a not in seen:
-            seen.add(a)
-            unique_agents.append(a)
-
-    return unique_agents
+    return list(dict.fromkeys(agents))
 
 
 def has_agent_mentions(comment_body: str) -> bool:
@@ -46,4 +35,4 @@ def has_agent_mentions(comment_body: str) -> bool:
     Returns:
         是否包含 @mention
     """
-    return bool(re.search(r"@[a-zA-Z_]+", comment_body))
+    return bool(tokenize_mentions(comment_body).unique(skip_numeric=True))
@@ -11,10 +11,9 @@ import re
 import subprocess
 from typing import Any
 
-import yaml
-
 from issuelab.agents.executor import run_single_agent_text
 from issuelab.tools.github import get_issue_info
+from issuelab.yaml_utils import YAMLError, safe_load
 
 logger = logging.getLogger(__name__)
 
@@ -187,11 +186,11 @@ reasoning: "说明"
     yaml_text = match.group(1).strip() if match else response_text.strip()
 
     try:
-        parsed = yaml.safe_load(yaml_text)
+        parsed = safe_load(yaml_text)
         if not isinstance(parsed, dict):
             logger.error(f"YAML解析结果非对象: {type(parsed)}")
             return {"selected_issues": [], "selections": [], "reasoning": "解析失败"}
-    except yaml.YAMLError as e:
+    except YAMLError as e:
         logger.error(f"YAML解析错误: {e}")
         return {"selected_issues": [], "selections": [], "reasoning": f"错误: {e}"}
 
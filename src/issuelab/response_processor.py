@@ -6,24 +6,31 @@ Agent Response 后处理：解析 @mentions 并触发 dispatch
 - 自动触发被@的用户agent
 """
 
+import copy
 import logging
 import os
 import re
 import subprocess
+from collections.abc import Mapping
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Any
 
-import yaml
-
+from issuelab.cascade import CascadeContext, plan_cascade
 from issuelab.mention_policy import (
     build_mention_section,
     clean_mentions_in_text,
     filter_mentions,
+    load_mention_policy,
 )
+from issuelab.results import ProcessedResponse
+from issuelab.yaml_utils import safe_load, safe_load_file
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
+    "ParsedResponse",
+    "parse_response",
     "build_mention_section",
     "clean_mentions_in_text",
     "filter_mentions",
@@ -94,8 +101,7 @@ def _load_format_rules() -> dict[str, Any]:
     config_path = Path(__file__).resolve().parents[2] / "config" / "response_format.yml"
     if config_path.exists():
         try:
-            with config_path.open("r", encoding="utf-8") as handle:
-                data = yaml.safe_load(handle) or {}
+            data = safe_load_file(config_path) or {}
             rules.update({k: v for k, v in data.items() if k in rules})
             if "sections" in data:
                 rules["sections"].update(data.get("sections", {}))
@@ -119,9 +125,118 @@ def _truncate_text(text: str, limit: int) -> str:
     return text[:limit]
 
 
-def _extract_yaml_block(text: str) -> str:
-    match = re.search(r"```yaml(.*?)```", text, re.DOTALL | re.IGNORECASE)
-    return match.group(1).strip() if match else ""
+_YAML_BLOCK_PATTERN = re.compile(r"```yaml(.*?)```", re.DOTALL | re.IGNORECASE)
+
+_PARSED_RESPONSE_CACHE_SIZE = 64
+
+
+def _load_yaml_text(yaml_text: str) -> Any:
+    """解析 YAML 文本，失败返回 None。"""
+    try:
+        return safe_load(yaml_text)
+    except Exception:
+        return None
+
+
+class ParsedResponse:
+    """Agent 回复的解析结果
+
+    一次回复在后处理链路（规范化、mentions 提取、sources 校验、发布评论）中会被多次读取，
+    这里只提取并解析一次 YAML 块，派生字段（mentions / sources / confidence）按需计算后缓存。
+
+    同一文本的实例由 parse_response 在进程内共享，因此公开属性每次都返回副本，
+    调用方修改返回值不会影响其他调用方。
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+
+    def __repr__(self) -> str:
+        return f"ParsedResponse(len={len(self.text)}, has_yaml={bool(self.yaml_text)})"
+
+    @cached_property
+    def _yaml_match(self) -> re.Match[str] | None:
+        return _YAML_BLOCK_PATTERN.search(self.text)
+
+    @cached_property
+    def yaml_text(self) -> str:
+        """第一个 ```yaml 代码块的内容（已去除首尾空白）"""
+        match = self._yaml_match
+        return match.group(1).strip() if match else ""
+
+    @cached_property
+    def _data(self) -> Any:
+        if not self.yaml_text:
+            return None
+        return _load_yaml_text(self.yaml_text)
+
+    @property
+    def data(self) -> Any:
+        """YAML 块的解析结果副本（无 YAML 块或解析失败时为 None）"""
+        return copy.deepcopy(self._data)
+
+    @property
+    def mapping(self) -> dict[str, Any]:
+        """YAML 解析结果为字典时返回该字典的副本，否则返回空字典"""
+        return copy.deepcopy(self._data) if isinstance(self._data, dict) else {}
+
+    def data_after(self, position: int) -> Any:
+        """解析 position 之后的第一个 YAML 块（与全文第一个块相同时复用缓存）"""
+        match = self._yaml_match
+        if match is None:
+            return None
+        if match.start() >= position:
+            return self.data
+        later = _YAML_BLOCK_PATTERN.search(self.text, position)
+        if later is None:
+            return None
+        yaml_text = later.group(1).strip()
+        return _load_yaml_text(yaml_text) if yaml_text else None
+
+    @cached_property
+    def _mentions(self) -> tuple[str, ...]:
+        mapping = self._data if isinstance(self._data, dict) else {}
+        return tuple(_normalize_yaml_mentions(mapping.get("mentions")))
+
+    @property
+    def mentions(self) -> list[str]:
+        """YAML mentions 字段中的合法用户名（去掉 @ 前缀，去重保序）"""
+        return list(self._mentions)
+
+    @cached_property
+    def _sources(self) -> tuple[str, ...]:
+        return tuple(_extract_sources_from_parsed_yaml(self._data))
+
+    @property
+    def sources(self) -> list[str]:
+        """YAML sources 字段中的 http(s) URL（去重保序）"""
+        return list(self._sources)
+
+    @cached_property
+    def confidence(self) -> str | None:
+        """YAML confidence 字段（仅 high / medium / low 有效）"""
+        mapping = self._data if isinstance(self._data, dict) else {}
+        value = str(mapping.get("confidence", "")).lower()
+        return value if value in {"high", "medium", "low"} else None
+
+
+@lru_cache(maxsize=_PARSED_RESPONSE_CACHE_SIZE)
+def _parse_response_cached(text: str) -> ParsedResponse:
+    return ParsedResponse(text)
+
+
+def parse_response(response: str | ParsedResponse) -> ParsedResponse:
+    """获取回复的 ParsedResponse（同一文本复用同一个解析结果）
+
+    Args:
+        response: 回复文本或已解析的 ParsedResponse
+
+    Returns:
+        ParsedResponse 实例
+    """
+    if isinstance(response, ParsedResponse):
+        return response
+    return _parse_response_cached(response or "")
 
 
 def _extract_sources_from_parsed_yaml(parsed: Any) -> list[str]:
@@ -151,15 +266,7 @@ def _extract_sources_from_parsed_yaml(parsed: Any) -> list[str]:
     return normalized
 
 
-def extract_mentions_from_yaml(response_text: str) -> list[str]:
-    yaml_text = _extract_yaml_block(response_text)
-    if not yaml_text:
-        return []
-    try:
-        parsed = yaml.safe_load(yaml_text) or {}
-    except Exception:
-        return []
-    mentions_value = parsed.get("mentions")
+def _normalize_yaml_mentions(mentions_value: Any) -> list[str]:
     if not mentions_value:
         return []
 
@@ -184,7 +291,13 @@ def extract_mentions_from_yaml(response_text: str) -> list[str]:
     return normalized
 
 
-def _normalize_agent_output(response_text: str, agent_name: str | None) -> tuple[str, list[str]]:
+def extract_mentions_from_yaml(response_text: str | ParsedResponse) -> list[str]:
+    return parse_response(response_text).mentions
+
+
+def _normalize_agent_output(response: str | ParsedResponse, agent_name: str | None) -> tuple[str, list[str]]:
+    parsed_response = parse_response(response)
+    response_text = parsed_response.text
     warnings: list[str] = []
     rules = _load_format_rules()
     sections = rules["sections"]
@@ -201,17 +314,15 @@ def _normalize_agent_output(response_text: str, agent_name: str | None) -> tuple
 
     # Render YAML-only responses into markdown for user-facing agents.
     if summary_marker not in response_text:
-        yaml_text = _extract_yaml_block(response_text)
+        yaml_text = parsed_response.yaml_text
         if yaml_text and agent_name not in {"arxiv_observer", "pubmed_observer"}:
-            try:
-                parsed = yaml.safe_load(yaml_text) or {}
-            except Exception:
-                parsed = None
+            # YAML 解析失败（data 为 None）或不是字典时保留原文，不渲染空模板
+            parsed = parsed_response.data
             if isinstance(parsed, dict):
                 summary_line = str(parsed.get("summary", "")).strip()
                 findings_list = parsed.get("findings", []) if isinstance(parsed.get("findings"), list) else []
                 recs_list = parsed.get("recommendations", []) if isinstance(parsed.get("recommendations"), list) else []
-                sources_list = _extract_sources_from_parsed_yaml(parsed)
+                sources_list = parsed_response.sources
 
                 findings_count = int(limits.get("findings_count", 3))
                 actions_max = int(limits.get("actions_max_count", 2))
@@ -289,9 +400,6 @@ def _normalize_agent_output(response_text: str, agent_name: str | None) -> tuple
         positions.get(actions_marker, len(response_text))
         + len(used_markers.get(actions_marker, actions_marker)) : positions.get(yaml_marker, len(response_text))
     ].strip()
-    yaml_block = response_text[
-        positions.get(yaml_marker, len(response_text)) + len(used_markers.get(yaml_marker, yaml_marker)) :
-    ].strip()
 
     summary_line = ""
     for line in summary_block.splitlines():
@@ -333,19 +441,16 @@ def _normalize_agent_output(response_text: str, agent_name: str | None) -> tuple
     confidence = "medium"
     parsed_mentions: list[str] = []
     parsed_sources: list[str] = []
-    yaml_text = _extract_yaml_block(yaml_block)
-    parsed = None
-    if yaml_text:
-        try:
-            parsed = yaml.safe_load(yaml_text)
-        except Exception:
-            parsed = None
-        if isinstance(parsed, dict):
-            parsed_confidence = str(parsed.get("confidence", "")).lower()
-            if parsed_confidence in {"high", "medium", "low"}:
-                confidence = parsed_confidence
-            parsed_mentions = extract_mentions_from_yaml(response_text)
-            parsed_sources = _extract_sources_from_parsed_yaml(parsed)
+    yaml_start = positions.get(yaml_marker, -1)
+    if yaml_start != -1:
+        yaml_start += len(used_markers.get(yaml_marker, yaml_marker))
+    parsed = parsed_response.data_after(yaml_start) if yaml_start != -1 else None
+    if isinstance(parsed, dict):
+        parsed_confidence = str(parsed.get("confidence", "")).lower()
+        if parsed_confidence in {"high", "medium", "low"}:
+            confidence = parsed_confidence
+        parsed_mentions = parsed_response.mentions
+        parsed_sources = _extract_sources_from_parsed_yaml(parsed)
 
     def _yaml_escape(value: str) -> str:
         return value.replace('"', '\\"')
@@ -405,13 +510,18 @@ def _extract_agent_name(response_text: str) -> str:
     return "unknown"
 
 
-def normalize_comment_body(body: str, agent_name: str | None = None) -> str:
+def normalize_comment_body(body: str | ParsedResponse, agent_name: str | None = None) -> str:
+    if isinstance(body, ParsedResponse):
+        parsed_body = body
+        body = body.text
+    else:
+        parsed_body = None
     if not body:
         return body
     if not agent_name:
         inferred = _extract_agent_name(body)
         agent_name = inferred if inferred != "unknown" else None
-    normalized, _warnings = _normalize_agent_output(body, agent_name)
+    normalized, _warnings = _normalize_agent_output(parsed_body or body, agent_name)
     rules = _load_format_rules()
     yaml_marker = rules["sections"]["structured"]
     if yaml_marker in normalized:
@@ -424,21 +534,26 @@ def normalize_comment_body(body: str, agent_name: str | None = None) -> str:
 
 
 def trigger_mentioned_agents(
-    response: str,
+    response: str | ParsedResponse,
     issue_number: int,
     issue_title: str,
     issue_body: str,
     policy: dict | None = None,
+    cascade: CascadeContext | None = None,
 ) -> tuple[dict[str, bool], list[str], list[str]]:
     """
     解析agent response中的@mentions，应用策略过滤，并触发允许的agent
 
+    除黑名单/注册校验外，还会按级联上下文检查触发链深度、环路和扇出预算，
+    被级联规则拦截的 mentions 同样计入 filtered_mentions。
+
     Args:
         response: Agent的response内容
         issue_number: Issue编号
         issue_title: Issue标题
         issue_body: Issue内容
         policy: @ 策略配置（None 则自动加载）
+        cascade: 当前agent的级联上下文（None 则从环境变量读取）
 
     Returns:
         (results, allowed_mentions, filtered_mentions)
@@ -451,9 +566,21 @@ def trigger_mentioned_agents(
 
     logger.info(f"[INFO] 发现 {len(mentions)} 个@mentions: {mentions}")
 
+    if policy is None:
+        policy = load_mention_policy()
+
     # 应用策略过滤
     allowed_mentions, filtered_mentions = filter_mentions(mentions, policy)
 
+    # 应用级联限制（深度 / 环路 / 扇出预算）
+    if cascade is None:
+        cascade = CascadeContext.from_env(policy=policy)
+    children, blocked = plan_cascade(allowed_mentions, cascade, policy)
+    # children 已按大小写去重（@Alice 与 @alice 只触发一次），始终以它为准
+    allowed_mentions = list(children)
+    if blocked:
+        filtered_mentions = [*filtered_mentions, *blocked]
+
     if filtered_mentions:
         logger.info(f"[FILTER] 过滤了 {len(filtered_mentions)} 个@mentions: {filtered_mentions}")
 
@@ -473,6 +600,7 @@ def trigger_mentioned_agents(
             issue_number=issue_number,
             issue_title=issue_title,
             issue_body=issue_body,
+            cascade=children[username],
         )
         results[username] = success
 
@@ -486,12 +614,12 @@ def trigger_mentioned_agents(
 
 def process_agent_response(
     agent_name: str,
-    response: str | dict[str, Any],
+    response: str | Mapping[str, Any],
     issue_number: int,
     issue_title: str = "",
     issue_body: str = "",
     auto_dispatch: bool = True,
-) -> dict[str, Any]:
+) -> ProcessedResponse:
     """
     处理agent response的后处理逻辑
 
@@ -503,75 +631,67 @@ def process_agent_response(
 
     Args:
         agent_name: Agent名称
-        response: Agent的response（字符串或dict）
+        response: Agent的response（字符串、dict 或 AgentRunResult）
         issue_number: Issue编号
         issue_title: Issue标题
         issue_body: Issue内容
         auto_dispatch: 是否自动触发@mentions
 
     Returns:
-        处理结果 {
-            "agent_name": str,
-            "response": str,  # 原始回复
-            "clean_response": str,  # 清理后的回复（所有 @ 替换为"用户 xxx"）
-            "mentions": list[str],  # 所有提取的 mentions
-            "allowed_mentions": list[str],  # 允许的 mentions
-            "filtered_mentions": list[str],  # 被过滤的 mentions
-            "dispatch_results": dict[str, bool]  # 触发结果
-        }
+        ProcessedResponse（兼容字典访问）:
+            agent_name: Agent 名称
+            response: 规范化后的回复
+            clean_response: 清理后的回复（所有 @ 替换为"用户 xxx"）
+            mentions: 所有提取的 mentions
+            allowed_mentions: 允许的 mentions
+            filtered_mentions: 被过滤的 mentions
+            dispatch_results: 触发结果
     """
-    # 提取response文本
-    response_text = response.get("response", str(response)) if isinstance(response, dict) else str(response)
+    # 提取response文本（YAML 只解析一次，后续步骤共享解析结果）
+    response_text = response.get("response", str(response)) if isinstance(response, Mapping) else str(response)
     raw_response_text = response_text
+    parsed_response = parse_response(raw_response_text)
 
-    normalized_response, format_warnings = _normalize_agent_output(response_text, agent_name)
-    if agent_name == "gqy20":
-        yaml_text = _extract_yaml_block(response_text)
-        parsed = None
-        if yaml_text:
-            try:
-                parsed = yaml.safe_load(yaml_text)
-            except Exception:
-                parsed = None
-        sources = _extract_sources_from_parsed_yaml(parsed)
-        if not sources:
-            format_warnings.append("Missing required sources URLs for gqy20")
+    normalized_response, format_warnings = _normalize_agent_output(parsed_response, agent_name)
+    if agent_name == "gqy20" and not parsed_response.sources:
+        format_warnings.append("Missing required sources URLs for gqy20")
     if format_warnings:
         logger.warning("Response format warnings for '%s': %s", agent_name, "; ".join(format_warnings))
     response_text = normalized_response
 
     # 提取所有 @mentions（基于原始回复，避免规范化后丢失）
-    mentions = extract_mentions_from_yaml(raw_response_text)
+    mentions = parsed_response.mentions
 
     # 清理主体内容（将所有 @username 替换为 "用户 username"）
     clean_response = clean_mentions_in_text(response_text)
 
-    result: dict[str, Any] = {
-        "agent_name": agent_name,
-        "response": response_text,
-        "raw_response": raw_response_text,
-        "clean_response": clean_response,
-        "mentions": mentions,
-        "allowed_mentions": [],
-        "filtered_mentions": [],
-        "dispatch_results": {},
-        "format_warnings": format_warnings,
-    }
+    result = ProcessedResponse(
+        agent_name=agent_name,
+        response=response_text,
+        raw_response=raw_response_text,
+        clean_response=clean_response,
+        mentions=mentions,
+        format_warnings=format_warnings,
+    )
 
     # 自动触发被@的agents
     if auto_dispatch and mentions:
         logger.info(f"🔗 {agent_name} 的response中@了 {len(mentions)} 个用户")
         dispatch_results, allowed_mentions, filtered_mentions = trigger_mentioned_agents(
-            response_text, issue_number, issue_title, issue_body
+            parse_response(response_text),
+            issue_number,
+            issue_title,
+            issue_body,
+            cascade=CascadeContext.from_env(agent_name),
         )
-        result["dispatch_results"] = dispatch_results
-        result["allowed_mentions"] = allowed_mentions
-        result["filtered_mentions"] = filtered_mentions
+        result.dispatch_results = dispatch_results
+        result.allowed_mentions = allowed_mentions
+        result.filtered_mentions = filtered_mentions
 
     return result
 
 
-def should_auto_close(response_text: str, agent_name: str) -> bool:
+def should_auto_close(response_text: str | ParsedResponse, agent_name: str) -> bool:
     """
     检查是否应该自动关闭Issue
 
@@ -589,6 +709,9 @@ def should_auto_close(response_text: str, agent_name: str) -> bool:
     if agent_name != "summarizer":
         return False
 
+    if isinstance(response_text, ParsedResponse):
+        response_text = response_text.text
+
     if not response_text:
         return False
 
@@ -608,16 +731,7 @@ def close_issue(issue_number: int) -> bool:
     """
     try:
         result = subprocess.run(
-            [
-                "gh",
-                "issue",
-                "close",
-                str(issue_number),
-                "--repo",
-                os.environ.get("GITHUB_REPOSITORY", ""),
-                "--reason",
-                "completed",
-            ],
+            _close_issue_cmd(issue_number),
             capture_output=True,
             text=True,
             env=os.environ.copy(),
@@ -631,3 +745,32 @@ def close_issue(issue_number: int) -> bool:
     except Exception as e:
         logger.error(f"[ERROR] 关闭 Issue #{issue_number} 异常: {e}")
         return False
+
+
+async def aclose_issue(issue_number: int) -> bool:
+    """close_issue 的异步版本（gh 子进程不阻塞事件循环）"""
+    import anyio
+
+    try:
+        result = await anyio.run_process(_close_issue_cmd(issue_number), check=False, env=os.environ.copy())
+        if result.returncode == 0:
+            logger.info(f"[OK] Issue #{issue_number} 已自动关闭")
+            return True
+        logger.error(f"[ERROR] 关闭 Issue #{issue_number} 失败: {result.stderr.decode('utf-8', 'replace')}")
+        return False
+    except Exception as e:
+        logger.error(f"[ERROR] 关闭 Issue #{issue_number} 异常: {e}")
+        return False
+
+
+def _close_issue_cmd(issue_number: int) -> list[str]:
+    return [
+        "gh",
+        "issue",
+        "close",
+        str(issue_number),
+        "--repo",
+        os.environ.get("GITHUB_REPOSITORY", ""),
+        "--reason",
+        "completed",
+    ]
@@ -0,0 +1,219 @@
+"""Agent 执行结果记录
+
+run_single_agent / run_observer / process_agent_response 等返回的结果统一使用
+slots dataclass，避免批量运行时持有大量松散字典：
+
+- 固定字段存放在 slots 中，未知键存放在 extra 字典中
+- 同时实现 MutableMapping，保留 result["cost_usd"] / result.get(...) 等字典用法
+- 值为 None 的可选字段视为不存在（与原先"键不存在"的语义一致）
+"""
+
+from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+from dataclasses import MISSING, dataclass, field, fields
+from functools import cache
+from typing import Any, TypeVar
+
+_RecordT = TypeVar("_RecordT", bound="_MappingRecord")
+
+# 参与用量汇总的数值字段
+USAGE_FIELDS = ("cost_usd", "num_turns", "input_tokens", "output_tokens", "total_tokens")
+
+
+@cache
+def _field_names(cls: type) -> tuple[str, ...]:
+    return tuple(f.name for f in fields(cls) if f.name != "extra")
+
+
+@cache
+def _optional_fields(cls: type) -> frozenset[str]:
+    return frozenset(f.name for f in fields(cls) if f.default is None and f.default_factory is MISSING)
+
+
+class _MappingRecord(MutableMapping[str, Any]):
+    """为 slots dataclass 提供 dict 兼容视图（子类需声明 extra 字段）"""
+
+    __slots__ = ()
+
+    extra: dict[str, Any]
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _field_names(type(self)):
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _field_names(type(self)):
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _optional_fields(type(self)):
+            if getattr(self, key) is None:
+                raise KeyError(key)
+            setattr(self, key, None)
+        elif key in _field_names(type(self)):
+            raise TypeError(f"字段 {key} 不能删除")
+        else:
+            del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for name in _field_names(type(self)):
+            if getattr(self, name) is not None:
+                yield name
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为普通字典（浅拷贝）"""
+        return dict(self.items())
+
+    @classmethod
+    def from_mapping(cls: type[_RecordT], data: Mapping[str, Any]) -> _RecordT:
+        """从字典构造记录，未知键放入 extra"""
+        if isinstance(data, cls):
+            return data
+        names = _field_names(cls)
+        known = {k: v for k, v in data.items() if k in names}
+        extra = {k: v for k, v in data.items() if k not in names}
+        return cls(**known, extra=extra)
+
+
+@dataclass(slots=True, eq=False)
+class AgentRunResult(_MappingRecord):
+    """单个 Agent（或多阶段流程）的执行结果
+
+    Attributes:
+        response: 代理响应文本
+        cost_usd: 成本（美元）
+        num_turns: 对话轮数
+        tool_calls: 工具调用列表
+        local_id: 本地会话 ID
+        session_id: SDK 会话 ID
+        text_blocks: 流式文本块
+        input_tokens / output_tokens / total_tokens: Token 用量
+        stages: 多阶段流程各阶段输出（仅多阶段流程）
+        extra: 其他附加字段
+    """
+
+    response: str = ""
+    cost_usd: float = 0.0
+    num_turns: int = 0
+    tool_calls: list[str] = field(default_factory=list)
+    local_id: str = ""
+    session_id: str = ""
+    text_blocks: list[str] = field(default_factory=list)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    total_tokens: int = 0
+    stages: dict[str, str] | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def add_usage(self, other: Mapping[str, Any]) -> "AgentRunResult":
+        """累加另一个结果的成本、轮数、Token 和工具调用（工具调用去重）
+
+        Args:
+            other: AgentRunResult 或旧式结果字典
+
+        Returns:
+            self，便于链式调用
+        """
+        self.cost_usd += float(other.get("cost_usd") or 0.0)
+        self.num_turns += int(other.get("num_turns") or 0)
+        self.input_tokens += int(other.get("input_tokens") or 0)
+        self.output_tokens += int(other.get("output_tokens") or 0)
+        self.total_tokens += int(other.get("total_tokens") or 0)
+
+        tools = other.get("tool_calls")
+        if isinstance(tools, list):
+            seen = set(self.tool_calls)
+            for tool in tools:
+                name = str(tool)
+                if name not in seen:
+                    seen.add(name)
+                    self.tool_calls.append(name)
+        return self
+
+    @classmethod
+    def combine(cls, results: Iterable[Mapping[str, Any]], response: str = "") -> "AgentRunResult":
+        """汇总多个结果的用量
+
+        Args:
+            results: 结果列表（AgentRunResult 或字典）
+            response: 汇总结果的响应文本
+
+        Returns:
+            汇总后的 AgentRunResult
+        """
+        total = cls(response=response)
+        for result in results:
+            total.add_usage(result)
+        return total
+
+
+@dataclass(slots=True, eq=False)
+class ObserverDecision(_MappingRecord):
+    """Observer 对单个 Issue 的决策
+
+    Attributes:
+        should_trigger: 是否需要触发 Agent
+        agent: 要触发的 Agent 名称
+        comment: 触发评论内容
+        reason: 触发 / 跳过理由
+        analysis: Issue 分析
+        issue_number: Issue 编号（批量分析时填充）
+        cost_usd: 成本（美元）
+        num_turns: 对话轮数
+        error: 错误信息（仅失败时存在）
+        extra: 其他附加字段
+    """
+
+    should_trigger: bool = False
+    agent: str = ""
+    comment: str = ""
+    reason: str = ""
+    analysis: str = ""
+    issue_number: int | None = None
+    cost_usd: float = 0.0
+    num_turns: int = 0
+    error: str | None = None
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True, eq=False)
+class ProcessedResponse(_MappingRecord):
+    """process_agent_response 的处理结果
+
+    Attributes:
+        agent_name: Agent 名称
+        response: 规范化后的回复
+        raw_response: 原始回复
+        clean_response: 清理后的回复（所有 @ 替换为"用户 xxx"）
+        mentions: 所有提取的 mentions
+        allowed_mentions: 允许的 mentions
+        filtered_mentions: 被过滤的 mentions
+        dispatch_results: 触发结果
+        format_warnings: 格式警告
+        extra: 其他附加字段
+    """
+
+    agent_name: str = ""
+    response: str = ""
+    raw_response: str = ""
+    clean_response: str = ""
+    mentions: list[str] = field(default_factory=list)
+    allowed_mentions: list[str] = field(default_factory=list)
+    filtered_mentions: list[str] = field(default_factory=list)
+    dispatch_results: dict[str, bool] = field(default_factory=dict)
+    format_warnings: list[str] = field(default_factory=list)
+    extra: dict[str, Any] = field(default_factory=dict)
+
+
+def total_cost(results: Iterable[Mapping[str, Any]]) -> float:
+    """汇总多个结果的成本"""
+    return sum(float(r.get("cost_usd") or 0.0) for r in results)
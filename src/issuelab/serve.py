@@ -0,0 +1,246 @@
+"""常驻作业守护进程（serve 子命令）
+
+每个 workflow 步骤都以新进程运行 `python -m issuelab ...`，需要重新导入 SDK、
+发现 Agent、构建选项并启动 MCP server。serve 模式在一个常驻进程中监听
+Unix socket（或 127.0.0.1 上的 TCP 端口），接收 execute / observe / dispatch 作业，
+Agent 发现、选项、Installation Token 与 MCP 进程池等缓存在作业之间保持预热。
+
+访问控制：Unix socket 创建时权限为 0600（仅当前用户可连接）；TCP 端口对本机所有用户可见，
+因此必须设置共享令牌 ISSUELAB_SERVE_TOKEN，每个请求都要在 token 字段中携带该令牌
+（submit_job 会自动从同名环境变量读取）。设置了令牌时 Unix socket 模式同样校验。
+
+协议为按行分隔的 JSON：客户端每行发送一个作业，服务端每行返回一个响应
+{"ok": true, "result": {...}} 或 {"ok": false, "error": "..."}。
+除 jobs.py 中的作业类型外，还支持 ping、stats 与 shutdown。
+"""
+
+import asyncio
+import contextlib
+import hmac
+import json
+import os
+import socket
+from typing import Any
+
+from issuelab.agents.io_pool import arun_blocking
+from issuelab.jobs import run_job
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_SERVE_CONCURRENCY = 2
+STREAM_LIMIT = 32 * 1024 * 1024
+
+
+def get_serve_concurrency(default: int = DEFAULT_SERVE_CONCURRENCY) -> int:
+    """读取同时执行的作业数上限（环境变量 ISSUELAB_SERVE_CONCURRENCY）"""
+    raw = os.environ.get("ISSUELAB_SERVE_CONCURRENCY", "").strip()
+    try:
+        return max(1, int(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_SERVE_CONCURRENCY={raw!r}，使用默认值 {default}")
+        return default
+
+
+def get_serve_token() -> str | None:
+    """读取共享令牌（环境变量 ISSUELAB_SERVE_TOKEN，空值视为未设置）"""
+    return os.environ.get("ISSUELAB_SERVE_TOKEN", "").strip() or None
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """常驻进程中各缓存的状态"""
+    from issuelab.agents.mcp_pool import mcp_pool_token
+    from issuelab.agents.options import get_agent_options_cache_stats
+    from issuelab.cli.dispatch import _installation_tokens
+
+    return {
+        "agent_options": get_agent_options_cache_stats(),
+        "installation_tokens": len(_installation_tokens),
+        "mcp_pool": bool(mcp_pool_token()),
+    }
+
+
+class JobServer:
+    """作业守护进程
+
+    Args:
+        socket_path: Unix socket 路径（与 port 二选一）
+        port: 监听 127.0.0.1 的 TCP 端口
+        max_concurrency: 同时执行的作业数（默认读取 ISSUELAB_SERVE_CONCURRENCY）
+        token: 共享令牌（默认读取 ISSUELAB_SERVE_TOKEN，TCP 模式必须设置）
+
+    Raises:
+        ValueError: 同时或都未指定 socket_path 与 port，或 TCP 模式未设置令牌
+    """
+
+    def __init__(
+        self,
+        socket_path: str | None = None,
+        port: int | None = None,
+        max_concurrency: int | None = None,
+        token: str | None = None,
+    ):
+        if (socket_path is None) == (port is None):
+            raise ValueError("exactly one of socket_path and port is required")
+        self.token = token or get_serve_token()
+        if port is not None and self.token is None:
+            raise ValueError("TCP mode requires a shared token (set ISSUELAB_SERVE_TOKEN)")
+        self.socket_path = socket_path
+        self.port = port
+        self.max_concurrency = max_concurrency or get_serve_concurrency()
+        self.jobs_done = 0
+        self._semaphore: asyncio.Semaphore | None = None
+        self._server: asyncio.AbstractServer | None = None
+        self._stopped: asyncio.Event | None = None
+
+    async def warm(self) -> None:
+        """预热 Agent 发现缓存（失败不影响启动）"""
+        from issuelab.agents.discovery import discover_agents
+
+        try:
+            agents = await arun_blocking(discover_agents)
+            logger.info(f"[OK] 已预热 {len(agents)} 个 Agent")
+        except Exception as e:
+            logger.warning(f"[WARNING] 预热 Agent 发现失败: {e}")
+
+    async def start(self) -> None:
+        """开始监听"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._stopped = asyncio.Event()
+        if self.socket_path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+            # 以 0600 创建 socket，其他用户无法连接（umask 覆盖 bind 与 chmod 之间的窗口）
+            old_umask = os.umask(0o177)
+            try:
+                self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=STREAM_LIMIT)
+            finally:
+                os.umask(old_umask)
+            os.chmod(self.socket_path, 0o600)
+            logger.info(f"[OK] serve 监听 {self.socket_path}")
+        else:
+            self._server = await asyncio.start_server(self._handle, "127.0.0.1", self.port, limit=STREAM_LIMIT)
+            self.port = self._server.sockets[0].getsockname()[1]
+            logger.info(f"[OK] serve 监听 127.0.0.1:{self.port}")
+
+    def stop(self) -> None:
+        """停止接收新连接并让 serve_forever 返回"""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def serve_forever(self) -> None:
+        """运行直到 stop() 或收到 shutdown 请求"""
+        if self._server is None:
+            await self.start()
+        assert self._stopped is not None and self._server is not None
+        try:
+            await self._stopped.wait()
+        finally:
+            self._server.close()
+            await self._server.wait_closed()
+            if self.socket_path is not None:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(self.socket_path)
+            logger.info(f"[INFO] serve 已停止（共完成 {self.jobs_done} 个作业）")
+
+    async def _dispatch(self, job: dict[str, Any]) -> dict[str, Any]:
+        job_type = job.get("type")
+        if job_type == "ping":
+            return {"pong": True}
+        if job_type == "stats":
+            return {"jobs_done": self.jobs_done, **get_cache_stats()}
+        if job_type == "shutdown":
+            self.stop()
+            return {"stopping": True}
+
+        assert self._semaphore is not None
+        async with self._semaphore:
+            result = await run_job(job)
+        self.jobs_done += 1
+        return result
+
+    def _authorized(self, job: dict[str, Any]) -> bool:
+        provided = job.pop("token", None)
+        if self.token is None:
+            return True
+        return isinstance(provided, str) and hmac.compare_digest(provided.encode(), self.token.encode())
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                if not line.strip():
+                    continue
+                authorized = True
+                try:
+                    job = json.loads(line)
+                    if not isinstance(job, dict):
+                        raise ValueError("job must be a JSON object")
+                    authorized = self._authorized(job)
+                    if not authorized:
+                        raise PermissionError("unauthorized: invalid or missing token")
+                    response = {"ok": True, "result": await self._dispatch(job)}
+                except Exception as e:
+                    logger.error(f"[ERROR] 作业失败: {e}")
+                    response = {"ok": False, "error": str(e)}
+                writer.write((json.dumps(response, ensure_ascii=False, default=str) + "\n").encode())
+                await writer.drain()
+                if not authorized:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+async def serve(socket_path: str | None = None, port: int | None = None, max_concurrency: int | None = None) -> None:
+    """启动守护进程并运行直到收到 shutdown 请求或 SIGINT/SIGTERM"""
+    import signal
+
+    # 常驻进程中复用 stdio MCP server
+    os.environ.setdefault("ISSUELAB_MCP_POOL", "1")
+
+    server = JobServer(socket_path=socket_path, port=port, max_concurrency=max_concurrency)
+    await server.warm()
+    await server.start()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError, RuntimeError):
+            loop.add_signal_handler(sig, server.stop)
+    await server.serve_forever()
+
+
+def submit_job(
+    job: dict[str, Any],
+    socket_path: str | None = None,
+    port: int | None = None,
+    timeout: float | None = None,
+    token: str | None = None,
+) -> dict[str, Any]:
+    """向守护进程提交一个作业并等待响应
+
+    Args:
+        token: 共享令牌（默认读取 ISSUELAB_SERVE_TOKEN）
+
+    Returns:
+        {"ok": true, "result": ...} 或 {"ok": false, "error": ...}
+    """
+    if socket_path is not None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address: Any = socket_path
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = ("127.0.0.1", port)
+    token = token or get_serve_token()
+    if token is not None:
+        job = {**job, "token": token}
+    with sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall((json.dumps(job, ensure_ascii=False) + "\n").encode())
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError("serve closed the connection without a response")
+    return json.loads(line)
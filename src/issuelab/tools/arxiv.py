@@ -0,0 +1,185 @@
+"""arXiv 新论文获取（异步）
+
+相比逐个分类调用 feedparser.parse(url)：
+
+- 多个分类合并为一个 OR 查询（分类过多时按 MAX_CATEGORIES_PER_QUERY 拆分并发请求）
+- 通过 submittedDate 区间在服务端按日期过滤，不再多取 max_papers * 3 条再在客户端丢弃
+- 请求经 AsyncHttpClient 发出：连接池、按主机限速（遵守 arXiv 每 3 秒 1 个请求的要求）、
+  ETag / Last-Modified 条件请求
+"""
+
+import re
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+import anyio
+import feedparser
+
+from issuelab.logging_config import get_logger
+from issuelab.tools.http_client import AsyncHttpClient
+
+logger = get_logger(__name__)
+
+ARXIV_API_URL = "http://export.arxiv.org/api/query"
+MAX_CATEGORIES_PER_QUERY = 20
+
+
+def parse_arxiv_date(date_str: str) -> str:
+    """解析 arXiv 日期格式"""
+    try:
+        dt = datetime.strptime(date_str[:19], "%Y-%m-%dT%H:%M:%S")
+        return dt.strftime("%Y-%m-%d")
+    except (ValueError, TypeError):
+        return date_str[:10] if date_str else "Unknown"
+
+
+def clean_text(text: str) -> str:
+    """清理文本中的多余空白"""
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def truncate_text(text: str, max_length: int = 1500) -> str:
+    """截断文本"""
+    if len(text) <= max_length:
+        return text
+    return text[:max_length].rsplit(".", 1)[0] + "..."
+
+
+def _parse_timestamp(value: str | None) -> float | None:
+    """解析 ISO 8601 时间（只取到秒，按 UTC 处理）"""
+    try:
+        return datetime.strptime((value or "")[:19], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=UTC).timestamp()
+    except (ValueError, TypeError):
+        return None
+
+
+def build_search_query(categories: Sequence[str], since: datetime | None = None, until: datetime | None = None) -> str:
+    """构建 arXiv search_query（分类 OR 合并 + submittedDate 区间）
+
+    区间按天取整（起点当天 00:00 到终点当天 23:59，GMT），同一天内的重复查询 URL 不变，
+    可以命中条件请求缓存；精确的时间过滤由客户端完成。
+
+    Args:
+        categories: 分类列表（如 cs.AI）
+        since: 起始时间（None 表示不限日期）
+        until: 截止时间（None 表示当前时间）
+
+    Returns:
+        search_query 字符串
+    """
+    cats = " OR ".join(f"cat:{c}" for c in categories)
+    query = f"({cats})" if len(categories) > 1 else cats
+    if since is None:
+        return query
+    until = until or datetime.now(UTC)
+    return f"{query} AND submittedDate:[{since:%Y%m%d}0000 TO {until:%Y%m%d}2359]"
+
+
+def _entry_category(entry: Any, categories: Sequence[str]) -> str:
+    """确定论文所属的请求分类（优先主分类）"""
+    primary = (entry.get("arxiv_primary_category") or {}).get("term", "")
+    if primary in categories:
+        return primary
+    for tag in entry.get("tags", []) or []:
+        if tag.get("term") in categories:
+            return tag["term"]
+    return primary or (categories[0] if categories else "")
+
+
+def parse_feed(feed_text: str, categories: Sequence[str], since_timestamp: float = 0) -> list[dict[str, Any]]:
+    """解析 Atom 响应为论文列表（跳过 since_timestamp 之前发布的论文）"""
+    papers = []
+    for entry in feedparser.parse(feed_text).entries:
+        published_timestamp = _parse_timestamp(entry.get("published", ""))
+        if published_timestamp is None or published_timestamp <= since_timestamp:
+            continue
+
+        authors = ", ".join(a.get("name", "") for a in entry.get("authors", [])[:5])
+        if len(entry.get("authors", [])) > 5:
+            authors += f" 等 {len(entry.get('authors', []))} 位作者"
+
+        arxiv_id = entry.get("id", "").split("/abs/")[-1]
+        papers.append(
+            {
+                "id": arxiv_id,
+                "title": clean_text(entry.get("title", "")),
+                "summary": truncate_text(clean_text(entry.get("summary", ""))),
+                "url": f"https://arxiv.org/abs/{arxiv_id}",
+                "pdf_url": f"https://arxiv.org/pdf/{arxiv_id}.pdf",
+                "authors": authors,
+                "published": parse_arxiv_date(entry.get("published", "")),
+                "published_raw": entry.get("published", ""),
+                "category": _entry_category(entry, categories),
+            }
+        )
+    return papers
+
+
+async def fetch_papers_async(
+    categories: Sequence[str],
+    last_scan: str | None,
+    max_papers: int = 10,
+    client: AsyncHttpClient | None = None,
+    now: datetime | None = None,
+) -> list[dict[str, Any]]:
+    """获取各分类在 last_scan 之后提交的新论文
+
+    Args:
+        categories: 分类列表
+        last_scan: 上次扫描时间（ISO 8601，None 或无法解析时不限日期）
+        max_papers: 最多返回的论文数（按发布时间倒序）
+        client: HTTP 客户端（None 表示新建并在结束时关闭）
+        now: 当前时间（测试用）
+
+    Returns:
+        去重并按发布时间倒序排列的论文列表
+    """
+    categories = [c for c in categories if c]
+    if not categories or max_papers <= 0:
+        return []
+
+    since_timestamp = _parse_timestamp(last_scan) or 0
+    since = datetime.fromtimestamp(since_timestamp, UTC) if since_timestamp else None
+    chunks = [categories[i : i + MAX_CATEGORIES_PER_QUERY] for i in range(0, len(categories), MAX_CATEGORIES_PER_QUERY)]
+    results: list[list[dict[str, Any]]] = [[] for _ in chunks]
+
+    async def _fetch_chunk(index: int, http: AsyncHttpClient) -> None:
+        chunk = chunks[index]
+        params = {
+            "search_query": build_search_query(chunk, since, now),
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+            "max_results": max_papers,
+        }
+        logger.info(f"[INFO] 获取分类: {', '.join(chunk)}")
+        try:
+            feed_text = await http.get_text(ARXIV_API_URL, params)
+        except Exception as e:
+            logger.warning(f"[WARNING] 获取 {', '.join(chunk)} 失败: {e}")
+            return
+        results[index] = parse_feed(feed_text, chunk, since_timestamp)
+
+    async def _fetch_all(http: AsyncHttpClient) -> None:
+        async with anyio.create_task_group() as tg:
+            for index in range(len(chunks)):
+                tg.start_soon(_fetch_chunk, index, http)
+
+    if client is not None:
+        await _fetch_all(client)
+    else:
+        async with AsyncHttpClient() as http:
+            await _fetch_all(http)
+
+    # 去重并排序
+    unique: dict[str, dict[str, Any]] = {}
+    for papers in results:
+        for paper in papers:
+            unique.setdefault(paper["id"], paper)
+    ordered = sorted(unique.values(), key=lambda p: p.get("published_raw", ""), reverse=True)
+    return ordered[:max_papers]
+
+
+def fetch_papers(categories: Sequence[str], last_scan: str | None, max_papers: int = 10) -> list[dict[str, Any]]:
+    """fetch_papers_async 的同步入口"""
+    return anyio.run(fetch_papers_async, categories, last_scan, max_papers)
@@ -4,11 +4,14 @@ import json
 import os
 import subprocess
 import tempfile
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from issuelab.config import Config
 from issuelab.logging_config import get_logger
-from issuelab.retry import retry_sync
+from issuelab.retry import retry_async, retry_sync
+
+if TYPE_CHECKING:
+    from issuelab.response_processor import ParsedResponse
 
 logger = get_logger(__name__)
 
@@ -25,17 +28,14 @@ def get_issue_info(issue_number: int, format_comments: bool = False, repo: str |
         format_comments: 是否格式化评论为字符串（用于 LLM 输入）
 
     Returns:
-        包含 title, body, comments, comment_count 等字段的字典
-        如果 format_comments=True，comments 为格式化字符串，否则为原始列表
+        包含 title, body, state, labels, comments, comment_count 等字段的字典
+        如果 format_comments=True，comments 为格式化字符串（原始列表保留在 raw_comments），否则为原始列表
     """
     logger.debug(f"获取 Issue #{issue_number} 信息")
     env = Config.prepare_github_env()
 
-    cmd = ["gh", "issue", "view", str(issue_number), "--json", "number,title,body,labels,comments"]
-    if repo:
-        cmd.extend(["--repo", repo])
     result = subprocess.run(
-        cmd,
+        _issue_view_cmd(issue_number, repo),
         capture_output=True,
         text=True,
         env=env,
@@ -45,7 +45,46 @@ def get_issue_info(issue_number: int, format_comments: bool = False, repo: str |
         logger.error(f"获取 Issue #{issue_number} 失败: {result.stderr}")
         raise RuntimeError(f"Failed to get issue info: {result.stderr}")
 
-    data = json.loads(result.stdout)
+    return _parse_issue_info(result.stdout, format_comments)
+
+
+async def aget_issue_info(issue_number: int, format_comments: bool = False, repo: str | None = None) -> dict:
+    """get_issue_info 的异步版本（gh 子进程不阻塞事件循环，重试策略与同步版本相同）"""
+    return await retry_async(
+        _aget_issue_info_once,
+        issue_number,
+        format_comments,
+        repo,
+        max_retries=3,
+        initial_delay=1.0,
+        backoff_factor=2.0,
+    )
+
+
+async def _aget_issue_info_once(issue_number: int, format_comments: bool, repo: str | None) -> dict:
+    import anyio
+
+    logger.debug(f"获取 Issue #{issue_number} 信息")
+    result = await anyio.run_process(_issue_view_cmd(issue_number, repo), check=False, env=Config.prepare_github_env())
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", "replace")
+        logger.error(f"获取 Issue #{issue_number} 失败: {stderr}")
+        raise RuntimeError(f"Failed to get issue info: {stderr}")
+
+    return _parse_issue_info(result.stdout.decode("utf-8"), format_comments)
+
+
+def _issue_view_cmd(issue_number: int, repo: str | None) -> list[str]:
+    cmd = ["gh", "issue", "view", str(issue_number), "--json", "number,title,body,labels,comments,state"]
+    if repo:
+        cmd.extend(["--repo", repo])
+    return cmd
+
+
+def _parse_issue_info(stdout: str, format_comments: bool) -> dict:
+    """解析 gh issue view 的 JSON 输出（见 get_issue_info）"""
+    data = json.loads(stdout)
 
     # 先计算评论数（使用原始列表）
     comment_count = len(data.get("comments", []))
@@ -60,6 +99,7 @@ def get_issue_info(issue_number: int, format_comments: bool = False, repo: str |
             body = comment.get("body", "")
             comments_list.append(f"- **[{author}]** ({created_at}):\n{body}")
 
+        data["raw_comments"] = data.get("comments", [])
         data["comments"] = "\n\n".join(comments_list)
 
     return data
@@ -73,7 +113,7 @@ def write_issue_context_file(
     comment_count: int | None = None,
 ) -> str:
     """写入 Issue 上下文到临时文件，返回文件路径。"""
-    base_dir = os.path.join(os.getcwd(), ".issuelab")
+    base_dir = Config.get_state_dir()
     os.makedirs(base_dir, exist_ok=True)
     path = os.path.join(base_dir, f"issue_{issue_number}.md")
 
@@ -131,7 +171,7 @@ def truncate_text(text: str, max_length: int = MAX_COMMENT_LENGTH) -> str:
 
 def post_comment(
     issue_number: int,
-    body: str,
+    body: "str | ParsedResponse",
     agent_name: str | None = None,
     mentions: list[str] | None = None,
     auto_truncate: bool = True,
@@ -147,7 +187,7 @@ def post_comment(
 
     Args:
         issue_number: Issue 编号
-        body: 评论内容
+        body: 评论内容（字符串或已解析的 ParsedResponse）
         mentions: 需要 @ 的用户列表（会拼接到评论末尾）
                  如果为 None 且 auto_clean=True，会自动提取并过滤
         auto_truncate: 是否自动截断过长内容（默认 True）
@@ -159,10 +199,80 @@ def post_comment(
         是否成功发布
     """
     env = Config.prepare_github_env()
-    from issuelab.response_processor import extract_mentions_from_yaml, normalize_comment_body
+    final_body = _build_comment_body(body, agent_name, mentions, auto_truncate, auto_clean)
+
+    # 使用临时文件避免命令行长度限制
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
+        f.write(final_body)
+        f.flush()
+
+        result = subprocess.run(
+            _comment_cmd(issue_number, f.name, repo),
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        os.unlink(f.name)
+
+    if result.returncode != 0:
+        logger.error(f"发布评论到 Issue #{issue_number} 失败: {result.stderr}")
+        return False
+
+    logger.info(f"评论已发布到 Issue #{issue_number}")
+    return True
+
+
+async def apost_comment(
+    issue_number: int,
+    body: "str | ParsedResponse",
+    agent_name: str | None = None,
+    mentions: list[str] | None = None,
+    auto_truncate: bool = True,
+    auto_clean: bool = True,
+    repo: str | None = None,
+) -> bool:
+    """post_comment 的异步版本（参数与返回值相同，gh 子进程不阻塞事件循环）"""
+    import anyio
+
+    final_body = _build_comment_body(body, agent_name, mentions, auto_truncate, auto_clean)
+
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
+        f.write(final_body)
+    try:
+        result = await anyio.run_process(
+            _comment_cmd(issue_number, f.name, repo), check=False, env=Config.prepare_github_env()
+        )
+    finally:
+        os.unlink(f.name)
+
+    if result.returncode != 0:
+        logger.error(f"发布评论到 Issue #{issue_number} 失败: {result.stderr.decode('utf-8', 'replace')}")
+        return False
+
+    logger.info(f"评论已发布到 Issue #{issue_number}")
+    return True
 
-    raw_body = body
-    body = normalize_comment_body(body, agent_name=agent_name)
+
+def _comment_cmd(issue_number: int, body_file: str, repo: str | None) -> list[str]:
+    cmd = ["gh", "issue", "comment", str(issue_number), "--body-file", body_file]
+    if repo:
+        cmd.extend(["--repo", repo])
+    return cmd
+
+
+def _build_comment_body(
+    body: "str | ParsedResponse",
+    agent_name: str | None,
+    mentions: list[str] | None,
+    auto_truncate: bool,
+    auto_clean: bool,
+) -> str:
+    """生成最终评论内容：规范化、@mentions 过滤与拼接、截断（见 post_comment）"""
+    from issuelab.response_processor import extract_mentions_from_yaml, normalize_comment_body, parse_response
+
+    # 只解析一次原始回复（规范化与 mentions 提取共享解析结果）
+    raw_body = parse_response(body)
+    body = normalize_comment_body(raw_body, agent_name=agent_name)
 
     # 自动清理和过滤 @mentions（集中式管理的核心）
     if mentions is None and auto_clean:
@@ -201,30 +311,7 @@ def post_comment(
     if auto_truncate:
         final_body = truncate_text(final_body, MAX_COMMENT_LENGTH)
 
-    # 使用临时文件避免命令行长度限制
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as f:
-        f.write(final_body)
-        f.flush()
-
-        # 构建命令
-        cmd = ["gh", "issue", "comment", str(issue_number), "--body-file", f.name]
-        if repo:
-            cmd.extend(["--repo", repo])
-
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            env=env,
-        )
-        os.unlink(f.name)
-
-    if result.returncode != 0:
-        logger.error(f"发布评论到 Issue #{issue_number} 失败: {result.stderr}")
-        return False
-
-    logger.info(f"评论已发布到 Issue #{issue_number}")
-    return True
+    return final_body
 
 
 def update_label(issue_number: int, label: str, action: Literal["add", "remove"] = "add") -> bool:
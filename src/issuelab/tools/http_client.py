@@ -0,0 +1,275 @@
+"""异步 HTTP 客户端：连接池 + 按主机限速 + 条件请求缓存
+
+供 arXiv / PubMed 等监控脚本使用：
+
+- 共享一个 requests.Session（带连接池），请求通过 anyio.to_thread 在线程中执行
+- 按主机的礼貌限制：令牌桶（平均请求间隔 + 突发上限）+ 最大并发
+  （如 arXiv 要求每 3 秒最多 1 个请求，NCBI E-utilities 每秒 3 个/有 API key 时 10 个）
+- 大响应可以流式解析（get_parsed），不必整体读入内存
+- ETag / Last-Modified 条件请求：服务端返回 304 时直接复用缓存的响应体
+  （缓存位于 Config.get_state_dir() / http_cache，workflow 可通过 actions/cache 保留）
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, TypeVar
+from urllib.parse import urlencode, urlsplit
+
+import anyio
+import anyio.to_thread
+import requests
+from requests.adapters import HTTPAdapter
+
+from issuelab.config import Config
+from issuelab.logging_config import get_logger
+from issuelab.retry import retry_async
+
+logger = get_logger(__name__)
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_POOL_SIZE = 10
+DEFAULT_USER_AGENT = "IssueLab/0.1 (+https://github.com/gqy20/IssueLab)"
+HTTP_CACHE_DIRNAME = "http_cache"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class HostPolicy:
+    """单个主机的礼貌限制
+
+    Attributes:
+        min_interval: 平均请求间隔（秒），即令牌补充速率的倒数；0 表示不限速
+        max_concurrency: 同时进行的最大请求数
+        burst: 令牌桶容量（允许连续发出的请求数，1 表示严格按间隔）
+    """
+
+    min_interval: float = 0.0
+    max_concurrency: int = 4
+    burst: int = 1
+
+
+# 已知服务的限制（未列出的主机使用 HostPolicy() 默认值）
+DEFAULT_HOST_POLICIES: dict[str, HostPolicy] = {
+    # https://info.arxiv.org/help/api/tou.html：每 3 秒不超过 1 个请求，单连接
+    "export.arxiv.org": HostPolicy(min_interval=3.0, max_concurrency=1),
+}
+
+
+class HostLimiter:
+    """按 HostPolicy 为同一主机的请求排队的令牌桶（必须在事件循环中创建）"""
+
+    def __init__(self, policy: HostPolicy):
+        self.policy = policy
+        self._capacity = anyio.CapacityLimiter(max(1, policy.max_concurrency))
+        self._lock = anyio.Lock()
+        self._tokens = float(max(1, policy.burst))
+        self._updated: float | None = None
+
+    async def _acquire_token(self) -> None:
+        if self.policy.min_interval <= 0:
+            return
+        rate = 1.0 / self.policy.min_interval
+        now = anyio.current_time()
+        if self._updated is not None:
+            self._tokens = min(float(max(1, self.policy.burst)), self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        if self._tokens < 1:
+            await anyio.sleep((1 - self._tokens) / rate)
+            self._tokens = 1.0
+            self._updated = anyio.current_time()
+        self._tokens -= 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        async with self._capacity:
+            async with self._lock:
+                await self._acquire_token()
+            yield
+
+
+class ConditionalCache:
+    """ETag / Last-Modified 响应缓存（每个 URL 一个 JSON 文件）
+
+    Args:
+        directory: 缓存目录（None 表示 Config.get_state_dir() / http_cache）
+    """
+
+    def __init__(self, directory: str | os.PathLike[str] | None = None):
+        self.directory = Path(directory) if directory is not None else Config.get_state_dir() / HTTP_CACHE_DIRNAME
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]}.json"
+
+    def load(self, url: str) -> dict[str, Any] | None:
+        """读取缓存条目（包含 etag、last_modified、body）"""
+        try:
+            with open(self._path(url), encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"[WARNING] HTTP 缓存读取失败，忽略: {e}")
+            return None
+        return entry if isinstance(entry, dict) and entry.get("url") == url else None
+
+    def store(self, url: str, body: str, etag: str | None, last_modified: str | None) -> None:
+        """保存响应（没有校验头时不缓存，原子写入）"""
+        if not etag and not last_modified:
+            return
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"url": url, "etag": etag, "last_modified": last_modified, "body": body}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+def build_url(url: str, params: dict[str, Any] | None = None) -> str:
+    """拼接查询参数（参数顺序固定，保证缓存键稳定）"""
+    if not params:
+        return url
+    return f"{url}?{urlencode(params)}"
+
+
+class AsyncHttpClient:
+    """带连接池、按主机限速和条件请求缓存的异步 HTTP 客户端
+
+    用法::
+
+        async with AsyncHttpClient() as client:
+            text = await client.get_text("http://export.arxiv.org/api/query", params)
+
+    Args:
+        host_policies: 主机 -> HostPolicy（None 表示 DEFAULT_HOST_POLICIES）
+        cache: 条件请求缓存（None 表示默认目录，False 表示禁用）
+        pool_size: 每个主机的连接池大小
+        timeout: 单个请求超时（秒）
+        max_retries: 网络错误/5xx 的重试次数
+        session: 自定义 requests.Session（测试用）
+    """
+
+    def __init__(
+        self,
+        host_policies: dict[str, HostPolicy] | None = None,
+        cache: ConditionalCache | bool | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = 3,
+        session: requests.Session | None = None,
+    ):
+        self.host_policies = DEFAULT_HOST_POLICIES if host_policies is None else host_policies
+        self.cache: ConditionalCache | None = (
+            None if cache is False else cache if isinstance(cache, ConditionalCache) else ConditionalCache()
+        )
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._owns_session = session is None
+        self.session = session or self._create_session(pool_size)
+        self._limiters: dict[str, HostLimiter] = {}
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = DEFAULT_USER_AGENT
+        return session
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._owns_session:
+            self.session.close()
+
+    def _limiter(self, url: str) -> HostLimiter:
+        host = urlsplit(url).hostname or ""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(self.host_policies.get(host, HostPolicy()))
+            self._limiters[host] = limiter
+        return limiter
+
+    def _get_sync(self, url: str, headers: dict[str, str]) -> requests.Response:
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code >= 500 or response.status_code == 429:
+            response.raise_for_status()
+        return response
+
+    async def _get_once(self, url: str, headers: dict[str, str]) -> requests.Response:
+        async with self._limiter(url).slot():
+            return await anyio.to_thread.run_sync(self._get_sync, url, headers)
+
+    def _get_parsed_sync(self, url: str, parse: Callable[[BinaryIO], T]) -> T:
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            return parse(response.raw)
+
+    async def get_parsed(self, url: str, params: dict[str, Any] | None, parse: Callable[[BinaryIO], T]) -> T:
+        """GET 请求并在工作线程中流式解析响应体（不使用条件请求缓存）
+
+        Args:
+            url: 请求地址
+            params: 查询参数
+            parse: 解析函数，接收未解码的字节流（如传给 ElementTree.iterparse）
+
+        Returns:
+            parse 的返回值
+
+        Raises:
+            RetryError: 重试后仍然失败
+        """
+        full_url = build_url(url, params)
+
+        async def _once() -> T:
+            async with self._limiter(full_url).slot():
+                return await anyio.to_thread.run_sync(self._get_parsed_sync, full_url, parse)
+
+        return await retry_async(_once, max_retries=self.max_retries, initial_delay=1.0, backoff_factor=2.0)
+
+    async def get_text(self, url: str, params: dict[str, Any] | None = None, use_cache: bool = True) -> str:
+        """GET 请求并返回响应文本（命中 304 时返回缓存内容）
+
+        Args:
+            url: 请求地址
+            params: 查询参数
+            use_cache: 是否使用条件请求缓存
+
+        Returns:
+            响应文本
+
+        Raises:
+            RetryError: 重试后仍然失败
+            requests.HTTPError: 4xx 错误
+        """
+        full_url = build_url(url, params)
+        cache = self.cache if use_cache else None
+        cached = cache.load(full_url) if cache is not None else None
+
+        headers: dict[str, str] = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await retry_async(
+            self._get_once, full_url, headers, max_retries=self.max_retries, initial_delay=1.0, backoff_factor=2.0
+        )
+        if response.status_code == 304 and cached:
+            logger.debug(f"[HTTP] 304 未修改，使用缓存: {full_url}")
+            return str(cached.get("body", ""))
+        response.raise_for_status()
+
+        text = response.text
+        if cache is not None:
+            cache.store(full_url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return text
@@ -0,0 +1,198 @@
+"""Issue 发布器：arXiv / PubMed 监控共用的批量创建 Issue 组件
+
+- 复用一个已认证的 Github 会话（整个运行只 get_repo 一次）
+- 写操作（创建 Issue、评论）之间保持最小间隔，遵守 GitHub secondary rate limit
+  （官方建议内容创建请求之间至少间隔 1 秒，默认 2 秒，ISSUELAB_PUBLISH_INTERVAL 覆盖）
+- 遇到 403/429 滥用检测或限流响应时按 Retry-After / x-ratelimit-reset 等待后重试
+- digest 模式：把 N 条推荐合并成一个 Issue，减少 API 写入次数
+"""
+
+import os
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from issuelab.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_WRITE_INTERVAL = 2.0
+DEFAULT_MAX_RETRIES = 3
+# 没有 Retry-After 时的初始等待（秒），按 2 的幂退避
+DEFAULT_ABUSE_BACKOFF = 60.0
+MAX_RETRY_DELAY = 600.0
+
+DIGEST_SEPARATOR = "\n\n---\n\n"
+
+
+def get_write_interval(default: float = DEFAULT_WRITE_INTERVAL) -> float:
+    """读取写操作间隔（秒，环境变量 ISSUELAB_PUBLISH_INTERVAL）"""
+    raw = os.environ.get("ISSUELAB_PUBLISH_INTERVAL", "").strip()
+    try:
+        return max(0.0, float(raw)) if raw else default
+    except ValueError:
+        logger.warning(f"[WARNING] 无效的 ISSUELAB_PUBLISH_INTERVAL={raw!r}，使用默认值 {default}")
+        return default
+
+
+def retry_delay(exc: Exception, attempt: int, now: float | None = None) -> float | None:
+    """计算限流/滥用检测响应的等待时间
+
+    Args:
+        exc: GithubException（或带 status/headers/data 属性的异常）
+        attempt: 当前重试次数（从 0 开始）
+        now: 当前时间戳（测试用）
+
+    Returns:
+        等待秒数；不是限流错误（如权限不足的 403）时返回 None
+    """
+    status = getattr(exc, "status", None)
+    if status not in (403, 429):
+        return None
+    headers = {str(k).lower(): str(v) for k, v in (getattr(exc, "headers", None) or {}).items()}
+
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return min(MAX_RETRY_DELAY, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+
+    if headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+        try:
+            reset = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            reset = 0.0
+        now = time.time() if now is None else now
+        return min(MAX_RETRY_DELAY, max(1.0, reset - now))
+
+    message = str(getattr(exc, "data", "") or exc).lower()
+    if status == 429 or "secondary rate limit" in message or "abuse" in message:
+        return min(MAX_RETRY_DELAY, DEFAULT_ABUSE_BACKOFF * (2**attempt))
+    return None
+
+
+def render_digest(
+    items: Sequence[Any],
+    render_item: Callable[[int, Any], str],
+    header: str = "",
+    footer: str = "",
+) -> str:
+    """把多条推荐合并为一个 digest Issue 正文
+
+    Args:
+        items: 推荐列表
+        render_item: (序号, 条目) -> Markdown 片段（序号从 1 开始）
+        header: 正文开头
+        footer: 正文结尾
+
+    Returns:
+        Issue 正文
+    """
+    sections = DIGEST_SEPARATOR.join(render_item(i, item) for i, item in enumerate(items, 1))
+    parts = [part for part in (header.strip(), sections, footer.strip()) if part]
+    return DIGEST_SEPARATOR.join(parts) + "\n"
+
+
+class IssuePublisher:
+    """带写入节流和限流重试的 Issue 发布器
+
+    Args:
+        token: GitHub Token
+        repo_name: 仓库名（owner/repo）
+        write_interval: 写操作最小间隔（None 表示读取环境变量/默认值）
+        max_retries: 限流响应的最大重试次数
+        github: 自定义 Github 客户端（测试用）
+        sleep: 等待函数（测试用）
+        clock: 单调时钟（测试用）
+    """
+
+    def __init__(
+        self,
+        token: str,
+        repo_name: str,
+        write_interval: float | None = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        github: Any = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.repo_name = repo_name
+        self.write_interval = write_interval if write_interval is not None else get_write_interval()
+        self.max_retries = max_retries
+        self._github = github if github is not None else self._create_github(token)
+        self._repo: Any = None
+        self._sleep = sleep
+        self._clock = clock
+        self._last_write: float | None = None
+        self.writes = 0
+
+    @staticmethod
+    def _create_github(token: str) -> Any:
+        from github import Auth, Github
+
+        # 节流与重试由发布器统一处理，避免与 PyGithub 内置的等待叠加
+        return Github(auth=Auth.Token(token), retry=None, seconds_between_writes=None)
+
+    @property
+    def repo(self) -> Any:
+        if self._repo is None:
+            self._repo = self._github.get_repo(self.repo_name)
+        return self._repo
+
+    def _pace(self) -> None:
+        if self._last_write is None or self.write_interval <= 0:
+            return
+        wait = self._last_write + self.write_interval - self._clock()
+        if wait > 0:
+            self._sleep(wait)
+
+    def _write(self, action: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """执行一次写操作：节流 + 限流重试"""
+        from github import GithubException
+
+        attempt = 0
+        while True:
+            self._pace()
+            try:
+                result = func(*args, **kwargs)
+            except GithubException as e:
+                self._last_write = self._clock()
+                delay = retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                logger.warning(
+                    f"[WARNING] {action} 触发 GitHub 限流 (HTTP {e.status})，"
+                    f"{delay:.0f} 秒后重试 ({attempt}/{self.max_retries})"
+                )
+                self._sleep(delay)
+                continue
+            self._last_write = self._clock()
+            self.writes += 1
+            return result
+
+    def create_issue(self, title: str, body: str, labels: Sequence[str] | None = None) -> Any:
+        """创建 Issue"""
+        kwargs: dict[str, Any] = {"title": title, "body": body}
+        if labels:
+            kwargs["labels"] = list(labels)
+        issue = self._write("创建 Issue", self.repo.create_issue, **kwargs)
+        logger.info(f"[OK] 创建 Issue #{issue.number}: {title[:50]}")
+        return issue
+
+    def comment(self, issue: Any, body: str) -> Any:
+        """在 Issue 下发表评论"""
+        return self._write(f"评论 Issue #{issue.number}", issue.create_comment, body)
+
+    def publish(self, title: str, body: str, trigger_comment: str | None = None) -> Any:
+        """创建 Issue，并可选地发表触发评论（如 @moderator 请审核）
+
+        Returns:
+            创建的 Issue
+        """
+        issue = self.create_issue(title, body)
+        if trigger_comment:
+            self.comment(issue, trigger_comment)
+            logger.info(f"[INFO] 触发评论: {trigger_comment}")
+        return issue
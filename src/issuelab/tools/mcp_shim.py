@@ -0,0 +1,59 @@
+"""MCP 连接垫片：把 stdio 转接到 MCP 进程池的 Unix socket
+
+由 Claude CLI 作为 stdio MCP server 启动（见 issuelab.agents.mcp_pool）::
+
+    python -m issuelab.tools.mcp_shim <socket_path>
+
+只依赖标准库，保证启动开销远小于真实 MCP server。
+"""
+
+import socket
+import sys
+import threading
+from contextlib import suppress
+
+_CHUNK_SIZE = 65536
+
+
+def _pump_stdin(sock: socket.socket) -> None:
+    """stdin -> socket；stdin 关闭时半关闭 socket，通知进程池断开"""
+    stdin = sys.stdin.buffer
+    try:
+        while chunk := stdin.read1(_CHUNK_SIZE):
+            sock.sendall(chunk)
+    except OSError:
+        pass
+    finally:
+        with suppress(OSError):
+            sock.shutdown(socket.SHUT_WR)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m issuelab.tools.mcp_shim <socket_path>", file=sys.stderr)
+        return 2
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(argv[0])
+    except OSError as e:
+        print(f"[mcp_shim] 无法连接 MCP 进程池 {argv[0]}: {e}", file=sys.stderr)
+        return 1
+
+    threading.Thread(target=_pump_stdin, args=(sock,), daemon=True).start()
+
+    stdout = sys.stdout.buffer
+    try:
+        while chunk := sock.recv(_CHUNK_SIZE):
+            stdout.write(chunk)
+            stdout.flush()
+    except OSError:
+        return 1
+    finally:
+        sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+"""PubMed E-utilities 异步客户端
+
+相比逐个同步调用 esearch / esummary / efetch：
+
+- esearch 使用 history server（usehistory=y），后续请求通过 WebEnv + query_key 引用结果集，
+  不必在 URL 中传递大量 PMID
+- esummary / efetch 按 retstart/retmax 分批并发请求
+- 令牌桶限速：每秒 3 个请求，设置 NCBI_API_KEY 后每秒 10 个
+- efetch 的 XML 在工作线程中用 ElementTree.iterparse 流式解析，逐篇释放元素
+"""
+
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO
+
+import anyio
+
+from issuelab.logging_config import get_logger
+from issuelab.tools.http_client import DEFAULT_HOST_POLICIES, AsyncHttpClient, HostPolicy
+
+logger = get_logger(__name__)
+
+EUTILS_BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+EUTILS_HOST = "eutils.ncbi.nlm.nih.gov"
+DEFAULT_BATCH_SIZE = 200
+TOOL_NAME = "issuelab"
+
+
+def get_api_key() -> str | None:
+    """读取 NCBI API key（环境变量 NCBI_API_KEY，空值视为未设置）"""
+    return os.environ.get("NCBI_API_KEY", "").strip() or None
+
+
+def ncbi_host_policy(api_key: str | None) -> HostPolicy:
+    """NCBI 限速策略：无 key 每秒 3 个请求，有 key 每秒 10 个
+
+    burst 固定为 1：令牌桶容量为 rate 时，首秒可发出约 2×rate 个请求（满桶 + 补充），
+    会超出 NCBI 的每秒上限。
+    """
+    rate = 10 if api_key else 3
+    return HostPolicy(min_interval=1.0 / rate, max_concurrency=rate, burst=1)
+
+
+def parse_pubmed_date(date_str: str) -> str:
+    """解析 PubMed 日期格式"""
+    if not date_str:
+        return "Unknown"
+    raw = date_str.strip()
+
+    # 移除常见的附加信息（如 Epub/doi/Online ahead of print）
+    raw = re.split(r";|\s+Epub\b|\s+doi:\b|\s+Online ahead of print\b", raw, maxsplit=1)[0].strip()
+    raw = raw.rstrip(".")
+
+    # PubMed 常见格式: "2024 Jan 15", "2024 Jan", "2024/01/15", "2024-01-15"
+    for fmt in ("%Y %b %d", "%Y %B %d", "%Y/%m/%d", "%Y-%m-%d"):
+        try:
+            dt = datetime.strptime(raw, fmt)
+            return dt.strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+
+    # 只有年月
+    month_match = re.match(r"^(\d{4})\s+([A-Za-z]{3,})$", raw)
+    if month_match:
+        year = month_match.group(1)
+        month = month_match.group(2)
+        for fmt in ("%Y %b %d", "%Y %B %d"):
+            try:
+                dt = datetime.strptime(f"{year} {month} 01", fmt)
+                return dt.strftime("%Y-%m-%d")
+            except ValueError:
+                continue
+
+    # 只有年份
+    if re.match(r"^\d{4}$", raw):
+        return f"{raw}-01-01"
+
+    return date_str[:10] if date_str else "Unknown"
+
+
+def clean_text(text: str) -> str:
+    """清理文本中的多余空白"""
+    if not text:
+        return ""
+    return re.sub(r"\s+", " ", text).strip().strip(".")
+
+
+def parse_efetch_stream(stream: BinaryIO) -> dict[str, dict[str, str]]:
+    """流式解析 efetch XML，提取每篇文献的 DOI
+
+    Args:
+        stream: efetch 响应字节流
+
+    Returns:
+        PMID -> {"doi": ...}
+    """
+    result: dict[str, dict[str, str]] = {}
+    for _event, elem in ET.iterparse(stream, events=("end",)):
+        if elem.tag != "PubmedArticle":
+            continue
+        pmid = elem.findtext("MedlineCitation/PMID") or elem.findtext(".//PMID")
+        if pmid:
+            # 只看文献自身的 ArticleIdList（ReferenceList 中也有 ArticleId）
+            doi = ""
+            for article_id in elem.iterfind("PubmedData/ArticleIdList/ArticleId"):
+                if article_id.get("IdType") == "doi" and article_id.text:
+                    doi = article_id.text.strip()
+                    break
+            if not doi:
+                doi = (elem.findtext(".//ELocationID[@EIdType='doi']") or "").strip()
+            result[pmid.strip()] = {"doi": doi}
+        elem.clear()
+    return result
+
+
+@dataclass
+class SearchHistory:
+    """esearch 在 history server 上的结果集"""
+
+    count: int
+    webenv: str
+    query_key: str
+
+
+class PubMedClient:
+    """PubMed E-utilities 异步客户端
+
+    Args:
+        email: 联系邮箱（NCBI 要求）
+        api_key: NCBI API key（None 表示读取环境变量 NCBI_API_KEY）
+        http: HTTP 客户端（None 表示按 NCBI 限速策略新建）
+        batch_size: esummary / efetch 每批文献数
+    """
+
+    def __init__(
+        self,
+        email: str,
+        api_key: str | None = None,
+        http: AsyncHttpClient | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.email = email
+        self.api_key = api_key if api_key is not None else get_api_key()
+        self.batch_size = max(1, batch_size)
+        self.http = http or AsyncHttpClient(
+            host_policies={**DEFAULT_HOST_POLICIES, EUTILS_HOST: ncbi_host_policy(self.api_key)},
+            cache=False,
+        )
+
+    async def __aenter__(self) -> "PubMedClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.http.__aexit__(*exc_info)
+
+    def _params(self, **params: Any) -> dict[str, Any]:
+        base: dict[str, Any] = {"db": "pubmed", "tool": TOOL_NAME, "email": self.email}
+        if self.api_key:
+            base["api_key"] = self.api_key
+        base.update(params)
+        return base
+
+    async def search(
+        self,
+        query: str,
+        mindate: str | None = None,
+        maxdate: str | None = None,
+        datetype: str = "pdat",
+    ) -> SearchHistory:
+        """检索并把结果集保存到 history server（按出版日期倒序）
+
+        Args:
+            query: 检索词
+            mindate: 开始日期 (YYYY/MM/DD)
+            maxdate: 结束日期
+            datetype: 日期类型 (pdat=出版日期)
+
+        Returns:
+            SearchHistory
+        """
+        params = self._params(term=query, usehistory="y", retmax=0, retmode="json", datetype=datetype, sort="pub date")
+        if mindate:
+            params["mindate"] = mindate
+        if maxdate:
+            params["maxdate"] = maxdate
+
+        data = json.loads(await self.http.get_text(f"{EUTILS_BASE_URL}/esearch.fcgi", params, use_cache=False))
+        result = data.get("esearchresult", {})
+        return SearchHistory(
+            count=int(result.get("count", 0) or 0),
+            webenv=str(result.get("webenv", "")),
+            query_key=str(result.get("querykey", "")),
+        )
+
+    def _batches(self, total: int) -> list[tuple[int, int]]:
+        return [(start, min(self.batch_size, total - start)) for start in range(0, total, self.batch_size)]
+
+    async def _summary_batch(self, history: SearchHistory, start: int, size: int) -> tuple[list[str], dict]:
+        params = self._params(
+            WebEnv=history.webenv, query_key=history.query_key, retstart=start, retmax=size, retmode="json"
+        )
+        data = json.loads(await self.http.get_text(f"{EUTILS_BASE_URL}/esummary.fcgi", params, use_cache=False))
+        result = data.get("result", {})
+        return [str(uid) for uid in result.get("uids", [])], result
+
+    async def _efetch_batch(self, history: SearchHistory, start: int, size: int) -> dict[str, dict[str, str]]:
+        params = self._params(
+            WebEnv=history.webenv,
+            query_key=history.query_key,
+            retstart=start,
+            retmax=size,
+            retmode="xml",
+            rettype="abstract",
+        )
+        return await self.http.get_parsed(f"{EUTILS_BASE_URL}/efetch.fcgi", params, parse_efetch_stream)
+
+    async def fetch_records(
+        self, history: SearchHistory, limit: int
+    ) -> tuple[list[str], dict[str, dict], dict[str, dict[str, str]]]:
+        """分批并发获取结果集前 limit 篇的 esummary 详情与 efetch DOI
+
+        单个批次失败只记录日志，返回其余批次的结果。
+
+        Returns:
+            (按检索顺序排列的 PMID, PMID -> esummary 详情, PMID -> {"doi": ...})
+        """
+        batches = self._batches(min(history.count, limit))
+        summaries: list[tuple[list[str], dict] | None] = [None] * len(batches)
+        details: dict[str, dict[str, str]] = {}
+
+        async def _summary(index: int, start: int, size: int) -> None:
+            try:
+                summaries[index] = await self._summary_batch(history, start, size)
+            except Exception as e:
+                logger.error(f"PubMed summary failed (retstart={start}): {e}")
+
+        async def _efetch(start: int, size: int) -> None:
+            try:
+                details.update(await self._efetch_batch(history, start, size))
+            except Exception as e:
+                logger.error(f"PubMed efetch failed (retstart={start}): {e}")
+
+        async with anyio.create_task_group() as tg:
+            for index, (start, size) in enumerate(batches):
+                tg.start_soon(_summary, index, start, size)
+                tg.start_soon(_efetch, start, size)
+
+        uids: list[str] = []
+        docs: dict[str, dict] = {}
+        for item in summaries:
+            if item is None:
+                continue
+            batch_uids, result = item
+            uids.extend(batch_uids)
+            docs.update({uid: result[uid] for uid in batch_uids if isinstance(result.get(uid), dict)})
+        return uids, docs, details
+
+
+def build_paper(uid: str, doc: dict[str, Any], efetch_data: dict[str, dict[str, str]]) -> dict[str, Any]:
+    """把 esummary 详情与 efetch 数据组装为论文字典"""
+    authors = ", ".join(a.get("name", "") for a in doc.get("authors", [])[:5])
+    if len(doc.get("authors", [])) > 5:
+        authors += f" 等 {len(doc['authors'])} 位作者"
+
+    keywords = doc.get("keywords", [])
+    # 获取 DOI (优先使用 efetch 结果)
+    doi = efetch_data.get(uid, {}).get("doi", "") or doc.get("doi", "")
+
+    return {
+        "pmid": uid,
+        "title": clean_text(doc.get("title", "")),
+        "journal": doc.get("source", ""),
+        "pubdate": parse_pubmed_date(doc.get("pubdate", "")),
+        "epubdate": parse_pubmed_date(doc.get("epubdate", "")),
+        "entrezdate": parse_pubmed_date(doc.get("entrezdate", "") or doc.get("sortdate", "")),
+        "authors": authors,
+        "doi": doi,
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{uid}/",
+        "keywords": keywords if isinstance(keywords, list) else [],
+        "has_abstract": doc.get("hasabstract", 0),
+    }
+
+
+async def fetch_papers_async(
+    query: str,
+    email: str,
+    days: int = 7,
+    max_papers: int = 20,
+    client: PubMedClient | None = None,
+) -> list[dict[str, Any]]:
+    """获取最近 days 天出版的 PubMed 新文献
+
+    Args:
+        query: 检索词
+        email: 联系邮箱
+        days: 追溯天数
+        max_papers: 最大文献数
+        client: PubMed 客户端（None 表示新建并在结束时关闭）
+
+    Returns:
+        按出版日期倒序排列的文献列表
+    """
+    end_date = datetime.now().strftime("%Y/%m/%d")
+    start_date = (datetime.now() - timedelta(days=days)).strftime("%Y/%m/%d")
+    logger.info(f"检索词: {query}")
+    logger.info(f"时间范围: {start_date} - {end_date}")
+
+    pubmed = client or PubMedClient(email)
+    try:
+        try:
+            history = await pubmed.search(query, mindate=start_date, maxdate=end_date, datetype="pdat")
+        except Exception as e:
+            logger.error(f"PubMed search failed: {e}")
+            return []
+
+        if history.count == 0 or not history.webenv:
+            logger.info("未找到新文献")
+            return []
+        logger.info(f"发现 {history.count} 篇候选文献")
+
+        # 多取一些供筛选
+        uids, docs, efetch_data = await pubmed.fetch_records(history, max_papers * 2)
+    finally:
+        if client is None:
+            await pubmed.__aexit__(None, None, None)
+
+    papers = [build_paper(uid, docs[uid], efetch_data) for uid in uids if uid in docs]
+    # 按日期排序（最新的在前）
+    papers.sort(key=lambda x: x.get("pubdate", ""), reverse=True)
+    return papers[:max_papers]
+
+
+def fetch_papers(query: str, email: str, days: int = 7, max_papers: int = 20) -> list[dict[str, Any]]:
+    """fetch_papers_async 的同步入口"""
+    return anyio.run(fetch_papers_async, query, email, days, max_papers)
@@ -0,0 +1,80 @@
+"""统一的 YAML 读写入口
+
+- 优先使用 libyaml 的 CSafeLoader / CSafeDumper，不可用时回退到纯 Python 实现
+- safe_load_file 按 (路径, mtime, size) 缓存解析结果，配置文件未变化时不重复解析
+
+所有模块读取 YAML 都应通过本模块，避免各处直接调用 yaml.safe_load。
+"""
+
+import copy
+import os
+from pathlib import Path
+from typing import IO, Any
+
+import yaml
+
+SafeLoader: type = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+SafeDumper: type = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+HAS_LIBYAML = SafeLoader is not yaml.SafeLoader
+
+YAMLError = yaml.YAMLError
+
+# path -> ((mtime_ns, size), data)
+_FILE_CACHE: dict[str, tuple[tuple[int, int], Any]] = {}
+
+
+def safe_load(stream: str | bytes | IO[Any]) -> Any:
+    """安全解析 YAML（等价于 yaml.safe_load，优先使用 C 实现）
+
+    Args:
+        stream: YAML 文本或文件对象
+
+    Returns:
+        解析结果
+    """
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data: Any, stream: IO[str] | None = None, **kwargs: Any) -> str | None:
+    """安全序列化 YAML（等价于 yaml.safe_dump，优先使用 C 实现）"""
+    kwargs.setdefault("allow_unicode", True)
+    kwargs.setdefault("sort_keys", False)
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+def safe_load_file(path: str | os.PathLike[str]) -> Any:
+    """读取并解析 YAML 文件（按 mtime 与文件大小缓存）
+
+    返回值是缓存的深拷贝，调用方可以放心修改。
+
+    Args:
+        path: YAML 文件路径
+
+    Returns:
+        解析结果
+
+    Raises:
+        FileNotFoundError: 文件不存在
+        yaml.YAMLError: YAML 格式错误
+    """
+    key = os.fspath(path)
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _FILE_CACHE.get(key)
+    if cached is not None and cached[0] == signature:
+        return copy.deepcopy(cached[1])
+
+    with open(key, encoding="utf-8") as f:
+        data = safe_load(f)
+
+    _FILE_CACHE[key] = (signature, data)
+    return copy.deepcopy(data)
+
+
+def clear_yaml_cache(path: str | os.PathLike[str] | Path | None = None) -> None:
+    """清除 safe_load_file 的缓存（path 为 None 时清空全部）"""
+    if path is None:
+        _FILE_CACHE.clear()
+    else:
+        _FILE_CACHE.pop(os.fspath(path), None)
@@ -186,3 +186,31 @@ def test_builtin_prompt_can_be_overridden_by_agents_dir(tmp_path, monkeypatch):
     assert "moderator" in agents
     assert "from agents" in agents["moderator"]["prompt"]
     assert agents["moderator"]["description"] == "from-agents"
+
+
+def test_agent_matrix_markdown_is_cached_by_signature(tmp_path, monkeypatch):
+    """Agent 矩阵按 discovery 签名缓存，prompt 文件变化后重新渲染"""
+    import os
+
+    from issuelab.agents import discovery as discovery_mod
+
+    prompts_dir = tmp_path / "prompts"
+    prompts_dir.mkdir()
+    prompt_file = prompts_dir / "moderator.md"
+    prompt_file.write_text("---\nagent: moderator\ndescription: v1\n---\nbody", encoding="utf-8")
+
+    monkeypatch.setattr(discovery_mod, "PROMPTS_DIR", prompts_dir)
+    monkeypatch.setattr(discovery_mod, "AGENTS_DIR", tmp_path / "agents")
+    monkeypatch.setattr(discovery_mod, "_CACHED_AGENTS", None)
+    monkeypatch.setattr(discovery_mod, "_CACHED_SIGNATURE", None)
+    monkeypatch.setattr(discovery_mod, "_CACHED_MATRIX", None)
+
+    first = discovery_mod.get_agent_matrix_markdown()
+    assert "v1" in first
+    assert discovery_mod.get_agent_matrix_markdown() is first
+
+    prompt_file.write_text("---\nagent: moderator\ndescription: v2\n---\nbody", encoding="utf-8")
+    stat = prompt_file.stat()
+    os.utime(prompt_file, (stat.st_atime, stat.st_mtime + 10))
+
+    assert "v2" in discovery_mod.get_agent_matrix_markdown()
@@ -0,0 +1,137 @@
+"""测试异步 arXiv 获取与 HTTP 客户端"""
+
+from datetime import UTC, datetime
+
+from issuelab.tools.arxiv import build_search_query, fetch_papers_async, parse_feed
+from issuelab.tools.http_client import AsyncHttpClient, ConditionalCache, HostPolicy
+
+FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:arxiv="http://arxiv.org/schemas/atom">
+  <entry>
+    <id>http://arxiv.org/abs/2601.00002v1</id>
+    <published>2026-01-05T10:00:00Z</published>
+    <title>New  Paper</title>
+    <summary>Summary text.</summary>
+    <author><name>Alice</name></author>
+    <arxiv:primary_category term="stat.ML"/>
+    <category term="stat.ML"/>
+    <category term="cs.LG"/>
+  </entry>
+  <entry>
+    <id>http://arxiv.org/abs/2601.00001v1</id>
+    <published>2025-12-20T10:00:00Z</published>
+    <title>Old Paper</title>
+    <summary>Old.</summary>
+    <arxiv:primary_category term="cs.AI"/>
+  </entry>
+</feed>
+"""
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, text="", headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    """按顺序返回预设响应，记录请求"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, dict(headers or {})))
+        return self.responses.pop(0)
+
+
+def _client(session, tmp_path, **kwargs):
+    return AsyncHttpClient(
+        host_policies={},
+        cache=ConditionalCache(tmp_path / "http_cache"),
+        session=session,
+        max_retries=0,
+        **kwargs,
+    )
+
+
+class TestBuildSearchQuery:
+    """测试查询构建"""
+
+    def test_or_categories_with_date_range(self):
+        query = build_search_query(
+            ["cs.AI", "cs.LG"], datetime(2026, 1, 1, 8, 30, tzinfo=UTC), datetime(2026, 1, 8, 1, 0, tzinfo=UTC)
+        )
+
+        assert query == "(cat:cs.AI OR cat:cs.LG) AND submittedDate:[202601010000 TO 202601082359]"
+        assert build_search_query(["cs.AI"]) == "cat:cs.AI"
+
+
+class TestParseFeed:
+    """测试 Atom 解析"""
+
+    def test_filters_old_entries_and_maps_category(self):
+        since = datetime(2026, 1, 1, tzinfo=UTC).timestamp()
+
+        papers = parse_feed(FEED, ["cs.AI", "cs.LG"], since)
+
+        assert [p["id"] for p in papers] == ["2601.00002v1"]
+        assert papers[0]["title"] == "New Paper"
+        assert papers[0]["category"] == "cs.LG"
+        assert papers[0]["published"] == "2026-01-05"
+
+
+class TestFetchPapersAsync:
+    """测试单次 OR 查询与条件请求"""
+
+    async def test_single_request_for_all_categories(self, tmp_path):
+        session = FakeSession([FakeResponse(text=FEED)])
+
+        async with _client(session, tmp_path) as client:
+            papers = await fetch_papers_async(["cs.AI", "cs.LG", "cs.CL"], "2026-01-01T00:00:00Z", 5, client=client)
+
+        assert len(session.requests) == 1
+        url = session.requests[0][0]
+        assert "cat%3Acs.AI+OR+cat%3Acs.LG+OR+cat%3Acs.CL" in url
+        assert "max_results=5" in url
+        assert [p["id"] for p in papers] == ["2601.00002v1"]
+
+    async def test_not_modified_reuses_cached_body(self, tmp_path):
+        session = FakeSession([FakeResponse(text=FEED, headers={"ETag": '"v1"'}), FakeResponse(status_code=304)])
+        now = datetime(2026, 1, 8, tzinfo=UTC)
+
+        async with _client(session, tmp_path) as client:
+            first = await fetch_papers_async(["cs.LG"], "2026-01-01T00:00:00Z", 5, client=client, now=now)
+            second = await fetch_papers_async(["cs.LG"], "2026-01-01T00:00:00Z", 5, client=client, now=now)
+
+        assert session.requests[1][1] == {"If-None-Match": '"v1"'}
+        assert first == second
+        assert len(second) == 1
+
+
+class TestHostPolicy:
+    """测试按主机限速"""
+
+    async def test_min_interval_between_requests(self, tmp_path):
+        import anyio
+
+        session = FakeSession([FakeResponse(text="a"), FakeResponse(text="b")])
+        client = AsyncHttpClient(
+            host_policies={"example.org": HostPolicy(min_interval=0.2, max_concurrency=1)},
+            cache=False,
+            session=session,
+            max_retries=0,
+        )
+
+        start = anyio.current_time()
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(client.get_text, "https://example.org/a")
+            tg.start_soon(client.get_text, "https://example.org/b")
+
+        assert anyio.current_time() - start >= 0.2
@@ -0,0 +1,184 @@
+"""测试 @mention 级联控制（深度上限、环路检测、扇出预算）"""
+
+from unittest.mock import Mock, patch
+
+POLICY = {"blacklist": [], "cascade": {"enabled": True, "max_depth": 2, "max_fanout_per_issue": 4}}
+
+
+class TestCascadeContext:
+    """测试级联上下文的创建与传递"""
+
+    def test_from_env_creates_root_when_missing(self):
+        from issuelab.cascade import CascadeContext
+
+        ctx = CascadeContext.from_env("moderator", POLICY, environ={})
+
+        assert ctx.cascade_id
+        assert ctx.depth == 0
+        assert ctx.chain == ["moderator"]
+        assert ctx.budget == 4
+
+    def test_from_env_reads_propagated_context(self):
+        from issuelab.cascade import CascadeContext
+
+        env = {
+            "ISSUELAB_CASCADE_ID": "abc",
+            "ISSUELAB_CASCADE_DEPTH": "1",
+            "ISSUELAB_CASCADE_CHAIN": "moderator,reviewer_a",
+            "ISSUELAB_CASCADE_BUDGET": "2",
+        }
+        ctx = CascadeContext.from_env("reviewer_a", POLICY, environ=env)
+
+        assert ctx.cascade_id == "abc"
+        assert ctx.depth == 1
+        assert ctx.chain == ["moderator", "reviewer_a"]
+        assert ctx.budget == 2
+
+    def test_payload_roundtrip(self):
+        from issuelab.cascade import CascadeContext
+
+        ctx = CascadeContext("abc", depth=2, chain=["a", "b"], budget=3)
+        payload = ctx.to_payload()
+
+        assert all(isinstance(v, str) for v in payload.values())
+        assert CascadeContext.from_mapping(payload) == ctx
+        assert CascadeContext.from_mapping({"cascade_id": ""}) is None
+
+
+class TestPlanCascade:
+    """测试级联限制规则"""
+
+    def test_cycle_is_blocked(self):
+        from issuelab.cascade import CascadeContext, plan_cascade
+
+        ctx = CascadeContext("abc", depth=1, chain=["moderator", "reviewer_a"], budget=4)
+        children, blocked = plan_cascade(["Moderator", "reviewer_b"], ctx, POLICY)
+
+        assert blocked == {"Moderator": "cycle"}
+        assert list(children) == ["reviewer_b"]
+        assert children["reviewer_b"].depth == 2
+        assert children["reviewer_b"].chain == ["moderator", "reviewer_a", "reviewer_b"]
+
+    def test_max_depth_blocks_everything(self):
+        from issuelab.cascade import CascadeContext, plan_cascade
+
+        ctx = CascadeContext("abc", depth=2, chain=["a", "b", "c"], budget=4)
+        children, blocked = plan_cascade(["reviewer_a", "reviewer_b"], ctx, POLICY)
+
+        assert children == {}
+        assert blocked == {"reviewer_a": "max_depth", "reviewer_b": "max_depth"}
+
+    def test_budget_limits_fanout_and_is_split(self):
+        from issuelab.cascade import CascadeContext, plan_cascade
+
+        ctx = CascadeContext("abc", depth=0, chain=["moderator"], budget=4)
+        children, blocked = plan_cascade(["a", "b", "c", "d", "e"], ctx, POLICY)
+
+        assert list(children) == ["a", "b", "c", "d"]
+        assert blocked == {"e": "fanout_budget"}
+        # 预算全部用于本层，子节点不能继续扇出
+        assert sum(child.budget for child in children.values()) == 0
+
+    def test_remaining_budget_distributed_to_children(self):
+        from issuelab.cascade import CascadeContext, plan_cascade
+
+        ctx = CascadeContext("abc", depth=0, chain=["moderator"], budget=4)
+        children, blocked = plan_cascade(["a"], ctx, POLICY)
+
+        assert blocked == {}
+        assert children["a"].budget == 3
+
+    def test_disabled_policy_allows_all(self):
+        from issuelab.cascade import CascadeContext, plan_cascade
+
+        policy = {"cascade": {"enabled": False}}
+        ctx = CascadeContext("abc", depth=10, chain=["a"], budget=0)
+        children, blocked = plan_cascade(["a", "b"], ctx, policy)
+
+        assert blocked == {}
+        assert list(children) == ["a", "b"]
+
+
+class TestCascadeTrigger:
+    """测试级联上下文在触发链路中的传递"""
+
+    @patch("issuelab.observer_trigger.auto_trigger_agent")
+    def test_trigger_mentioned_agents_blocks_cycle(self, mock_trigger):
+        from issuelab.cascade import CascadeContext
+        from issuelab.response_processor import trigger_mentioned_agents
+
+        mock_trigger.return_value = True
+        response = """```yaml
+summary: "Test"
+mentions:
+  - moderator
+  - reviewer_a
+```"""
+        ctx = CascadeContext("abc", depth=0, chain=["moderator"], budget=4)
+        results, allowed, filtered = trigger_mentioned_agents(response, 1, "T", "B", policy=POLICY, cascade=ctx)
+
+        assert results == {"reviewer_a": True}
+        assert allowed == ["reviewer_a"]
+        assert filtered == ["moderator"]
+        child = mock_trigger.call_args.kwargs["cascade"]
+        assert child.cascade_id == "abc"
+        assert child.depth == 1
+
+    @patch("subprocess.run")
+    def test_builtin_trigger_passes_cascade_inputs(self, mock_run):
+        from issuelab.cascade import CascadeContext
+        from issuelab.observer_trigger import trigger_builtin_agent
+
+        mock_run.return_value = Mock(returncode=0)
+        trigger_builtin_agent("moderator", 7, cascade=CascadeContext("abc", depth=1, chain=["echo", "moderator"]))
+
+        args = mock_run.call_args[0][0]
+        assert "cascade_id=abc" in args
+        assert "cascade_depth=1" in args
+        assert "cascade_chain=echo,moderator" in args
+
+    def test_dispatch_adds_cascade_to_client_payload(self, monkeypatch, tmp_path):
+        from issuelab.cli import dispatch
+
+        agent_dir = tmp_path / "alice"
+        agent_dir.mkdir()
+        (agent_dir / "agent.yml").write_text(
+            'owner: alice\nrepository: "alice/IssueLab"\ndispatch_mode: repository_dispatch\n', encoding="utf-8"
+        )
+        monkeypatch.setenv("GITHUB_APP_ID", "id")
+        monkeypatch.setenv("GITHUB_APP_PRIVATE_KEY", "key")
+        monkeypatch.setattr(dispatch, "get_token_for_repository", lambda *a, **k: "token")
+        captured = {}
+
+        def fake_dispatch_event(repository, event_type, payload, token):
+            captured.update(payload)
+            return True, ""
+
+        monkeypatch.setattr(dispatch, "dispatch_event", fake_dispatch_event)
+
+        exit_code = dispatch.main(
+            [
+                "--mentions",
+                "alice",
+                "--agents-dir",
+                str(tmp_path),
+                "--source-repo",
+                "gqy20/IssueLab",
+                "--issue-number",
+                "3",
+                "--cascade-id",
+                "abc",
+                "--cascade-depth",
+                "2",
+                "--cascade-chain",
+                "moderator,alice",
+                "--cascade-budget",
+                "1",
+            ]
+        )
+
+        assert exit_code == 0
+        assert captured["cascade_id"] == "abc"
+        assert captured["cascade_depth"] == "2"
+        assert captured["cascade_chain"] == "moderator,alice"
+        assert captured["cascade_budget"] == "1"
@@ -61,7 +61,7 @@ class TestParseMentions:
         @alice can you review this?
 
         ```python
-        # This @bob is in code, but will be matched
+        # This @bob is in code, and will be skipped
         print("test")
         ```
 
@@ -69,7 +69,7 @@ class TestParseMentions:
         """
         mentions = parse_github_mentions(text)
         assert "alice" in mentions
-        assert "bob" in mentions
+        assert "bob" not in mentions
         assert "charlie" in mentions
 
 
@@ -0,0 +1,64 @@
+"""测试协作配置与协作指南缓存"""
+
+import os
+
+import pytest
+
+from issuelab import collaboration
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "collaboration.yml"
+    path.write_text(
+        'collaboration:\n  enabled: true\n  guidelines_template: "agents:\\n{available_agents}"\n',
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(collaboration, "_find_config_file", lambda: path)
+    monkeypatch.setattr(collaboration, "_CONFIG_CACHE", None)
+    monkeypatch.setattr(collaboration, "_GUIDELINES_CACHE", {})
+    return path
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    original = collaboration._parse_collaboration_config
+
+    def counting(config_file):
+        calls.append(config_file)
+        return original(config_file)
+
+    monkeypatch.setattr(collaboration, "_parse_collaboration_config", counting)
+    return calls
+
+
+class TestCollaborationCache:
+    """测试按 mtime 缓存配置与指南"""
+
+    def test_config_parsed_once_until_file_changes(self, config_file, monkeypatch):
+        calls = _count_parses(monkeypatch)
+
+        first = collaboration.load_collaboration_config()
+        first["enabled"] = False  # 返回副本，修改不影响缓存
+        assert collaboration.load_collaboration_config()["enabled"] is True
+        assert len(calls) == 1
+
+        config_file.write_text("collaboration:\n  enabled: false\n", encoding="utf-8")
+        stat = config_file.stat()
+        os.utime(config_file, (stat.st_atime, stat.st_mtime + 10))
+
+        assert collaboration.load_collaboration_config()["enabled"] is False
+        assert len(calls) == 2
+
+    def test_guidelines_memoized_by_inputs(self, config_file, monkeypatch):
+        agents = {"moderator": {"description": "审核"}}
+
+        first = collaboration.build_collaboration_guidelines(agents)
+        assert "@moderator（审核）" in first
+
+        monkeypatch.setattr(collaboration, "_parse_collaboration_config", lambda f: pytest.fail("re-parsed"))
+        assert collaboration.build_collaboration_guidelines(agents) is first
+
+        changed = collaboration.build_collaboration_guidelines({"moderator": {"description": "新描述"}})
+        assert "@moderator（新描述）" in changed
+        assert collaboration.build_collaboration_guidelines(agents, available_agents_placeholder="X") == "agents:\nX"
@@ -1,9 +1,11 @@
 """测试 GitHub 工具"""
 
+import subprocess
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
-from issuelab.tools.github import get_issue_info, post_comment, update_label
+from issuelab.tools.github import aget_issue_info, apost_comment, get_issue_info, post_comment, update_label
 
 
 def test_get_issue_info():
@@ -70,6 +72,53 @@ confidence: "high"
     assert last_line == "相关人员: @arxiv_observer @gqy22"
 
 
+async def test_async_issue_info_and_comment(monkeypatch):
+    """异步版本与同步版本使用相同的 gh 命令与解析逻辑"""
+    calls = []
+
+    async def fake_run_process(cmd, check, env):
+        calls.append(cmd)
+        if cmd[:3] == ["gh", "issue", "view"]:
+            stdout = b'{"number":1,"title":"t","body":"b","comments":[{"author":{"login":"u"},"body":"hi"}]}'
+            return subprocess.CompletedProcess(cmd, 0, stdout, b"")
+        body_file = cmd[cmd.index("--body-file") + 1]
+        assert Path(body_file).read_text(encoding="utf-8").startswith("评论")
+        return subprocess.CompletedProcess(cmd, 1, b"", b"rate limited")
+
+    monkeypatch.setattr("anyio.run_process", fake_run_process)
+
+    info = await aget_issue_info(1, format_comments=True, repo="o/r")
+    posted = await apost_comment(1, "评论内容")
+
+    assert info["comment_count"] == 1
+    assert "**[u]**" in info["comments"]
+    assert calls[0][-2:] == ["--repo", "o/r"]
+    assert posted is False
+    assert not Path(calls[1][calls[1].index("--body-file") + 1]).exists()
+
+
+async def test_async_issue_info_retries_transient_errors(monkeypatch):
+    """异步版本与同步版本一样重试 gh 的临时错误"""
+    attempts = []
+
+    async def fake_run_process(cmd, check, env):
+        attempts.append(cmd)
+        if len(attempts) == 1:
+            return subprocess.CompletedProcess(cmd, 1, b"", b"502 Bad Gateway")
+        return subprocess.CompletedProcess(cmd, 0, b'{"number":1,"title":"t","body":"b"}', b"")
+
+    async def no_sleep(delay):
+        return None
+
+    monkeypatch.setattr("anyio.run_process", fake_run_process)
+    monkeypatch.setattr("issuelab.retry.asyncio", SimpleNamespace(sleep=no_sleep))
+
+    info = await aget_issue_info(1)
+
+    assert info["title"] == "t"
+    assert len(attempts) == 2
+
+
 def test_update_label():
     """测试更新标签"""
     with patch("issuelab.tools.github.subprocess.run") as mock_run:
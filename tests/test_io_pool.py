@@ -0,0 +1,70 @@
+"""测试共享 I/O 线程池"""
+
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from issuelab.agents.io_pool import arun_blocking, get_io_executor, run_blocking, run_coroutine
+
+
+class TestRunBlocking:
+    """测试共享线程池"""
+
+    def test_reuses_one_executor(self):
+        names = {run_blocking(lambda: threading.current_thread().name) for _ in range(5)}
+
+        assert get_io_executor() is get_io_executor()
+        assert all(name.startswith("issuelab-io") for name in names)
+
+    def test_timeout_raises(self):
+        with pytest.raises(TimeoutError):
+            run_blocking(time.sleep, 0.5, timeout=0.01)
+
+    async def test_async_variant(self):
+        assert await arun_blocking(lambda a, b=0: a + b, 1, b=2) == 3
+        with pytest.raises(TimeoutError):
+            await arun_blocking(time.sleep, 0.5, timeout=0.01)
+
+
+class TestRunCoroutine:
+    """测试后台事件循环"""
+
+    def test_timeout_cancels_coroutine(self):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(TimeoutError):
+            run_coroutine(slow(), timeout=0.05)
+        assert cancelled.wait(2)
+
+    async def test_usable_inside_running_loop(self):
+        async def answer():
+            return 42
+
+        assert run_coroutine(answer(), timeout=2) == 42
+
+
+class TestAsyncOptionsLoaders:
+    """测试 options 的异步加载函数"""
+
+    async def test_async_mcp_loader_matches_sync(self, tmp_path):
+        from issuelab.agents.options import aload_mcp_servers_for_agent, load_mcp_servers_for_agent
+
+        (tmp_path / ".mcp.json").write_text(json.dumps({"mcpServers": {"a": {"type": "http"}}}), encoding="utf-8")
+        agent_dir = tmp_path / "agents" / "alice"
+        agent_dir.mkdir(parents=True)
+        (agent_dir / ".mcp.json").write_text(json.dumps({"b": {"command": "x"}}), encoding="utf-8")
+
+        expected = load_mcp_servers_for_agent("alice", root_dir=tmp_path)
+
+        assert await aload_mcp_servers_for_agent("alice", root_dir=tmp_path) == expected
+        assert set(expected) == {"a", "b"}
@@ -0,0 +1,116 @@
+"""测试 Issue 发布器"""
+
+from types import SimpleNamespace
+
+import pytest
+from github import GithubException
+
+from issuelab.tools.issue_publisher import IssuePublisher, render_digest, retry_delay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeRepo:
+    """按顺序抛出预设异常，之后正常创建 Issue"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.created = []
+        self.comments = []
+
+    def create_issue(self, title, body, labels=None):
+        if self.errors:
+            raise self.errors.pop(0)
+        issue = SimpleNamespace(number=len(self.created) + 1, title=title)
+        issue.create_comment = lambda text: self.comments.append((issue.number, text))
+        self.created.append((title, body))
+        return issue
+
+
+def _publisher(repo, clock, interval=2.0):
+    github = SimpleNamespace(get_repo=lambda name: repo)
+    return IssuePublisher("t", "o/r", write_interval=interval, github=github, sleep=clock.sleep, clock=clock)
+
+
+def _secondary_limit(headers=None):
+    return GithubException(403, {"message": "You have exceeded a secondary rate limit"}, headers or {})
+
+
+class TestRetryDelay:
+    """测试限流响应识别"""
+
+    def test_retry_after_header(self):
+        assert retry_delay(_secondary_limit({"Retry-After": "5"}), attempt=0) == 5.0
+
+    def test_rate_limit_reset(self):
+        exc = GithubException(
+            403, {"message": "API rate limit exceeded"}, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "130"}
+        )
+
+        assert retry_delay(exc, attempt=0, now=100.0) == 30.0
+
+    def test_secondary_limit_backs_off_exponentially(self):
+        assert retry_delay(_secondary_limit(), attempt=0) == 60.0
+        assert retry_delay(_secondary_limit(), attempt=1) == 120.0
+
+    def test_plain_forbidden_is_not_retried(self):
+        assert retry_delay(GithubException(403, {"message": "Resource not accessible"}, {}), attempt=0) is None
+        assert retry_delay(GithubException(404, {"message": "Not Found"}, {}), attempt=0) is None
+
+
+class TestIssuePublisher:
+    """测试写入节流与重试"""
+
+    def test_writes_are_paced(self):
+        clock = FakeClock()
+        repo = FakeRepo()
+        publisher = _publisher(repo, clock)
+
+        publisher.publish("A", "a", trigger_comment="@moderator 请审核")
+        clock.now += 0.5
+        publisher.publish("B", "b")
+
+        # 第一次写入不等待；评论等 2 秒；第二个 Issue 距上次写入 0.5 秒，再等 1.5 秒
+        assert clock.sleeps == [2.0, 1.5]
+        assert publisher.writes == 3
+        assert repo.comments == [(1, "@moderator 请审核")]
+
+    def test_retries_secondary_rate_limit(self):
+        clock = FakeClock()
+        repo = FakeRepo([_secondary_limit({"Retry-After": "5"})])
+        publisher = _publisher(repo, clock, interval=0)
+
+        issue = publisher.create_issue("A", "a")
+
+        assert issue.number == 1
+        assert clock.sleeps == [5.0]
+
+    def test_other_errors_are_raised(self):
+        clock = FakeClock()
+        repo = FakeRepo([GithubException(403, {"message": "Resource not accessible"}, {})])
+        publisher = _publisher(repo, clock)
+
+        with pytest.raises(GithubException):
+            publisher.create_issue("A", "a")
+        assert clock.sleeps == []
+        assert publisher.writes == 0
+
+
+class TestRenderDigest:
+    """测试 digest 正文"""
+
+    def test_joins_sections(self):
+        body = render_digest(["x", "y"], lambda i, item: f"### {i}. {item}", header="## 速递\n", footer="_footer_")
+
+        assert body == "## 速递\n\n---\n\n### 1. x\n\n---\n\n### 2. y\n\n---\n\n_footer_\n"
@@ -0,0 +1,134 @@
+"""测试持久化作业队列"""
+
+import asyncio
+
+import pytest
+
+from issuelab import jobs
+from issuelab.job_queue import JobQueue, run_worker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "jobs.sqlite3", retry_delay=0)
+    yield queue
+    queue.close()
+
+
+class TestJobQueue:
+    """测试状态、去重、租约与重试"""
+
+    def test_dedup_while_active(self, queue):
+        job = {"type": "execute", "issue": 1, "agents": ["echo"]}
+
+        first_id, created = queue.enqueue(job)
+        second_id, created_again = queue.enqueue({"agents": ["echo"], "issue": 1, "type": "execute"})
+
+        assert created is True
+        assert (second_id, created_again) == (first_id, False)
+
+        claimed = queue.claim("w1")
+        queue.complete(claimed, {"ok": 1})
+        # 完成后相同作业可以再次入队
+        assert queue.enqueue(job)[1] is True
+        assert queue.get(first_id)["result"] == {"ok": 1}
+
+    def test_failed_job_is_retried_then_marked_failed(self, queue):
+        job_id, _ = queue.enqueue({"type": "observe", "issue": 2}, max_attempts=2)
+
+        first = queue.claim("w1")
+        assert queue.fail(first, "boom") == "queued"
+        second = queue.claim("w1")
+        assert second.id == job_id and second.attempts == 2
+        assert queue.fail(second, "boom again") == "failed"
+
+        assert queue.claim("w1") is None
+        assert queue.get(job_id)["error"] == "boom again"
+        assert queue.stats()["failed"] == 1
+
+    def test_expired_lease_is_reclaimed(self, queue, tmp_path):
+        job_id, _ = queue.enqueue({"type": "observe", "issue": 3})
+        crashed = queue.claim("crashed-worker", lease_seconds=1)
+        queue._conn.execute("UPDATE jobs SET lease_expires = 0 WHERE id = ?", (job_id,))
+
+        # 另一个进程打开同一个队列文件并接管作业
+        other = JobQueue(tmp_path / "jobs.sqlite3")
+        try:
+            reclaimed = other.claim("w2")
+        finally:
+            other.close()
+
+        assert reclaimed.id == job_id
+        assert reclaimed.attempts == 2
+        # 原 worker 的租约已失效，不能再提交结果
+        assert queue.complete(crashed, {}) is False
+        assert queue.heartbeat(crashed) is False
+
+
+class TestWorker:
+    """测试 worker 消费队列"""
+
+    async def test_drains_with_bounded_concurrency(self, queue, monkeypatch):
+        active = 0
+        peak = 0
+
+        async def fake_run_job(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            if job["issue"] == 3:
+                raise RuntimeError("agent crashed")
+            return {"issue": job["issue"]}
+
+        monkeypatch.setattr(jobs, "run_job", fake_run_job)
+        for issue in range(1, 6):
+            queue.enqueue({"type": "observe", "issue": issue}, max_attempts=1)
+
+        processed = await run_worker(queue, max_concurrency=2, poll_interval=0.01, drain=True)
+
+        assert processed == 5
+        assert peak == 2
+        assert queue.stats() == {"queued": 0, "running": 0, "done": 4, "failed": 1}
+
+    async def test_lost_lease_cancels_running_job(self, queue, monkeypatch):
+        """租约被接管后取消正在执行的作业，且不改动接管者的记录"""
+        cancelled = asyncio.Event()
+
+        async def fake_run_job(job):
+            queue._conn.execute("UPDATE jobs SET lease_owner = 'other-worker' WHERE id = ?", (job_id,))
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        monkeypatch.setattr(jobs, "run_job", fake_run_job)
+        job_id, _ = queue.enqueue({"type": "observe", "issue": 1})
+
+        await asyncio.wait_for(run_worker(queue, poll_interval=0.01, drain=True, lease_seconds=1), 5)
+
+        assert cancelled.is_set()
+        record = queue.get(job_id)
+        assert (record["state"], record["lease_owner"], record["attempts"]) == ("running", "other-worker", 1)
+
+    async def test_shutdown_releases_job_without_burning_attempt(self, queue, monkeypatch):
+        """worker 被取消时作业立即重新排队，尝试次数不变"""
+        started = asyncio.Event()
+
+        async def fake_run_job(job):
+            started.set()
+            await asyncio.sleep(30)
+
+        monkeypatch.setattr(jobs, "run_job", fake_run_job)
+        job_id, _ = queue.enqueue({"type": "observe", "issue": 1}, max_attempts=1)
+
+        worker = asyncio.create_task(run_worker(queue, poll_interval=0.01))
+        await asyncio.wait_for(started.wait(), 5)
+        worker.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await worker
+
+        record = queue.get(job_id)
+        assert (record["state"], record["attempts"]) == ("queued", 0)
@@ -0,0 +1,42 @@
+"""测试有界 LRU 缓存"""
+
+from issuelab.lru import LRUCache
+
+
+class TestLRUCache:
+    """测试淘汰顺序与统计"""
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache.lookup("a") == 1
+        cache["c"] = 3
+
+        assert isinstance(cache, dict)
+        assert list(cache) == ["a", "c"]
+        assert cache.evictions == 1
+
+    def test_stats_count_hits_and_misses(self):
+        cache = LRUCache(maxsize=4, name="demo")
+        cache["a"] = 1
+        cache.lookup("a")
+        cache.lookup("missing")
+
+        assert cache.stats() == {
+            "name": "demo",
+            "size": 1,
+            "maxsize": 4,
+            "hits": 1,
+            "misses": 1,
+            "evictions": 0,
+            "hit_rate": 0.5,
+        }
+
+    def test_unbounded_when_maxsize_is_zero(self):
+        cache = LRUCache(maxsize=0)
+        for i in range(100):
+            cache[i] = i
+
+        assert len(cache) == 100
+        assert cache.evictions == 0
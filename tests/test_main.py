@@ -87,6 +87,48 @@ class TestMainTriggerComment:
 
             assert captured.get("trigger_comment") == "@agent please focus on this"
 
+    def test_review_post_publishes_each_result_as_it_completes(self, monkeypatch):
+        """review --post 在每个 agent 完成时立即发布，全部完成后才按 summarizer 的 [CLOSE] 关闭 Issue"""
+        from issuelab import __main__ as main_mod
+        from issuelab.results import AgentRunResult
+
+        monkeypatch.setattr(
+            main_mod, "get_issue_info", lambda *a, **k: {"title": "t", "body": "b", "comments": "", "comment_count": 0}
+        )
+        events = []
+
+        async def _fake_run(issue, agents, context, comment_count, trigger_comment=None, on_result=None):
+            results = {}
+            # summarizer 最先完成，其他 agent 仍在运行
+            for name in sorted(agents, key=lambda n: n != "summarizer"):
+                events.append(f"done:{name}")
+                response = "[CLOSE]" if name == "summarizer" else f"[Agent: {name}] ok"
+                results[name] = AgentRunResult(response=response)
+                await on_result(name, results[name])
+            return results
+
+        async def _fake_post(issue_number, body, agent_name=None):
+            events.append(f"posted:{agent_name}")
+            return True
+
+        async def _fake_close(issue_number):
+            events.append(f"closed:{issue_number}")
+            return True
+
+        monkeypatch.setattr(main_mod, "run_agents_parallel", _fake_run)
+        monkeypatch.setattr("issuelab.tools.github.apost_comment", _fake_post)
+        monkeypatch.setattr("issuelab.response_processor.aclose_issue", _fake_close)
+        monkeypatch.setattr("issuelab.response_processor.should_auto_close", lambda text, name: "[CLOSE]" in text)
+
+        with (
+            patch("issuelab.tools.github.write_issue_context_file", lambda *a, **k: "/tmp/issue_3.md"),
+            patch("sys.argv", ["issuelab", "review", "--issue", "3", "--post"]),
+        ):
+            main_mod.main()
+
+        assert events[:2] == ["done:summarizer", "posted:summarizer"]
+        assert events[-3:] == ["done:reviewer_b", "posted:reviewer_b", "closed:3"]
+
 
 class TestObserveBatchUsesGetIssueInfo:
     """确保 observe-batch 使用 get_issue_info 而不是直接调用 gh"""
@@ -125,3 +167,68 @@ class TestObserveBatchUsesGetIssueInfo:
             main_mod.main()
 
         assert calls["count"] == 2
+
+    def test_since_last_scan_keeps_failed_issues_for_retry(self, monkeypatch):
+        """获取失败、分析出错与触发失败的 Issue 不随高水位线丢失，而是下次重新选中"""
+        from contextlib import asynccontextmanager
+
+        from issuelab import __main__ as main_mod
+
+        def fake_get_issue_info(issue_number, format_comments=False):
+            if issue_number == 1:
+                raise RuntimeError("gh: 502")
+            return {"title": f"t{issue_number}", "body": "b", "comments": "", "comment_count": 0}
+
+        @asynccontextmanager
+        async def fake_stream(issue_data_list, max_concurrency=None, packed=False):
+            async def decisions():
+                yield {"issue_number": 2, "should_trigger": True, "agent": "moderator"}
+                yield {"issue_number": 3, "should_trigger": False, "error": "timeout"}
+                yield {"issue_number": 4, "should_trigger": False, "reason": "无需处理"}
+
+            yield decisions()
+
+        async def failing_trigger(agent_name, issue_number):
+            return False
+
+        committed = []
+        monkeypatch.setattr(main_mod, "get_issue_info", fake_get_issue_info)
+        monkeypatch.setattr("issuelab.tools.github.write_issue_context_file", lambda **k: "/tmp/issue.md")
+        monkeypatch.setattr("issuelab.observer_scan.select_updated_issues", lambda: [1, 2, 3, 4])
+        monkeypatch.setattr("issuelab.observer_scan.commit_scan", lambda retry=(): committed.append(list(retry)))
+        monkeypatch.setattr("issuelab.agents.observer.stream_observer_batch", fake_stream)
+        monkeypatch.setattr("issuelab.observer_trigger.atrigger_builtin_agent", failing_trigger)
+
+        argv = ["issuelab", "observe-batch", "--since-last-scan", "--auto-trigger", "--no-cache", "--no-prefilter"]
+        with patch("sys.argv", argv):
+            main_mod.main()
+
+        assert committed == [[1, 2, 3]]
+
+    def test_since_last_scan_defers_cooldown_skips(self, monkeypatch):
+        """冷却期跳过的 Issue 留到下次扫描，其他预过滤跳过随高水位线推进"""
+        from datetime import UTC, datetime, timedelta
+
+        from issuelab import __main__ as main_mod
+        from issuelab.agents.observer_prefilter import ObserverPrefilter
+
+        replied_at = (datetime.now(UTC) - timedelta(minutes=30)).isoformat()
+        comments = [
+            {"author": {"login": "github-actions"}, "body": "[Agent: echo] done", "createdAt": replied_at},
+            {"author": {"login": "alice"}, "body": "thanks", "createdAt": replied_at},
+        ]
+
+        def fake_get_issue_info(issue_number, format_comments=False):
+            state = "CLOSED" if issue_number == 2 else "OPEN"
+            return {"title": "t", "body": "b", "comments": "", "state": state, "raw_comments": comments}
+
+        committed = []
+        monkeypatch.setattr(main_mod, "get_issue_info", fake_get_issue_info)
+        monkeypatch.setattr(ObserverPrefilter, "keywords", [])
+        monkeypatch.setattr("issuelab.observer_scan.select_updated_issues", lambda: [1, 2])
+        monkeypatch.setattr("issuelab.observer_scan.commit_scan", lambda retry=(): committed.append(list(retry)))
+
+        with patch("sys.argv", ["issuelab", "observe-batch", "--since-last-scan", "--auto-trigger"]):
+            main_mod.main()
+
+        assert committed == [[1]]
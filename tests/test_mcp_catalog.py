@@ -0,0 +1,74 @@
+"""测试 MCP 工具目录缓存"""
+
+import json
+
+from issuelab.agents.mcp_catalog import McpToolCatalog, clear_mcp_catalog, server_cache_key
+
+SERVER = {"command": "uvx", "args": ["docs-mcp"], "env": {"API_KEY": "secret"}}
+
+
+class TestServerCacheKey:
+    """测试缓存键"""
+
+    def test_key_depends_on_command_args_and_env(self):
+        assert server_cache_key(SERVER) == server_cache_key(dict(SERVER))
+        assert server_cache_key(SERVER) != server_cache_key({**SERVER, "args": ["other-mcp"]})
+        assert server_cache_key(SERVER) != server_cache_key({**SERVER, "env": {"API_KEY": "rotated"}})
+
+
+class TestMcpToolCatalog:
+    """测试缓存命中、过期与持久化"""
+
+    def test_lister_called_once_across_instances(self, tmp_path):
+        path = tmp_path / "mcp_catalog.json"
+        calls = []
+
+        def lister(name, cfg):
+            calls.append(name)
+            return ["search", "fetch"]
+
+        assert McpToolCatalog(path, ttl_seconds=60).get_tools("docs", SERVER, lister) == ["search", "fetch"]
+        assert McpToolCatalog(path, ttl_seconds=60).get_tools("docs", SERVER, lister) == ["fetch", "search"]
+        assert calls == ["docs"]
+        # env 只保存哈希
+        assert "secret" not in path.read_text(encoding="utf-8")
+
+    def test_expired_and_empty_results(self, tmp_path):
+        catalog = McpToolCatalog(tmp_path / "mcp_catalog.json", ttl_seconds=60)
+        catalog.put("docs", SERVER, ["search"], now=1000.0)
+
+        assert catalog.get(SERVER, now=1030.0) == ["search"]
+        assert catalog.get(SERVER, now=1100.0) is None
+
+        catalog.put("empty", {"command": "broken"}, [])
+        assert catalog.get({"command": "broken"}) is None
+
+    def test_cache_only_lookup_does_not_fetch(self, tmp_path):
+        catalog = McpToolCatalog(tmp_path / "mcp_catalog.json", ttl_seconds=60)
+
+        assert catalog.get_tools("docs", SERVER, lister=None) is None
+
+
+class TestPromptIntegration:
+    """测试 prompt 中列出缓存的工具名"""
+
+    def test_format_mcp_servers_lists_cached_tools(self, tmp_path, monkeypatch):
+        from issuelab.agents import options as options_mod
+
+        monkeypatch.setenv("ISSUELAB_STATE_DIR", str(tmp_path / "state"))
+        monkeypatch.delenv("MCP_PROMPT_TOOLS", raising=False)
+        clear_mcp_catalog()
+        (tmp_path / ".mcp.json").write_text(json.dumps({"mcpServers": {"docs": SERVER}}), encoding="utf-8")
+        monkeypatch.setattr(
+            options_mod,
+            "_list_tools_for_mcp_server",
+            lambda *a, **k: (_ for _ in ()).throw(AssertionError("server spawned")),
+        )
+
+        assert options_mod.format_mcp_servers_for_prompt("any", root_dir=tmp_path) == "- docs"
+
+        McpToolCatalog(tmp_path / "state" / "mcp_catalog.json").put("docs", SERVER, ["search", "fetch"])
+        clear_mcp_catalog()
+
+        assert options_mod.format_mcp_servers_for_prompt("any", root_dir=tmp_path) == "- docs: fetch, search"
+        clear_mcp_catalog()
@@ -0,0 +1,152 @@
+"""测试 MCP server 进程池"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from issuelab.agents.mcp_pool import McpServerPool, pool_mcp_servers
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="需要 Unix socket")
+
+# 最小的 stdio MCP server：每次启动在 starts 文件追加一行，按行回显 JSON-RPC 请求
+FAKE_SERVER = """
+import json, sys
+with open(sys.argv[1], "a") as f:
+    f.write("start\\n")
+for line in sys.stdin:
+    msg = json.loads(line)
+    if "id" not in msg:
+        continue
+    if msg["method"] == "initialize":
+        result = {"protocolVersion": "2025-06-18", "capabilities": {}, "serverInfo": {"name": "fake"}}
+    else:
+        result = {"method": msg["method"], "echo": msg.get("params")}
+    print(json.dumps({"jsonrpc": "2.0", "id": msg["id"], "result": result}), flush=True)
+"""
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+
+
+@pytest.fixture
+def fake_server(tmp_path):
+    script = tmp_path / "fake_server.py"
+    script.write_text(FAKE_SERVER, encoding="utf-8")
+    starts = tmp_path / "starts.txt"
+    return {"command": sys.executable, "args": [str(script), str(starts)]}, starts
+
+
+@pytest.fixture
+def pool():
+    pool = McpServerPool()
+    yield pool
+    pool.close()
+
+
+class Client:
+    """通过 Unix socket 直接连接进程池的同步客户端"""
+
+    def __init__(self, socket_path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(10)
+        self.sock.connect(socket_path)
+        self.reader = self.sock.makefile("rb")
+
+    def request(self, msg_id, method, params=None):
+        message = {"jsonrpc": "2.0", "id": msg_id, "method": method, "params": params or {}}
+        self.sock.sendall((json.dumps(message) + "\n").encode())
+        return json.loads(self.reader.readline())
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class TestMcpServerPool:
+    """测试共享与多路复用"""
+
+    def test_clients_share_one_server_process(self, pool, fake_server):
+        cfg, starts = fake_server
+        endpoint = pool.endpoint("docs", cfg)
+        assert pool.endpoint("docs", dict(cfg)) == endpoint
+        assert endpoint["command"] == sys.executable
+        assert endpoint["args"][:2] == ["-m", "issuelab.tools.mcp_shim"]
+
+        first, second = Client(endpoint["args"][2]), Client(endpoint["args"][2])
+        try:
+            assert first.request(1, "initialize")["result"]["serverInfo"]["name"] == "fake"
+            assert second.request(1, "initialize")["result"]["serverInfo"]["name"] == "fake"
+
+            # 两个会话使用相同的请求 id，响应仍路由回各自的会话
+            assert first.request(2, "tools/call", {"name": "a"}) == {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "result": {"method": "tools/call", "echo": {"name": "a"}},
+            }
+            assert second.request(2, "tools/call", {"name": "b"})["result"]["echo"] == {"name": "b"}
+        finally:
+            first.close()
+            second.close()
+
+        assert starts.read_text().count("start") == 1
+        assert pool.multiplexer("docs", cfg).starts == 1
+
+    def test_servers_start_in_agent_cwd(self, pool, tmp_path):
+        """相对路径参数按 Agent 工作目录解析，不同工作目录的 Agent 不共享 server"""
+        cfg = {"command": sys.executable, "args": ["fake_server.py", "starts.txt"]}
+        agent_dirs = [tmp_path / "agent_a", tmp_path / "agent_b"]
+        for agent_dir in agent_dirs:
+            agent_dir.mkdir()
+            (agent_dir / "fake_server.py").write_text(FAKE_SERVER, encoding="utf-8")
+
+        endpoints = [pool.endpoint("docs", cfg, cwd=agent_dir) for agent_dir in agent_dirs]
+        assert endpoints[0] != endpoints[1]
+        assert pool.endpoint("docs", cfg, cwd=str(agent_dirs[0])) == endpoints[0]
+
+        for endpoint in endpoints:
+            client = Client(endpoint["args"][2])
+            try:
+                assert client.request(1, "initialize")["result"]["serverInfo"]["name"] == "fake"
+            finally:
+                client.close()
+
+        assert all((agent_dir / "starts.txt").read_text().count("start") == 1 for agent_dir in agent_dirs)
+        assert pool.multiplexer("docs", cfg, cwd=agent_dirs[1]).cfg["cwd"] == str(agent_dirs[1])
+
+    def test_non_stdio_servers_are_unchanged(self, pool):
+        http = {"type": "http", "url": "https://docs.example.com"}
+
+        assert pool.rewrite({"docs": http}) == {"docs": http}
+
+    def test_pool_disabled_by_default(self, monkeypatch, fake_server):
+        monkeypatch.delenv("ISSUELAB_MCP_POOL", raising=False)
+        servers = {"docs": fake_server[0]}
+
+        assert pool_mcp_servers(servers) is servers
+
+    def test_shim_bridges_stdio(self, pool, fake_server):
+        endpoint = pool.endpoint("docs", fake_server[0])
+        env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+        request = json.dumps({"jsonrpc": "2.0", "id": 7, "method": "initialize", "params": {}}) + "\n"
+
+        proc = subprocess.Popen(
+            [endpoint["command"], *endpoint["args"]],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            env=env,
+        )
+        try:
+            proc.stdin.write(request.encode())
+            proc.stdin.flush()
+            response = json.loads(proc.stdout.readline())
+            proc.stdin.close()
+            assert proc.wait(timeout=20) == 0
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+
+        assert response["id"] == 7
@@ -0,0 +1,67 @@
+"""测试 @mention 分词器"""
+
+import pytest
+
+from issuelab.mention_tokenizer import replace_mentions, tokenize_mentions
+
+
+class TestTokenizeMentions:
+    """测试单次扫描的分词结果"""
+
+    def test_positions_counts_and_order(self):
+        text = "@bob hi @Alice, cc @alice @bob @bob"
+        scan = tokenize_mentions(text)
+
+        assert scan.names == ["bob", "Alice", "alice", "bob", "bob"]
+        assert scan.counts == {"bob": 3, "alice": 2}
+        assert scan.first_seen == ("bob", "Alice")
+        first = scan.mentions[0]
+        assert text[first.start : first.end] == "@bob"
+
+    def test_cached_counts_are_read_only(self):
+        """扫描结果按文本缓存共享，counts 不能被调用方修改"""
+        scan = tokenize_mentions("@alice @alice")
+
+        with pytest.raises(TypeError):
+            scan.counts["alice"] = 99
+
+        assert tokenize_mentions("@alice @alice").counts["alice"] == 2
+
+    def test_skips_code_fences(self):
+        text = "@alice\n```python\n@decorator\n```\n~~~\n@inside\n~~~\n@bob"
+        assert tokenize_mentions(text).names == ["alice", "bob"]
+
+    def test_unclosed_fence_runs_to_end(self):
+        text = "@alice\n```\n@hidden"
+        assert tokenize_mentions(text).names == ["alice"]
+
+    def test_skips_urls_and_emails(self):
+        text = "see https://example.com/@bob and mail foo@bar.com, ping @carol"
+        assert tokenize_mentions(text).names == ["carol"]
+
+    def test_mention_after_cjk_text(self):
+        assert tokenize_mentions("请@moderator处理").names == ["moderator"]
+
+    def test_unique_and_ranked(self):
+        scan = tokenize_mentions("@a @B @b @123 @c @a @b")
+
+        assert scan.unique() == ["a", "B", "b", "123", "c"]
+        assert scan.unique(case_sensitive=False, skip_numeric=True) == ["a", "B", "c"]
+        assert scan.ranked() == ["B", "a", "c"]
+
+    def test_result_is_cached(self):
+        text = "@alice " * 10
+        assert tokenize_mentions(text) is tokenize_mentions(text)
+
+
+class TestReplaceMentions:
+    """测试按位置替换"""
+
+    def test_replace_keeps_code_and_numeric(self):
+        text = "@alice @123\n```\n@keep\n```"
+        result = replace_mentions(text, "用户 {username}")
+
+        assert result == "用户 alice @123\n```\n@keep\n```"
+
+    def test_no_mentions_returns_same_text(self):
+        assert replace_mentions("plain text", "x") == "plain text"
@@ -0,0 +1,129 @@
+"""测试 Observer 决策缓存"""
+
+from issuelab.agents.observer_cache import ObserverDecisionCache, issue_state_hash
+from issuelab.results import ObserverDecision
+
+
+def _cache(tmp_path, **kwargs):
+    kwargs.setdefault("ttl_seconds", 3600)
+    kwargs.setdefault("matrix_version", "v1")
+    return ObserverDecisionCache(tmp_path / "observer_cache.json", **kwargs)
+
+
+class TestIssueStateHash:
+    """测试 Issue 内容哈希"""
+
+    def test_any_field_change_changes_hash(self):
+        base = issue_state_hash("t", "b", "c")
+
+        assert base == issue_state_hash("t", "b", "c")
+        assert base != issue_state_hash("t", "b", "c2")
+        assert base != issue_state_hash("t", "b c", "")
+        assert issue_state_hash("ab", "", "") != issue_state_hash("a", "b", "")
+
+
+class TestObserverDecisionCache:
+    """测试缓存命中、失效与持久化"""
+
+    def test_hit_skips_without_retrigger(self, tmp_path):
+        cache = _cache(tmp_path)
+        decision = ObserverDecision(should_trigger=True, agent="moderator", reason="新论文")
+        cache.put(7, "h1", decision, now=1000, triggered=True)
+
+        hit = cache.get(7, "h1", now=1100)
+
+        assert hit is not None
+        assert hit.should_trigger is False
+        assert hit["cached"] is True
+        assert hit["cached_should_trigger"] is True
+        assert "新论文" in hit.reason
+
+    def test_untriggered_decision_is_not_cached(self, tmp_path):
+        """触发失败的决策不缓存，下次仍会重新分析"""
+        cache = _cache(tmp_path)
+        issues = [{"issue_number": 7, "state_hash": "h1"}]
+        cache.record([ObserverDecision(issue_number=7, should_trigger=True, agent="moderator")], issues)
+
+        hits, pending = cache.partition(issues)
+
+        assert hits == []
+        assert pending == issues
+        assert cache.get(7, "h1") is None
+
+    def test_miss_on_content_matrix_or_ttl(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(7, "h1", ObserverDecision(), now=1000)
+
+        assert cache.get(7, "h2", now=1100) is None
+        assert cache.get(7, "h1", now=1000 + 3601) is None
+        cache._matrix_version = "v2"
+        assert cache.get(7, "h1", now=1100) is None
+
+    def test_errors_are_not_cached(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(7, "h1", ObserverDecision(error="boom"))
+
+        assert cache.get(7, "h1") is None
+
+    def test_save_and_reload(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.put(7, "h1", ObserverDecision(reason="r"))
+        cache.save()
+
+        reloaded = _cache(tmp_path)
+        assert reloaded.get(7, "h1") is not None
+
+    def test_save_without_changes_does_not_write(self, tmp_path):
+        cache = _cache(tmp_path)
+        cache.get(7, "h1")
+        cache.save()
+
+        assert not (tmp_path / "observer_cache.json").exists()
+
+    def test_zero_ttl_disables_cache(self, tmp_path):
+        cache = _cache(tmp_path, ttl_seconds=0)
+        cache.put(7, "h1", ObserverDecision())
+
+        assert cache.get(7, "h1") is None
+
+    def test_partition_and_record(self, tmp_path):
+        cache = _cache(tmp_path)
+        issues = [
+            {"issue_number": 1, "state_hash": "a"},
+            {"issue_number": 2, "state_hash": "b"},
+            {"issue_number": 3},
+        ]
+        cache.record([ObserverDecision(issue_number=1, reason="done")], issues)
+
+        hits, pending = cache.partition(issues)
+
+        assert [h.issue_number for h in hits] == [1]
+        assert [d["issue_number"] for d in pending] == [2, 3]
+
+
+class TestRunObserverUsesCache:
+    """测试 run_observer 的缓存集成"""
+
+    async def test_cache_hit_skips_model_call(self, tmp_path, monkeypatch):
+        from issuelab.agents import observer as observer_mod
+
+        calls = []
+
+        async def fake_run_single_agent(prompt, agent_name):
+            calls.append(agent_name)
+            return {"response": "should_trigger: false\nreason: 无需处理", "cost_usd": 0.1}
+
+        monkeypatch.setattr(observer_mod, "run_single_agent", fake_run_single_agent)
+        monkeypatch.setattr(observer_mod, "discover_agents", lambda: {"observer": {"prompt": "OBS"}})
+        monkeypatch.setattr(observer_mod, "build_collaboration_guidelines", lambda *a, **k: "")
+        monkeypatch.setattr(observer_mod, "get_agent_matrix_markdown", lambda: "")
+
+        cache = _cache(tmp_path)
+        first = await observer_mod.run_observer(5, "t", "b", "c", cache=cache)
+        second = await observer_mod.run_observer(5, "t", "b", "c", cache=cache)
+        changed = await observer_mod.run_observer(5, "t", "b", "new comment", cache=cache)
+
+        assert calls == ["observer", "observer"]
+        assert first.get("cached") is None
+        assert second["cached"] is True
+        assert changed.get("cached") is None
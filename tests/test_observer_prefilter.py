@@ -0,0 +1,116 @@
+"""测试 Observer 规则预过滤"""
+
+from datetime import UTC, datetime
+
+from issuelab.agents.observer_prefilter import (
+    SKIP_AGENT_COOLDOWN,
+    SKIP_CLOSED,
+    SKIP_LABEL,
+    SKIP_LAST_COMMENT_BY_AGENT,
+    ObserverPrefilter,
+    collect_trigger_keywords,
+    is_agent_comment,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=UTC)
+
+
+def _comment(login, body, created_at="2026-01-01T00:00:00Z"):
+    return {"author": {"login": login}, "body": body, "createdAt": created_at}
+
+
+def _prefilter(**kwargs):
+    kwargs.setdefault("cooldown_hours", 2)
+    kwargs.setdefault("keywords", ["@moderator", "新论文 issue"])
+    return ObserverPrefilter(**kwargs)
+
+
+class TestIsAgentComment:
+    """测试 bot/Agent 评论识别"""
+
+    def test_bot_logins_and_agent_prefix(self):
+        assert is_agent_comment(_comment("github-actions", "hi"))
+        assert is_agent_comment(_comment("renovate[bot]", "hi"))
+        assert is_agent_comment(_comment("alice", "[Agent: moderator]\n评审分配"))
+        assert not is_agent_comment(_comment("alice", "提到 [Agent: moderator] 的回复"))
+
+
+class TestCollectTriggerKeywords:
+    """测试从 Agent 矩阵收集关键词"""
+
+    def test_collects_mentions_and_conditions(self):
+        agents = {
+            "observer": {"trigger_conditions": ["ignored"]},
+            "echo": {"trigger_conditions": ["@echo", "@Echo"]},
+            "moderator": {"trigger_conditions": ["新论文 Issue", None]},
+        }
+
+        assert collect_trigger_keywords(agents) == ["@echo", "@moderator", "新论文 issue"]
+
+
+class TestObserverPrefilter:
+    """测试预过滤规则"""
+
+    def test_closed_and_labels_are_skipped(self):
+        prefilter = _prefilter()
+
+        assert prefilter.check({"state": "CLOSED"})[0] == SKIP_CLOSED
+        assert prefilter.check({"state": "OPEN", "labels": [{"name": "stale"}]})[0] == SKIP_LABEL
+
+    def test_issue_without_agent_reply_is_kept(self):
+        issue = {"state": "OPEN", "raw_comments": [_comment("alice", "question")]}
+
+        assert _prefilter().check(issue, now=NOW) is None
+
+    def test_last_comment_by_agent_is_skipped(self):
+        issue = {"raw_comments": [_comment("alice", "q"), _comment("github-actions", "[Agent: echo] done")]}
+
+        assert _prefilter().check(issue, now=NOW)[0] == SKIP_LAST_COMMENT_BY_AGENT
+
+    def test_human_reply_within_cooldown_is_skipped(self):
+        issue = {
+            "raw_comments": [
+                _comment("github-actions", "[Agent: echo] done", "2026-01-01T11:00:00Z"),
+                _comment("alice", "thanks", "2026-01-01T11:30:00Z"),
+            ]
+        }
+
+        assert _prefilter().check(issue, now=NOW)[0] == SKIP_AGENT_COOLDOWN
+        assert _prefilter(cooldown_hours=0).check(issue, now=NOW) is None
+        assert _prefilter().skip_decision(1, issue, now=NOW)["deferred"] is True
+
+    def test_keyword_after_agent_reply_overrides_cooldown(self):
+        issue = {
+            "raw_comments": [
+                _comment("github-actions", "[Agent: echo] done", "2026-01-01T11:00:00Z"),
+                _comment("alice", "请 @Moderator 看一下", "2026-01-01T11:30:00Z"),
+            ]
+        }
+
+        assert _prefilter().check(issue, now=NOW) is None
+
+    def test_keywords_match_exact_mentions_and_whole_phrases(self):
+        prefilter = _prefilter(keywords=["@echo", "新论文 issue", "bug"])
+
+        assert prefilter._match_keyword("hi @Echo!") == "@echo"
+        assert prefilter._match_keyword("hi @echoes, mail a@echo.com") is None
+        assert prefilter._match_keyword("这是新论文  Issue。") == "新论文 issue"
+        assert prefilter._match_keyword("a bug here") == "bug"
+        assert prefilter._match_keyword("debugging notes") is None
+
+    def test_skip_decision_records_reason(self):
+        decision = _prefilter().skip_decision(9, {"labels": ["bot:quiet"]})
+
+        assert decision.issue_number == 9
+        assert decision.should_trigger is False
+        assert decision["prefiltered"] is True
+        assert decision["skip_code"] == SKIP_LABEL
+        assert decision["deferred"] is False
+        assert "bot:quiet" in decision.reason
+
+    def test_cooldown_from_env(self, monkeypatch):
+        monkeypatch.setenv("ISSUELAB_OBSERVER_COOLDOWN_HOURS", "6")
+        assert ObserverPrefilter(keywords=[]).cooldown_hours == 6
+
+        monkeypatch.setenv("ISSUELAB_OBSERVER_COOLDOWN_HOURS", "bad")
+        assert ObserverPrefilter(keywords=[]).cooldown_hours == 2
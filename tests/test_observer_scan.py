@@ -0,0 +1,100 @@
+"""测试 Observer 增量扫描"""
+
+import pytest
+
+from issuelab.observer_scan import PER_PAGE, ScanCheckpoint, commit_scan, select_updated_issues
+
+
+def _issue(number, updated_at, labels=(), pull_request=False):
+    item = {"number": number, "updated_at": updated_at, "labels": [{"name": n} for n in labels]}
+    if pull_request:
+        item["pull_request"] = {"url": "x"}
+    return item
+
+
+class FakeIssuesApi:
+    """按 (since, page) 分页返回 Issues，记录调用"""
+
+    def __init__(self, issues, fail_on_page=None):
+        self.issues = sorted(issues, key=lambda i: i["updated_at"])
+        self.calls = []
+        self.fail_on_page = fail_on_page
+
+    def __call__(self, since, page):
+        self.calls.append((since, page))
+        if page == self.fail_on_page:
+            raise RuntimeError("network")
+        items = [i for i in self.issues if since is None or i["updated_at"] >= since]
+        return items[(page - 1) * PER_PAGE : page * PER_PAGE]
+
+
+class TestSelectUpdatedIssues:
+    """测试增量选择与检查点"""
+
+    def test_first_scan_filters_prs_and_labels(self, tmp_path):
+        path = tmp_path / "scan.json"
+        api = FakeIssuesApi(
+            [
+                _issue(1, "2026-01-01T00:00:00Z"),
+                _issue(2, "2026-01-02T00:00:00Z", pull_request=True),
+                _issue(3, "2026-01-03T00:00:00Z", labels=["bot:quiet"]),
+                _issue(4, "2026-01-04T00:00:00Z"),
+            ]
+        )
+
+        assert select_updated_issues(checkpoint_path=path, fetch_page=api) == [1, 4]
+        assert api.calls == [(None, 1)]
+
+    def test_commit_advances_high_water_mark(self, tmp_path):
+        path = tmp_path / "scan.json"
+        api = FakeIssuesApi([_issue(1, "2026-01-01T00:00:00Z"), _issue(2, "2026-01-02T00:00:00Z")])
+        select_updated_issues(checkpoint_path=path, fetch_page=api)
+
+        assert commit_scan(path) == "2026-01-02T00:00:00Z"
+
+        api.issues.append(_issue(5, "2026-01-05T00:00:00Z"))
+        selected = select_updated_issues(checkpoint_path=path, fetch_page=api)
+
+        # since 包含边界，已处理的 #2 会被再次返回，由决策缓存去重
+        assert selected == [2, 5]
+        assert api.calls[-1] == ("2026-01-02T00:00:00Z", 1)
+
+    def test_uncommitted_scan_is_resumed(self, tmp_path):
+        path = tmp_path / "scan.json"
+        issues = [_issue(n, f"2026-01-01T00:{n // 60:02d}:{n % 60:02d}Z") for n in range(1, PER_PAGE + 21)]
+
+        api = FakeIssuesApi(issues, fail_on_page=2)
+        with pytest.raises(RuntimeError):
+            select_updated_issues(checkpoint_path=path, fetch_page=api)
+
+        checkpoint = ScanCheckpoint.load(path)
+        assert len(checkpoint.issues) == PER_PAGE
+        assert not checkpoint.complete
+
+        resumed = FakeIssuesApi(issues)
+        selected = select_updated_issues(checkpoint_path=path, fetch_page=resumed)
+
+        assert selected == list(range(1, PER_PAGE + 21))
+        # 从第一页最后一条的 updated_at 继续，而不是从头扫描
+        assert resumed.calls == [(issues[PER_PAGE - 1]["updated_at"], 1)]
+
+    def test_completed_but_uncommitted_scan_returns_same_issues(self, tmp_path):
+        path = tmp_path / "scan.json"
+        api = FakeIssuesApi([_issue(1, "2026-01-01T00:00:00Z")])
+        select_updated_issues(checkpoint_path=path, fetch_page=api)
+
+        assert select_updated_issues(checkpoint_path=path, fetch_page=api) == [1]
+        assert len(api.calls) == 1
+
+    def test_retry_issues_are_reselected_after_commit(self, tmp_path):
+        path = tmp_path / "scan.json"
+        api = FakeIssuesApi([_issue(1, "2026-01-01T00:00:00Z"), _issue(2, "2026-01-02T00:00:00Z")])
+        select_updated_issues(checkpoint_path=path, fetch_page=api)
+
+        assert commit_scan(path, retry=[1]) == "2026-01-02T00:00:00Z"
+        assert ScanCheckpoint.load(path).retry == [1]
+
+        # #1 已落在高水位线之下，仍会被重新选中；再次成功提交后不再重试
+        assert select_updated_issues(checkpoint_path=path, fetch_page=api) == [1, 2]
+        commit_scan(path)
+        assert ScanCheckpoint.load(path).retry == []
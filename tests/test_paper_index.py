@@ -0,0 +1,74 @@
+"""测试论文去重索引"""
+
+from types import SimpleNamespace
+
+from issuelab.paper_index import PaperIndex, load_paper_index, normalize_arxiv_id, normalize_title, paper_keys
+
+
+class TestNormalization:
+    """测试标识规范化"""
+
+    def test_arxiv_id_and_title(self):
+        assert normalize_arxiv_id("2601.00002v3") == "2601.00002"
+        assert normalize_arxiv_id("https://arxiv.org/pdf/2601.00002v1.pdf") == "2601.00002"
+        assert normalize_title("[论文讨论] Attention Is  All You Need!") == normalize_title("attention is all you need")
+
+    def test_paper_keys_for_arxiv_and_pubmed(self):
+        arxiv = {"id": "2601.00002v1", "title": "A Long Enough Title", "url": "https://arxiv.org/abs/2601.00002v1"}
+        pubmed = {"pmid": "123", "doi": "https://doi.org/10.1000/ABC", "title": "short"}
+
+        assert paper_keys(arxiv) == [("arxiv", "2601.00002"), ("title", "alongenoughtitle")]
+        assert paper_keys(pubmed) == [("pmid", "123"), ("doi", "10.1000/abc")]
+
+
+class TestPaperIndex:
+    """测试索引查询、持久化与回填"""
+
+    def test_add_filter_and_reload(self, tmp_path):
+        path = tmp_path / "paper_index.json"
+        index = PaperIndex(path)
+        index.add({"id": "2601.00002v1", "title": "A Long Enough Title"}, issue_number=7)
+        index.save()
+
+        reloaded = PaperIndex.load(path)
+        papers = [
+            {"id": "2601.00002v2", "title": "Renamed"},
+            {"id": "2601.00009v1", "title": "a long enough title"},
+            {"id": "2601.00010v1", "title": "Brand New Paper Title"},
+            {"id": "2601.00010v2", "title": "Brand New Paper Title"},
+        ]
+
+        assert reloaded.find(papers[0]) == 7
+        assert [p["id"] for p in reloaded.filter_new(papers)] == ["2601.00010v1"]
+
+    def test_bootstrap_runs_once_per_repo(self, tmp_path):
+        path = tmp_path / "paper_index.json"
+        issues = [
+            SimpleNamespace(
+                number=3,
+                title="[论文讨论] Some Interesting Paper",
+                body="**标题**: [Some Interesting Paper](https://arxiv.org/abs/2512.01234v2)",
+            ),
+            SimpleNamespace(
+                number=4,
+                title="[文献] 物种形成与杂交领域新文献 - 2026-01-01",
+                body="### 1. Gene Flow Across Species\n\n- **PMID**: [555](https://pubmed.ncbi.nlm.nih.gov/555/)\n"
+                "- **DOI**: [10.1000/XYZ](https://doi.org/10.1000/XYZ)",
+            ),
+            SimpleNamespace(number=5, title="Unrelated bug report", body="https://arxiv.org/abs/2501.00001"),
+        ]
+        calls = []
+
+        def list_issues():
+            calls.append(1)
+            return issues
+
+        index = load_paper_index("o/r", list_issues, path)
+        load_paper_index("o/r", list_issues, path)
+
+        assert calls == [1]
+        assert index.find({"id": "2512.01234v1"}) == 3
+        assert index.find({"pmid": "555"}) == 4
+        assert index.find({"pmid": "1", "doi": "10.1000/xyz"}) == 4
+        assert index.find({"pmid": "2", "title": "Gene flow across species"}) == 4
+        assert not index.contains({"id": "2501.00001"})
@@ -0,0 +1,149 @@
+"""测试异步 PubMed 客户端"""
+
+import io
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import anyio
+
+from issuelab.tools.http_client import AsyncHttpClient, HostLimiter
+from issuelab.tools.pubmed import PubMedClient, fetch_papers_async, ncbi_host_policy, parse_efetch_stream
+
+EFETCH_XML = b"""<?xml version="1.0"?>
+<PubmedArticleSet>
+  <PubmedArticle>
+    <MedlineCitation><PMID>101</PMID></MedlineCitation>
+    <PubmedData>
+      <ReferenceList><Reference><ArticleIdList>
+        <ArticleId IdType="doi">10.9999/reference</ArticleId>
+      </ArticleIdList></Reference></ReferenceList>
+      <ArticleIdList><ArticleId IdType="doi">10.1000/own</ArticleId></ArticleIdList>
+    </PubmedData>
+  </PubmedArticle>
+  <PubmedArticle>
+    <MedlineCitation><PMID>102</PMID>
+      <Article><ELocationID EIdType="doi">10.1000/eloc</ELocationID></Article>
+    </MedlineCitation>
+  </PubmedArticle>
+</PubmedArticleSet>
+"""
+
+
+class FakeResponse:
+    def __init__(self, text="", raw=b""):
+        self.status_code = 200
+        self.text = text
+        self.headers = {}
+        self.raw = io.BytesIO(raw)
+
+    def raise_for_status(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeEutils:
+    """模拟 esearch / esummary / efetch，记录请求参数"""
+
+    def __init__(self, count):
+        self.count = count
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        endpoint = urlsplit(url).path.rsplit("/", 1)[-1]
+        params = {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+        self.calls.append((endpoint, params))
+        if endpoint == "esearch.fcgi":
+            return FakeResponse(
+                json.dumps({"esearchresult": {"count": str(self.count), "webenv": "W", "querykey": "1"}})
+            )
+        start, size = int(params["retstart"]), int(params["retmax"])
+        uids = [str(100 + i) for i in range(start + 1, start + size + 1)]
+        if endpoint == "esummary.fcgi":
+            result = {"uids": uids}
+            for uid in uids:
+                result[uid] = {"title": f"Paper {uid}.", "source": "J", "pubdate": f"2026 Jan {int(uid) - 100:02d}"}
+            return FakeResponse(json.dumps({"result": result}))
+        return FakeResponse(raw=EFETCH_XML if start == 0 else b"<PubmedArticleSet/>")
+
+
+def _client(session, batch_size):
+    http = AsyncHttpClient(host_policies={}, cache=False, session=session, max_retries=0)
+    return PubMedClient("a@b.c", api_key="", http=http, batch_size=batch_size)
+
+
+class TestParseEfetchStream:
+    """测试流式解析"""
+
+    def test_prefers_article_doi_over_references(self):
+        result = parse_efetch_stream(io.BytesIO(EFETCH_XML))
+
+        assert result == {"101": {"doi": "10.1000/own"}, "102": {"doi": "10.1000/eloc"}}
+
+
+class TestNcbiHostPolicy:
+    """测试 API key 感知的限速"""
+
+    def test_rate_depends_on_api_key(self):
+        assert ncbi_host_policy(None).min_interval == 1.0 / 3
+        assert ncbi_host_policy("key").min_interval == 0.1
+
+    async def test_no_one_second_window_exceeds_rate(self, monkeypatch):
+        """任意一秒内发出的请求数不超过 rate（用虚拟时钟代替真实等待）"""
+        clock = [0.0]
+
+        async def fake_sleep(delay):
+            clock[0] += delay
+
+        monkeypatch.setattr(anyio, "current_time", lambda: clock[0])
+        monkeypatch.setattr(anyio, "sleep", fake_sleep)
+
+        for api_key, rate in ((None, 3), ("key", 10)):
+            clock[0] = 0.0
+            limiter = HostLimiter(ncbi_host_policy(api_key))
+            starts = []
+            for _ in range(rate * 3):
+                async with limiter.slot():
+                    starts.append(clock[0])
+
+            for start in starts:
+                assert sum(start <= t < start + 1.0 - 1e-9 for t in starts) <= rate
+
+
+class TestFetchPapersAsync:
+    """测试 history server 与分批请求"""
+
+    async def test_batches_use_history_server(self):
+        session = FakeEutils(count=50)
+
+        papers = await fetch_papers_async("q", "a@b.c", days=1, max_papers=3, client=_client(session, 4))
+
+        endpoints = [c[0] for c in session.calls]
+        assert endpoints.count("esearch.fcgi") == 1
+        # max_papers * 2 = 6 篇，每批 4 篇 → 2 批 esummary + 2 批 efetch
+        assert endpoints.count("esummary.fcgi") == 2
+        assert endpoints.count("efetch.fcgi") == 2
+        for _endpoint, params in session.calls[1:]:
+            assert params["WebEnv"] == "W"
+            assert params["query_key"] == "1"
+            assert "id" not in params
+
+        assert [p["pmid"] for p in papers] == ["106", "105", "104"]
+        assert papers[0]["title"] == "Paper 106"
+
+    async def test_dois_attached_from_efetch(self):
+        session = FakeEutils(count=2)
+
+        papers = await fetch_papers_async("q", "a@b.c", max_papers=5, client=_client(session, 10))
+
+        assert {p["pmid"]: p["doi"] for p in papers} == {"101": "10.1000/own", "102": "10.1000/eloc"}
+
+    async def test_no_results_skips_followup_requests(self):
+        session = FakeEutils(count=0)
+
+        assert await fetch_papers_async("q", "a@b.c", client=_client(session, 10)) == []
+        assert len(session.calls) == 1
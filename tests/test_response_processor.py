@@ -1,6 +1,6 @@
 """测试 Response 后处理逻辑"""
 
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 
 class TestExtractMentionsFromYaml:
@@ -81,7 +81,7 @@ confidence: "high"
         assert allowed == ["moderator"]
         assert filtered == []
         mock_trigger.assert_called_once_with(
-            agent_name="moderator", issue_number=1, issue_title="Title", issue_body="Body"
+            agent_name="moderator", issue_number=1, issue_title="Title", issue_body="Body", cascade=ANY
         )
 
     @patch("issuelab.observer_trigger.auto_trigger_agent")
@@ -107,6 +107,28 @@ confidence: "high"
         assert filtered == []
         assert mock_trigger.call_count == 2
 
+    @patch("issuelab.observer_trigger.auto_trigger_agent")
+    def test_mixed_case_duplicate_mentions_trigger_once(self, mock_trigger):
+        """同一用户大小写不同的重复 @ 只触发一次（不应 KeyError）"""
+        from issuelab.response_processor import trigger_mentioned_agents
+
+        mock_trigger.return_value = True
+
+        response = """```yaml
+summary: "Test"
+findings: []
+recommendations: []
+mentions:
+  - Reviewer_A
+  - reviewer_a
+confidence: "high"
+```"""
+        results, allowed, filtered = trigger_mentioned_agents(response, 3, "Title", "Body")
+
+        assert results == {"Reviewer_A": True}
+        assert allowed == ["Reviewer_A"]
+        assert mock_trigger.call_count == 1
+
     @patch("issuelab.observer_trigger.auto_trigger_agent")
     def test_skip_system_accounts(self, mock_trigger):
         """跳过系统账号"""
@@ -391,3 +413,117 @@ confidence: "high"
         assert "https://example.com/a" in normalized
         assert "https://example.com/b" in normalized
         assert "```yaml" not in normalized
+
+    def test_malformed_yaml_block_keeps_original_text(self):
+        """YAML 块解析失败时保留原文，不替换为空模板"""
+        from issuelab.response_processor import normalize_comment_body
+
+        body = "[Agent: moderator]\n\n分析结论：需要补充实验数据。\n\n```yaml\nsummary: [unclosed\n```"
+        normalized = normalize_comment_body(body, agent_name="moderator")
+
+        assert "分析结论：需要补充实验数据。" in normalized
+        assert "(missing)" not in normalized
+
+
+class TestParsedResponse:
+    """测试回复解析结果复用"""
+
+    RESPONSE = """```yaml
+summary: "Test"
+findings:
+  - "A"
+recommendations:
+  - "B"
+sources:
+  - "https://example.com/a"
+  - "not a url"
+mentions:
+  - "@reviewer_a"
+confidence: "HIGH"
+```"""
+
+    def test_derived_fields(self):
+        from issuelab.response_processor import ParsedResponse
+
+        parsed = ParsedResponse(self.RESPONSE)
+
+        assert parsed.mentions == ["reviewer_a"]
+        assert parsed.sources == ["https://example.com/a"]
+        assert parsed.confidence == "high"
+        assert parsed.mapping["summary"] == "Test"
+
+    def test_yaml_parsed_once_across_pipeline(self, monkeypatch):
+        from issuelab import response_processor as rp
+
+        calls = {"count": 0}
+        original = rp._load_yaml_text
+
+        def counting_load(text):
+            calls["count"] += 1
+            return original(text)
+
+        monkeypatch.setattr(rp, "_load_yaml_text", counting_load)
+        parsed = rp.ParsedResponse(self.RESPONSE)
+
+        rp.extract_mentions_from_yaml(parsed)
+        rp.normalize_comment_body(parsed, agent_name="moderator")
+        rp.should_auto_close(parsed, "summarizer")
+        assert parsed.sources
+
+        assert calls["count"] == 1
+
+    def test_parse_response_reuses_instance(self):
+        from issuelab.response_processor import ParsedResponse, parse_response
+
+        parsed = parse_response(self.RESPONSE)
+
+        assert parse_response(self.RESPONSE) is parsed
+        assert parse_response(parsed) is parsed
+        assert isinstance(parsed, ParsedResponse)
+
+    def test_shared_instance_is_not_mutated_by_callers(self):
+        """parse_response 缓存的实例被共享，调用方修改返回值不影响后续解析"""
+        from issuelab.response_processor import parse_response
+
+        parsed = parse_response(self.RESPONSE)
+        parsed.data["summary"] = "changed"
+        parsed.mapping["confidence"] = "low"
+        parsed.mentions.append("intruder")
+        parsed.sources.clear()
+
+        again = parse_response(self.RESPONSE)
+        assert again.data["summary"] == "Test"
+        assert again.confidence == "high"
+        assert again.mentions == ["reviewer_a"]
+        assert again.sources == ["https://example.com/a"]
+
+    def test_invalid_yaml_is_tolerated(self):
+        from issuelab.response_processor import ParsedResponse
+
+        parsed = ParsedResponse("```yaml\n: [unclosed\n```")
+
+        assert parsed.data is None
+        assert parsed.mentions == []
+        assert parsed.sources == []
+
+
+class TestAsyncCloseIssue:
+    """测试异步关闭 Issue"""
+
+    async def test_aclose_issue(self, monkeypatch):
+        import subprocess
+
+        from issuelab.response_processor import aclose_issue
+
+        calls = []
+
+        async def fake_run_process(cmd, check, env):
+            calls.append(cmd)
+            return subprocess.CompletedProcess(cmd, 0 if len(calls) == 1 else 1, b"", b"denied")
+
+        monkeypatch.setenv("GITHUB_REPOSITORY", "o/r")
+        monkeypatch.setattr("anyio.run_process", fake_run_process)
+
+        assert await aclose_issue(5) is True
+        assert await aclose_issue(6) is False
+        assert calls[0] == ["gh", "issue", "close", "5", "--repo", "o/r", "--reason", "completed"]
@@ -0,0 +1,77 @@
+"""测试 Agent 执行结果记录"""
+
+import pytest
+
+
+class TestMappingView:
+    """测试字典兼容视图"""
+
+    def test_field_access_and_extra_keys(self):
+        from issuelab.results import AgentRunResult
+
+        result = AgentRunResult(response="ok", cost_usd=0.5)
+        result["issue_number"] = 3
+        result["num_turns"] = 2
+
+        assert result["response"] == "ok"
+        assert result.num_turns == 2
+        assert result.extra == {"issue_number": 3}
+        assert result.get("missing", "x") == "x"
+        assert result == {**result.to_dict()}
+
+    def test_none_optional_fields_are_absent(self):
+        from issuelab.results import ObserverDecision
+
+        decision = ObserverDecision(should_trigger=True, agent="moderator")
+        assert "error" not in decision
+        assert "issue_number" not in decision
+
+        decision["error"] = "boom"
+        assert decision["error"] == "boom"
+        del decision["error"]
+        assert decision.get("error") is None
+
+    def test_required_fields_cannot_be_deleted(self):
+        from issuelab.results import AgentRunResult
+
+        with pytest.raises(TypeError):
+            del AgentRunResult()["response"]
+
+    def test_from_mapping_splits_unknown_keys(self):
+        from issuelab.results import ObserverDecision
+
+        decision = ObserverDecision.from_mapping({"should_trigger": True, "agent": "a", "custom": 1})
+
+        assert decision.should_trigger is True
+        assert decision.extra == {"custom": 1}
+        assert ObserverDecision.from_mapping(decision) is decision
+
+    def test_records_use_slots(self):
+        from issuelab.results import AgentRunResult, ObserverDecision, ProcessedResponse
+
+        for cls in (AgentRunResult, ObserverDecision, ProcessedResponse):
+            assert not hasattr(cls(), "__dict__")
+
+
+class TestAggregation:
+    """测试用量汇总"""
+
+    def test_combine_sums_usage_and_dedups_tools(self):
+        from issuelab.results import AgentRunResult
+
+        stages = [
+            AgentRunResult(cost_usd=0.1, num_turns=2, tool_calls=["Read", "Read"], input_tokens=10, total_tokens=15),
+            {"cost_usd": 0.2, "num_turns": 1, "tool_calls": ["WebSearch", "Read"], "output_tokens": 5},
+        ]
+        total = AgentRunResult.combine(stages, response="final")
+
+        assert total.response == "final"
+        assert total.cost_usd == pytest.approx(0.3)
+        assert total.num_turns == 3
+        assert total.tool_calls == ["Read", "WebSearch"]
+        assert (total.input_tokens, total.output_tokens, total.total_tokens) == (10, 5, 15)
+
+    def test_total_cost_accepts_mixed_results(self):
+        from issuelab.results import AgentRunResult, total_cost
+
+        assert total_cost([AgentRunResult(cost_usd=0.25), {"cost_usd": 0.5}, {}]) == pytest.approx(0.75)
@@ -268,6 +268,59 @@ class TestSubagents:
         assert "Task" not in subagent.tools
         assert "Task" in options.allowed_tools
 
+    def test_declared_mode_registers_only_declared_subagents(self, tmp_path, monkeypatch):
+        """declared 模式只注册 agent.yml 声明的 subagent，且不读取未声明的文件"""
+        from issuelab.agents import options as options_mod
+
+        agent_root = tmp_path / "agents" / "alice"
+        subagents_dir = agent_root / ".claude" / "agents"
+        subagents_dir.mkdir(parents=True)
+        (agent_root / "agent.yml").write_text(
+            "owner: alice\nsubagent_mode: declared\nsubagents:\n  - triage\n  - moderator\n",
+            encoding="utf-8",
+        )
+        (subagents_dir / "triage.md").write_text("---\ndescription: triage\n---\nTriage", encoding="utf-8")
+        (subagents_dir / "unused.md").write_text("---\ndescription: unused\n---\nUnused", encoding="utf-8")
+
+        parsed = []
+        original_parse = options_mod._parse_frontmatter
+
+        def tracking_parse(content):
+            parsed.append(content)
+            return original_parse(content)
+
+        monkeypatch.setattr(options_mod, "_parse_frontmatter", tracking_parse)
+        monkeypatch.setattr(options_mod, "AGENTS_DIR", tmp_path / "agents")
+        monkeypatch.setattr(
+            options_mod,
+            "discover_agents",
+            lambda: {
+                "moderator": {"description": "m", "prompt": "M"},
+                "reviewer_a": {"description": "r", "prompt": "R"},
+            },
+        )
+        clear_agent_options_cache()
+
+        options = create_agent_options(agent_name="alice")
+
+        assert set(options.agents) == {"moderator", "triage"}
+        assert not any("Unused" in content for content in parsed)
+        assert "Task" in options.allowed_tools
+
+    def test_declared_mode_without_subagents_drops_task(self, tmp_path, monkeypatch):
+        """declared 模式下未声明任何 subagent 时不注册 agents，也不开放 Task"""
+        from issuelab.agents import options as options_mod
+
+        monkeypatch.setenv("ISSUELAB_SUBAGENT_MODE", "declared")
+        monkeypatch.setattr(options_mod, "AGENTS_DIR", tmp_path / "agents")
+        monkeypatch.setattr(options_mod, "discover_agents", lambda: {"moderator": {"description": "m", "prompt": "M"}})
+        clear_agent_options_cache()
+
+        options = create_agent_options(agent_name="echo")
+
+        assert options.agents == {}
+        assert "Task" not in options.allowed_tools
+
 
 class TestEnvOptimization:
     """测试环境变量优化"""
@@ -338,6 +391,61 @@ class TestCaching:
 
         _ = options_mod.create_agent_options(agent_name="moderator")
 
+    def test_create_agent_options_fast_path_skips_config_reads(self, monkeypatch):
+        """TTL 内命中快速路径时不应再读取 agent.yml / .mcp.json"""
+        from issuelab.agents import options as options_mod
+
+        options_mod.clear_agent_options_cache()
+        monkeypatch.setattr(options_mod, "load_mcp_servers_for_agent", lambda *a, **k: {})
+        first = options_mod.create_agent_options(agent_name="moderator")
+
+        def _fail(*a, **k):
+            raise AssertionError("config read on fast path")
+
+        monkeypatch.setattr(options_mod, "get_agent_config", _fail)
+        monkeypatch.setattr(options_mod, "load_mcp_servers_for_agent", _fail)
+        monkeypatch.setattr(options_mod, "_options_fingerprint", _fail)
+
+        assert options_mod.create_agent_options(agent_name="moderator") is first
+
+    def test_agent_options_cache_is_bounded(self, monkeypatch):
+        """选项缓存超过容量时淘汰最久未使用的条目，并记录统计"""
+        from issuelab.agents import options as options_mod
+
+        options_mod.clear_agent_options_cache()
+        monkeypatch.setattr(options_mod._cached_agent_options, "maxsize", 2)
+        monkeypatch.setattr(options_mod, "load_mcp_servers_for_agent", lambda *a, **k: {})
+        before = options_mod.get_agent_options_cache_stats()
+
+        for turns in (1, 2, 3):
+            options_mod.create_agent_options(max_turns=turns)
+        options_mod.create_agent_options(max_turns=3)
+
+        stats = options_mod.get_agent_options_cache_stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] - before["evictions"] == 1
+        assert stats["hits"] - before["hits"] == 1
+        assert isinstance(options_mod._cached_agent_options, dict)
+
+    def test_create_agent_options_fingerprint_change_rebuilds(self, tmp_path, monkeypatch):
+        """TTL 过期后，相关文件变化应重新构建选项"""
+        from issuelab.agents import options as options_mod
+
+        options_mod.clear_agent_options_cache()
+        monkeypatch.setenv("ISSUELAB_OPTIONS_CACHE_TTL", "0")
+        monkeypatch.setattr(options_mod, "AGENTS_DIR", tmp_path / "agents")
+        monkeypatch.setattr(options_mod, "discover_agents", lambda: {})
+        (tmp_path / "agents" / "alice").mkdir(parents=True)
+
+        first = options_mod.create_agent_options(agent_name="alice")
+        assert options_mod.create_agent_options(agent_name="alice") is first
+
+        (tmp_path / ".mcp.json").write_text(json.dumps({"docs": {"type": "http"}}), encoding="utf-8")
+        second = options_mod.create_agent_options(agent_name="alice")
+
+        assert second is not first
+        assert "mcp__docs__*" in second.allowed_tools
+
     def test_create_agent_options_uses_agent_overrides(self, monkeypatch):
         """agent.yml 的运行配置应覆盖默认值"""
         from issuelab.agents import options as options_mod
@@ -467,6 +575,41 @@ agent: summarizer
         assert "@summarizer" in result["comment"]
 
 
+class TestParseObserverBatchResponse:
+    """测试 Observer 打包模式响应解析"""
+
+    def test_parse_decisions_list(self):
+        """按 issue_number 解析每个 Issue 的决策，忽略未打包的编号"""
+        from issuelab.agents.parsers import parse_observer_batch_response
+
+        response = """```yaml
+decisions:
+  - issue_number: 3
+    should_trigger: true
+    agent: moderator
+    reason: 新论文
+  - issue_number: "#5"
+    should_trigger: false
+    reason: 信息不足
+  - issue_number: 99
+    should_trigger: true
+    agent: reviewer_a
+```"""
+        result = parse_observer_batch_response(response, [3, 5, 7])
+
+        assert sorted(result) == [3, 5]
+        assert result[3]["agent"] == "moderator"
+        assert "@moderator" in result[3]["comment"]
+        assert result[5]["should_trigger"] is False
+        assert result[5].issue_number == 5
+
+    def test_parse_invalid_returns_empty(self):
+        """无法解析时返回空字典，由调用方回退到逐个分析"""
+        from issuelab.agents.parsers import parse_observer_batch_response
+
+        assert parse_observer_batch_response("not yaml at all", [1]) == {}
+
+
 class TestStreamingOutput:
     """测试流式输出功能"""
 
@@ -698,3 +841,59 @@ class TestStreamingOutput:
             await run_single_agent("test prompt", "video_manim")
 
         assert captured_timeout["value"] == 900
+
+
+class TestRunAgentsParallelOnResult:
+    """测试每个 agent 完成后立即回调"""
+
+    async def test_on_result_fires_before_slow_agent_finishes(self, monkeypatch):
+        import anyio
+
+        from issuelab.agents import discovery
+        from issuelab.agents import executor as ex
+
+        slow_may_finish = anyio.Event()
+        events = []
+
+        async def fake_run_single_agent(prompt, agent_name):
+            if agent_name == "slow":
+                await slow_may_finish.wait()
+            events.append(f"done:{agent_name}")
+            return {"response": f"[Agent: {agent_name}] ok", "cost_usd": 0.01, "num_turns": 1}
+
+        async def on_result(agent_name, result):
+            events.append(f"posted:{agent_name}")
+            assert result.response == f"[Agent: {agent_name}] ok"
+            # 快的 agent 回调时慢的 agent 仍在运行
+            slow_may_finish.set()
+
+        async def fake_load_prompt(agent_name):
+            return "prompt"
+
+        monkeypatch.setattr(ex, "run_single_agent", fake_run_single_agent)
+        monkeypatch.setattr(discovery, "aload_prompt", fake_load_prompt)
+
+        results = await ex.run_agents_parallel(1, ["slow", "fast"], "## 协作指南\nctx", on_result=on_result)
+
+        assert events == ["done:fast", "posted:fast", "done:slow", "posted:slow"]
+        assert set(results) == {"slow", "fast"}
+
+    async def test_on_result_errors_do_not_cancel_other_agents(self, monkeypatch):
+        from issuelab.agents import discovery
+        from issuelab.agents import executor as ex
+
+        async def fake_run_single_agent(prompt, agent_name):
+            return {"response": agent_name}
+
+        async def fake_load_prompt(agent_name):
+            return "prompt"
+
+        def failing_callback(agent_name, result):
+            raise RuntimeError("post failed")
+
+        monkeypatch.setattr(ex, "run_single_agent", fake_run_single_agent)
+        monkeypatch.setattr(discovery, "aload_prompt", fake_load_prompt)
+
+        results = await ex.run_agents_parallel(1, ["a", "b"], "## 协作指南", on_result=failing_callback)
+
+        assert set(results) == {"a", "b"}
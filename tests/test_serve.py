@@ -0,0 +1,162 @@
+"""测试 serve 守护进程与作业执行"""
+
+import asyncio
+import os
+import socket
+import stat
+
+import pytest
+
+from issuelab import jobs
+from issuelab.agents.io_pool import arun_blocking
+from issuelab.serve import JobServer, submit_job
+
+
+@pytest.fixture
+async def server(tmp_path):
+    if hasattr(socket, "AF_UNIX"):
+        server = JobServer(socket_path=str(tmp_path / "serve.sock"), max_concurrency=2)
+    else:
+        server = JobServer(port=0, max_concurrency=2)
+    await server.start()
+    task = asyncio.create_task(server.serve_forever())
+    yield server
+    server.stop()
+    await task
+
+
+async def _submit(server, job):
+    return await arun_blocking(submit_job, job, socket_path=server.socket_path, port=server.port, timeout=10)
+
+
+class TestJobServer:
+    """测试守护进程协议"""
+
+    async def test_ping_and_stats(self, server):
+        assert await _submit(server, {"type": "ping"}) == {"ok": True, "result": {"pong": True}}
+
+        stats = (await _submit(server, {"type": "stats"}))["result"]
+        assert stats["jobs_done"] == 0
+        assert "hit_rate" in stats["agent_options"]
+
+    async def test_stats_reports_mcp_pool_state(self, server, monkeypatch):
+        monkeypatch.setenv("ISSUELAB_MCP_POOL", "0")
+        assert (await _submit(server, {"type": "stats"}))["result"]["mcp_pool"] is False
+
+    async def test_unknown_job_returns_error(self, server):
+        response = await _submit(server, {"type": "nope"})
+
+        assert response["ok"] is False
+        assert "unknown job type" in response["error"]
+
+    async def test_execute_job_runs_in_same_process(self, server, monkeypatch):
+        """连续作业在同一进程内执行，结果按行返回"""
+        calls = []
+
+        async def fake_load(issue_number):
+            return {"comment_count": 2}, f"/tmp/issue_{issue_number}.md"
+
+        async def fake_run(issue, agents, context, comment_count, available_agents=None, trigger_comment=None):
+            calls.append((issue, agents, comment_count, trigger_comment))
+            return {name: {"response": f"hi from {name}", "cost_usd": 0.1, "num_turns": 1} for name in agents}
+
+        monkeypatch.setattr(jobs, "_load_issue_context", fake_load)
+        monkeypatch.setattr("issuelab.agents.executor.run_agents_parallel", fake_run)
+
+        first = await _submit(server, {"type": "execute", "issue": 7, "agents": "echo,test"})
+        second = await _submit(server, {"type": "execute", "issue": 8, "agents": ["echo"], "trigger_comment": "@echo"})
+
+        assert first["ok"] is True
+        assert first["result"]["results"]["test"]["response"] == "hi from test"
+        assert second["result"]["issue"] == 8
+        assert calls == [(7, ["echo", "test"], 2, ""), (8, ["echo"], 2, "@echo")]
+        assert server.jobs_done == 2
+
+    async def test_shutdown_request_stops_server(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("ISSUELAB_SERVE_TOKEN", "s3cret")
+        server = JobServer(port=0)
+        await server.start()
+        task = asyncio.create_task(server.serve_forever())
+
+        assert (await _submit(server, {"type": "shutdown"}))["result"] == {"stopping": True}
+        await asyncio.wait_for(task, 5)
+
+
+class TestServeAccessControl:
+    """测试 TCP 令牌与 Unix socket 权限"""
+
+    def test_tcp_requires_token(self, monkeypatch):
+        monkeypatch.delenv("ISSUELAB_SERVE_TOKEN", raising=False)
+
+        with pytest.raises(ValueError, match="ISSUELAB_SERVE_TOKEN"):
+            JobServer(port=0)
+
+    async def test_tcp_rejects_wrong_or_missing_token(self, monkeypatch):
+        monkeypatch.delenv("ISSUELAB_SERVE_TOKEN", raising=False)
+        server = JobServer(port=0, token="s3cret")
+        await server.start()
+        task = asyncio.create_task(server.serve_forever())
+        try:
+            for token in (None, "wrong"):
+                job = {"type": "ping"} if token is None else {"type": "ping", "token": token}
+                response = await arun_blocking(submit_job, job, port=server.port, timeout=10)
+                assert response["ok"] is False
+                assert "unauthorized" in response["error"]
+
+            response = await arun_blocking(submit_job, {"type": "ping"}, port=server.port, timeout=10, token="s3cret")
+            assert response == {"ok": True, "result": {"pong": True}}
+        finally:
+            server.stop()
+            await task
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="需要 Unix socket")
+    async def test_unix_socket_is_owner_only(self, server):
+        assert stat.S_IMODE(os.stat(server.socket_path).st_mode) == 0o600
+
+
+class TestJobs:
+    """测试作业参数处理"""
+
+    def test_dispatch_args_to_argv(self):
+        argv = jobs._to_argv({"mentions": "alice", "issue_number": 3, "dry_run": True, "comment_id": None})
+
+        assert argv == ["--mentions", "alice", "--issue-number", "3", "--dry-run"]
+
+    async def test_dispatch_does_not_occupy_io_pool(self, monkeypatch):
+        """分发作业在独立线程中运行，不占用共享 I/O 池"""
+        import threading
+
+        threads = []
+        monkeypatch.setattr(
+            "issuelab.cli.dispatch.main", lambda argv: threads.append(threading.current_thread().name) or 0
+        )
+
+        assert await jobs.run_job({"type": "dispatch", "args": {"mentions": "alice"}}) == {"exit_code": 0}
+        assert threads and not threads[0].startswith("issuelab-io")
+
+    async def test_invalid_dispatch_args_do_not_exit(self):
+        with pytest.raises(ValueError, match="invalid dispatch args"):
+            await jobs.run_job({"type": "dispatch", "args": {"mentions": "alice"}})
+
+
+class TestInstallationTokenCache:
+    """测试 Installation Token 缓存"""
+
+    def test_token_reused_within_ttl(self, monkeypatch):
+        from issuelab.cli import dispatch
+
+        dispatch.clear_token_cache()
+        issued = []
+        monkeypatch.setattr(dispatch, "generate_github_app_jwt", lambda *a: "jwt")
+        monkeypatch.setattr(dispatch, "get_installation_id", lambda *a: 1)
+        monkeypatch.setattr(
+            dispatch, "generate_installation_token", lambda *a: issued.append(1) or f"token-{len(issued)}"
+        )
+
+        assert dispatch.get_token_for_repository("o/r", "app", "key") == "token-1"
+        assert dispatch.get_token_for_repository("O/R", "app", "key") == "token-1"
+        assert len(issued) == 1
+
+        monkeypatch.setenv("ISSUELAB_TOKEN_CACHE_TTL", "0")
+        assert dispatch.get_token_for_repository("o/r", "app", "key") == "token-2"
+        dispatch.clear_token_cache()
@@ -0,0 +1,83 @@
+"""测试统一 YAML 读写入口"""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from issuelab import yaml_utils
+
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "agents"
+
+
+class TestSafeLoadFile:
+    """测试带缓存的文件解析"""
+
+    def test_cache_hit_returns_copy(self, tmp_path):
+        path = tmp_path / "agent.yml"
+        path.write_text("owner: alice\ninterests:\n  - ml\n", encoding="utf-8")
+
+        first = yaml_utils.safe_load_file(path)
+        first["interests"].append("mutated")
+        second = yaml_utils.safe_load_file(path)
+
+        assert second == {"owner": "alice", "interests": ["ml"]}
+
+    def test_cache_invalidated_on_change(self, tmp_path):
+        path = tmp_path / "agent.yml"
+        path.write_text("owner: alice\n", encoding="utf-8")
+        assert yaml_utils.safe_load_file(path) == {"owner": "alice"}
+
+        path.write_text("owner: bobby\nenabled: false\n", encoding="utf-8")
+        assert yaml_utils.safe_load_file(path) == {"owner": "bobby", "enabled": False}
+
+    def test_missing_file_raises(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            yaml_utils.safe_load_file(tmp_path / "missing.yml")
+
+    def test_dump_roundtrip(self):
+        data = {"name": "智能体", "items": [1, 2]}
+        assert yaml_utils.safe_load(yaml_utils.safe_dump(data)) == data
+
+
+class TestYamlLoader:
+    """测试 C 加载器的选择与 agents/*/agent.yml 语料上的结果一致性"""
+
+    @staticmethod
+    def _corpus() -> list[Path]:
+        files = sorted(AGENTS_DIR.glob("*/agent.yml"))
+        if not files:
+            pytest.skip("agents/*/agent.yml 语料不存在")
+        return files
+
+    def test_results_match_pure_python_loader(self):
+        for path in self._corpus():
+            text = path.read_text(encoding="utf-8")
+            assert yaml_utils.safe_load(text) == yaml.load(text, Loader=yaml.SafeLoader)
+
+    def test_c_loader_selected_when_available(self):
+        if hasattr(yaml, "CSafeLoader"):
+            assert yaml_utils.SafeLoader is yaml.CSafeLoader
+            assert yaml_utils.SafeDumper is yaml.CSafeDumper
+            assert yaml_utils.HAS_LIBYAML is True
+        else:
+            assert yaml_utils.SafeLoader is yaml.SafeLoader
+            assert yaml_utils.HAS_LIBYAML is False
+
+    def test_safe_load_uses_selected_loader(self, monkeypatch):
+        loaders = []
+        original = yaml.load
+        monkeypatch.setattr(yaml, "load", lambda stream, **kw: loaders.append(kw["Loader"]) or original(stream, **kw))
+
+        assert yaml_utils.safe_load("a: 1") == {"a": 1}
+        assert loaders == [yaml_utils.SafeLoader]
+
+    def test_unchanged_file_is_parsed_once(self, monkeypatch):
+        path = self._corpus()[0]
+        yaml_utils.clear_yaml_cache(path)
+        parsed = []
+        original = yaml_utils.safe_load
+        monkeypatch.setattr(yaml_utils, "safe_load", lambda stream: parsed.append(1) or original(stream))
+
+        assert yaml_utils.safe_load_file(path) == yaml_utils.safe_load_file(path)
+        assert len(parsed) == 1